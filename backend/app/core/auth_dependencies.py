@@ -2,8 +2,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlmodel import Session
 
+from app.core.principal_cache import principal_cache
 from app.core.security import decode_access_token
-from app.db.database import get_session
+from app.db.database import get_session, session_scope
 from app.models.app_user import AppUser
 from app.services.auth_service import get_user_by_id
 
@@ -12,6 +13,32 @@ bearer_scheme = HTTPBearer(auto_error=False)
 USER_DIRECTORY_ROLES = {"ADMIN", "MANAGER", "PARSER-TEAM"}
 
 
+def get_user_for_token(db: Session, token: str) -> AppUser:
+    payload = decode_access_token(token)
+    user_id = int(payload.get("sub"))
+    user = principal_cache.get(user_id, token)
+    if user is None:
+        user = get_user_by_id(db, user_id)
+        principal_cache.put(user_id, token, user)
+    return user
+
+
+def get_admin_for_authorization(authorization: str | None) -> AppUser | None:
+    # Dipakai middleware (di luar dependency injection), misalnya untuk
+    # profiling per request; token tidak valid cukup dianggap bukan admin.
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        with session_scope() as db:
+            user = get_user_for_token(db, token.strip())
+    except (ValueError, TypeError, HTTPException):
+        return None
+    if not user.is_active or user.role != "ADMIN":
+        return None
+    return user
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     db: Session = Depends(get_session),
@@ -22,10 +49,9 @@ def get_current_user(
             detail="Token autentikasi Bearer wajib dikirim",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    token = credentials.credentials
     try:
-        payload = decode_access_token(credentials.credentials)
-        user_id = int(payload.get("sub"))
-        user = get_user_by_id(db, user_id)
+        user = get_user_for_token(db, token)
     except (ValueError, TypeError, HTTPException):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,9 +1,25 @@
 # backend/app/core/config.py
 import importlib
+import json
 import os
+import re
 import urllib.parse
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
+
+
+# Aturan nilai default untuk kolom wilayah ODIST (lihat odists_validation):
+# minimal satu huruf, hanya huruf/angka/spasi dan tanda baca umum nama
+# wilayah, tanpa spasi di awal/akhir.
+_REGION_VALUE_RULE: Dict[str, Any] = {
+    "pattern": r"[A-Za-z0-9 .,'()/&-]*[A-Za-z][A-Za-z0-9 .,'()/&-]*",
+    "trimmed": True,
+}
+DEFAULT_ODISTS_VALUE_RULES: Dict[str, Dict[str, Any]] = {
+    field: dict(_REGION_VALUE_RULE)
+    for field in ("kecamatan", "kota", "provinsi", "city", "province")
+}
+ODISTS_VALUE_RULE_KEYS = {"pattern", "allowed", "min_length", "max_length", "trimmed"}
 
 
 PROJECT_ROOT = Path(os.getenv("PROJECT_ROOT", "/srv/data_platform")).resolve()
@@ -40,6 +56,13 @@ class Settings:
     DB_SCHEMA: str
     DB_ENCRYPT: bool
     DB_TRUST_CERT: bool
+    DB_POOL_SIZE: int
+    DB_MAX_OVERFLOW: int
+    DB_POOL_RECYCLE: int
+    DB_POOL_TIMEOUT: float
+    DB_POOL_PRE_PING: str
+    DB_POOL_PING_IDLE_SECONDS: float
+    DB_POOL_WARMUP: int
 
     MYSQL_PIPELINE_HOST: str
     MYSQL_PIPELINE_PORT: int
@@ -51,6 +74,36 @@ class Settings:
     MYSQL_PIPELINE_CONNECT_TIMEOUT: int
     MYSQL_PIPELINE_READ_TIMEOUT: int
     MYSQL_PIPELINE_WRITE_TIMEOUT: int
+    MYSQL_PIPELINE_ASYNC_POOL_SIZE: int
+    MYSQL_PIPELINE_ASYNC_MAX_OVERFLOW: int
+    MYSQL_PIPELINE_POOL_SIZE: int
+    MYSQL_PIPELINE_MAX_OVERFLOW: int
+    MYSQL_PIPELINE_POOL_RECYCLE: int
+    MYSQL_PIPELINE_POOL_TIMEOUT: float
+    MYSQL_PIPELINE_POOL_PRE_PING: str
+    MYSQL_PIPELINE_POOL_PING_IDLE_SECONDS: float
+    MYSQL_PIPELINE_POOL_WARMUP: int
+
+    ODISTS_MIRROR_ENABLED: bool
+    ODISTS_MIRROR_POLL_SECONDS: float
+    ODISTS_MIRROR_DELTA_LIMIT: int
+    ODISTS_MIRROR_SAFETY_LAG_SECONDS: float
+    ODISTS_EVENTS_BUFFER_SIZE: int
+    ODISTS_EVENTS_MAX_SUBSCRIBERS: int
+    ODISTS_EVENTS_KEEPALIVE_SECONDS: float
+    ODISTS_LEASE_TTL_SECONDS: float
+    ODISTS_LEASE_DB_PATH: str
+    ODISTS_AUTOCOMPLETE_ENABLED: bool
+    ODISTS_AUTOCOMPLETE_REBUILD_SECONDS: float
+    ODISTS_SUGGEST_ENABLED: bool
+    ODISTS_SUGGEST_REBUILD_SECONDS: float
+    ODISTS_SUGGEST_POSTING_BUDGET: int
+    ODISTS_VALUE_RULES: Dict[str, Dict[str, Any]]
+    REPORT_LOADER_WORKERS: int
+    REPORT_NORMALIZE_CACHE_SIZE: int
+    REPORT_CACHE_TTL_SECONDS: float
+    REPORT_CACHE_MAX_ENTRIES: int
+    REPORT_EXPORT_FETCH_SIZE: int
 
     APP_HOST: str
     APP_PORT: int
@@ -59,11 +112,25 @@ class Settings:
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int
+    PASSWORD_HASH_WORKERS: int
+    PASSWORD_HASH_MAX_PENDING: int
+
+    SLOW_QUERY_THRESHOLD_MS: float
+    SLOW_QUERY_MAX_ENTRIES: int
+    SLOW_QUERY_EXPLAIN: bool
+
+    PROFILE_SAMPLE_INTERVAL_MS: float
+    PROFILE_MAX_STORED: int
+    PROFILE_MAX_SECONDS: float
 
     ORCHESTRATOR_PASSWORD: str
     PREFECT_UI_URL: str
 
     def __init__(self):
+        self._odbc_drivers: Optional[List[str]] = None
+        self._preferred_driver: Optional[str] = None
         self.DB_HOST = os.getenv("DB_HOST") or os.getenv("MSSQL_SERVER") or "localhost"
         self.DB_PORT = int(os.getenv("DB_PORT") or os.getenv("MSSQL_PORT") or 1433)
         self.DB_NAME = os.getenv("DB_NAME") or os.getenv("MSSQL_DATABASE") or ""
@@ -77,8 +144,21 @@ class Settings:
                 return default
             return value.strip().lower() in ("1", "true", "yes", "y", "on")
 
+        def _pre_ping_from_env(key: str, default: str) -> str:
+            value = (os.getenv(key) or default).strip().lower()
+            if value not in ("always", "idle", "never"):
+                raise RuntimeError(f"{key} harus salah satu dari: always, idle, never")
+            return value
+
         self.DB_ENCRYPT = _bool_from_env("DB_ENCRYPT", False) or _bool_from_env("MSSQL_ENCRYPT", False)
         self.DB_TRUST_CERT = _bool_from_env("DB_TRUST_CERT", True) or _bool_from_env("MSSQL_TRUST_CERT", True)
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+        self.DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.DB_POOL_PRE_PING = _pre_ping_from_env("DB_POOL_PRE_PING", "idle")
+        self.DB_POOL_PING_IDLE_SECONDS = float(os.getenv("DB_POOL_PING_IDLE_SECONDS", "30"))
+        self.DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", "2"))
 
         self.MYSQL_PIPELINE_HOST = os.getenv("MYSQL_PIPELINE_HOST", "")
         self.MYSQL_PIPELINE_PORT = int(os.getenv("MYSQL_PIPELINE_PORT", "3306"))
@@ -90,6 +170,58 @@ class Settings:
         self.MYSQL_PIPELINE_CONNECT_TIMEOUT = int(os.getenv("MYSQL_PIPELINE_CONNECT_TIMEOUT", "30"))
         self.MYSQL_PIPELINE_READ_TIMEOUT = int(os.getenv("MYSQL_PIPELINE_READ_TIMEOUT", "600"))
         self.MYSQL_PIPELINE_WRITE_TIMEOUT = int(os.getenv("MYSQL_PIPELINE_WRITE_TIMEOUT", "600"))
+        self.MYSQL_PIPELINE_ASYNC_POOL_SIZE = int(os.getenv("MYSQL_PIPELINE_ASYNC_POOL_SIZE", "10"))
+        self.MYSQL_PIPELINE_ASYNC_MAX_OVERFLOW = int(
+            os.getenv("MYSQL_PIPELINE_ASYNC_MAX_OVERFLOW", "10")
+        )
+        self.MYSQL_PIPELINE_POOL_SIZE = int(os.getenv("MYSQL_PIPELINE_POOL_SIZE", "5"))
+        self.MYSQL_PIPELINE_MAX_OVERFLOW = int(os.getenv("MYSQL_PIPELINE_MAX_OVERFLOW", "5"))
+        self.MYSQL_PIPELINE_POOL_RECYCLE = int(os.getenv("MYSQL_PIPELINE_POOL_RECYCLE", "1800"))
+        self.MYSQL_PIPELINE_POOL_TIMEOUT = float(os.getenv("MYSQL_PIPELINE_POOL_TIMEOUT", "30"))
+        self.MYSQL_PIPELINE_POOL_PRE_PING = _pre_ping_from_env(
+            "MYSQL_PIPELINE_POOL_PRE_PING",
+            "idle",
+        )
+        self.MYSQL_PIPELINE_POOL_PING_IDLE_SECONDS = float(
+            os.getenv("MYSQL_PIPELINE_POOL_PING_IDLE_SECONDS", "30")
+        )
+        self.MYSQL_PIPELINE_POOL_WARMUP = int(os.getenv("MYSQL_PIPELINE_POOL_WARMUP", "2"))
+
+        self.ODISTS_MIRROR_ENABLED = _bool_from_env("ODISTS_MIRROR_ENABLED", True)
+        self.ODISTS_MIRROR_POLL_SECONDS = float(os.getenv("ODISTS_MIRROR_POLL_SECONDS", "5"))
+        self.ODISTS_MIRROR_DELTA_LIMIT = int(os.getenv("ODISTS_MIRROR_DELTA_LIMIT", "5000"))
+        self.ODISTS_MIRROR_SAFETY_LAG_SECONDS = max(
+            0.0,
+            float(os.getenv("ODISTS_MIRROR_SAFETY_LAG_SECONDS", "10")),
+        )
+        self.ODISTS_EVENTS_BUFFER_SIZE = max(1, int(os.getenv("ODISTS_EVENTS_BUFFER_SIZE", "256")))
+        self.ODISTS_EVENTS_MAX_SUBSCRIBERS = int(os.getenv("ODISTS_EVENTS_MAX_SUBSCRIBERS", "500"))
+        self.ODISTS_EVENTS_KEEPALIVE_SECONDS = float(
+            os.getenv("ODISTS_EVENTS_KEEPALIVE_SECONDS", "15")
+        )
+        self.ODISTS_LEASE_TTL_SECONDS = float(os.getenv("ODISTS_LEASE_TTL_SECONDS", "120"))
+        if self.ODISTS_LEASE_TTL_SECONDS <= 0:
+            raise RuntimeError("ODISTS_LEASE_TTL_SECONDS harus lebih besar dari 0")
+        self.ODISTS_LEASE_DB_PATH = (os.getenv("ODISTS_LEASE_DB_PATH") or ":memory:").strip()
+        self.ODISTS_AUTOCOMPLETE_ENABLED = _bool_from_env("ODISTS_AUTOCOMPLETE_ENABLED", True)
+        self.ODISTS_AUTOCOMPLETE_REBUILD_SECONDS = float(
+            os.getenv("ODISTS_AUTOCOMPLETE_REBUILD_SECONDS", "900")
+        )
+        self.ODISTS_SUGGEST_ENABLED = _bool_from_env("ODISTS_SUGGEST_ENABLED", False)
+        self.ODISTS_SUGGEST_REBUILD_SECONDS = float(
+            os.getenv("ODISTS_SUGGEST_REBUILD_SECONDS", "3600")
+        )
+        self.ODISTS_SUGGEST_POSTING_BUDGET = max(
+            1000, int(os.getenv("ODISTS_SUGGEST_POSTING_BUDGET", "50000"))
+        )
+        self.ODISTS_VALUE_RULES = self._odists_value_rules()
+        self.REPORT_LOADER_WORKERS = max(1, int(os.getenv("REPORT_LOADER_WORKERS", "4")))
+        self.REPORT_NORMALIZE_CACHE_SIZE = int(os.getenv("REPORT_NORMALIZE_CACHE_SIZE", "200000"))
+        self.REPORT_CACHE_TTL_SECONDS = float(os.getenv("REPORT_CACHE_TTL_SECONDS", "300"))
+        self.REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "4"))
+        self.REPORT_EXPORT_FETCH_SIZE = max(
+            1, int(os.getenv("REPORT_EXPORT_FETCH_SIZE", "2000"))
+        )
 
         self.APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
         self.APP_PORT = int(os.getenv("APP_PORT", "8000"))
@@ -100,6 +232,26 @@ class Settings:
         self.JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(
             os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "480")
         )
+        self.AUTH_PRINCIPAL_CACHE_TTL_SECONDS = float(
+            os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "30")
+        )
+        self.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES = int(
+            os.getenv("AUTH_PRINCIPAL_CACHE_MAX_ENTRIES", "2048")
+        )
+        self.PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+        self.PASSWORD_HASH_MAX_PENDING = max(
+            1,
+            int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32")),
+        )
+        self.SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+        self.SLOW_QUERY_MAX_ENTRIES = max(1, int(os.getenv("SLOW_QUERY_MAX_ENTRIES", "200")))
+        self.SLOW_QUERY_EXPLAIN = _bool_from_env("SLOW_QUERY_EXPLAIN", True)
+        self.PROFILE_SAMPLE_INTERVAL_MS = max(
+            1.0,
+            float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")),
+        )
+        self.PROFILE_MAX_STORED = max(1, int(os.getenv("PROFILE_MAX_STORED", "20")))
+        self.PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
         if not self.JWT_SECRET_KEY:
             raise RuntimeError(
                 "JWT_SECRET_KEY belum dikonfigurasi pada environment atau file .env"
@@ -111,15 +263,60 @@ class Settings:
             "http://192.100.38.67:4200/",
         )
 
-    def _detect_odbc_drivers(self) -> List[str]:
+    @staticmethod
+    def _odists_value_rules() -> Dict[str, Dict[str, Any]]:
+        # ODISTS_VALUE_RULES (JSON object, key = kolom) menggantikan aturan
+        # default per kolom; {} pada suatu kolom = tanpa aturan.
+        raw = (os.getenv("ODISTS_VALUE_RULES") or "").strip()
+        if not raw:
+            return DEFAULT_ODISTS_VALUE_RULES
         try:
-            pyodbc = importlib.import_module("pyodbc")
-            return list(pyodbc.drivers())
-        except Exception:
-            return []
+            overrides = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError("ODISTS_VALUE_RULES harus berupa JSON object") from exc
+        if not isinstance(overrides, dict) or not all(
+            isinstance(rule, dict) for rule in overrides.values()
+        ):
+            raise RuntimeError("ODISTS_VALUE_RULES harus berupa JSON object {kolom: {aturan}}")
+        for field, rule in overrides.items():
+            unknown = set(rule) - ODISTS_VALUE_RULE_KEYS
+            if unknown:
+                raise RuntimeError(
+                    f"Aturan ODISTS_VALUE_RULES untuk {field} tidak dikenal: {', '.join(sorted(unknown))}"
+                )
+            if "pattern" in rule:
+                try:
+                    re.compile(rule["pattern"])
+                except (re.error, TypeError) as exc:
+                    raise RuntimeError(
+                        f"Pattern ODISTS_VALUE_RULES untuk {field} tidak valid: {exc}"
+                    ) from exc
+            if "allowed" in rule and not isinstance(rule["allowed"], list):
+                raise RuntimeError(f"Aturan allowed untuk {field} harus berupa list")
+        return {
+            field: rule
+            for field, rule in {**DEFAULT_ODISTS_VALUE_RULES, **overrides}.items()
+            if rule
+        }
+
+    def _detect_odbc_drivers(self) -> List[str]:
+        # Enumerasi driver ODBC cukup mahal (import pyodbc + baca odbcinst),
+        # hasilnya disimpan per proses.
+        if self._odbc_drivers is None:
+            try:
+                pyodbc = importlib.import_module("pyodbc")
+                self._odbc_drivers = list(pyodbc.drivers())
+            except Exception:
+                self._odbc_drivers = []
+        return self._odbc_drivers
 
     def get_preferred_driver(self) -> str:
-        drivers = self._detect_odbc_drivers()
+        if self._preferred_driver is not None:
+            return self._preferred_driver
+        self._preferred_driver = self._select_driver(self._detect_odbc_drivers())
+        return self._preferred_driver
+
+    def _select_driver(self, drivers: List[str]) -> str:
         preferences = ["ODBC Driver 17 for SQL Server"]
         for preference in preferences:
             if preference in drivers:
@@ -175,5 +372,13 @@ class Settings:
             f"?charset={charset_enc}"
         )
 
+    @property
+    def MYSQL_PIPELINE_ASYNC_DATABASE_URL(self) -> str:
+        return self.MYSQL_PIPELINE_DATABASE_URL.replace(
+            "mysql+pymysql://",
+            "mysql+aiomysql://",
+            1,
+        )
+
 
 settings = Settings()
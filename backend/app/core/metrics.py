@@ -0,0 +1,266 @@
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Metrics in-process dengan format teks Prometheus (exposition 0.0.4), tanpa
+# dependency tambahan. Nilai bersifat per-proses: di deployment multi-worker,
+# Prometheus men-scrape tiap worker dan agregasi dilakukan di sisi query.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+QUERY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Label metric {self.name} harus: {', '.join(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counter hanya boleh bertambah")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        key = self._label_values(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label: hitungan per bucket (non-kumulatif, +1 untuk +Inf), sum.
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = sorted(
+                (key, (list(counts), total[0])) for key, (counts, total) in self._values.items()
+            )
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total",
+    "Jumlah request HTTP per route template dan status.",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "Latensi request HTTP per route template.",
+    ("method", "route"),
+)
+db_queries_total = registry.counter(
+    "db_queries_total",
+    "Jumlah statement yang dieksekusi per database.",
+    ("database",),
+)
+db_query_errors_total = registry.counter(
+    "db_query_errors_total",
+    "Jumlah statement yang gagal per database.",
+    ("database",),
+)
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds",
+    "Durasi eksekusi statement per database.",
+    ("database",),
+    QUERY_BUCKETS,
+)
+odists_page_rows_total = registry.counter(
+    "odists_page_rows_total",
+    "Jumlah row ODIST yang dikembalikan oleh get_page.",
+)
+report_audits_loaded_total = registry.counter(
+    "report_audits_loaded_total",
+    "Jumlah audit log yang dimuat untuk report.",
+)
+parsing_baselines_inserted_total = registry.counter(
+    "parsing_baselines_inserted_total",
+    "Jumlah baseline yang ditulis, per jalur penulisan.",
+    ("path",),
+)
+odists_events_published_total = registry.counter(
+    "odists_events_published_total",
+    "Jumlah event perubahan row ODIST yang dipublikasikan ke event stream.",
+)
+odists_events_dropped_total = registry.counter(
+    "odists_events_dropped_total",
+    "Jumlah event yang dibuang karena buffer klien event stream penuh.",
+)
+report_cache_requests_total = registry.counter(
+    "report_cache_requests_total",
+    "Lookup cache komputasi report, per jenis entry dan hasil (hit/miss).",
+    ("kind", "result"),
+)
+
+
+def route_label(scope: Dict[str, object]) -> str:
+    # Pakai template path ("/api/x/{id}") agar cardinality label tetap kecil.
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return str(path_format) if path_format else "unmatched"
+
+
+def observe_request(method: str, route: str, status: int, duration_seconds: float) -> None:
+    http_requests_total.inc(method=method, route=route, status=status)
+    http_request_duration_seconds.observe(duration_seconds, method=method, route=route)
+
+
+def install_query_metrics(engine: Engine, database: str) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = _pop_started(conn.info)
+        db_queries_total.inc(database=database)
+        if started is not None:
+            db_query_duration_seconds.observe(time.perf_counter() - started, database=database)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None:
+            _pop_started(connection.info)
+        db_queries_total.inc(database=database)
+        db_query_errors_total.inc(database=database)
+
+
+def _pop_started(info: Dict[str, object]) -> Optional[float]:
+    stack = info.get("metrics_query_started")
+    if isinstance(stack, list) and stack:
+        return stack.pop()
+    return None
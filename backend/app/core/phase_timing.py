@@ -0,0 +1,54 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from app.core.profiling import attach_current_thread
+
+
+class PhaseTimings:
+    def __init__(self):
+        self._durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            self._durations[name] = self._durations.get(name, 0.0) + duration_ms
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: round(value, 2) for name, value in self._durations.items()}
+
+    def server_timing_header(self) -> str:
+        return ", ".join(
+            f"{name};dur={duration}" for name, duration in self.as_dict().items()
+        )
+
+
+_current_timings: ContextVar[Optional[PhaseTimings]] = ContextVar(
+    "phase_timings",
+    default=None,
+)
+
+
+def start_request_timings() -> PhaseTimings:
+    timings = PhaseTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[PhaseTimings]:
+    return _current_timings.get()
+
+
+@contextmanager
+def track_phase(name: str) -> Iterator[None]:
+    attach_current_thread()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(name, (time.perf_counter() - started) * 1000)
@@ -0,0 +1,63 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.models.app_user import AppUser
+
+
+# Cache user hasil autentikasi per (user_id, token) supaya get_current_user
+# tidak query SQL Server di setiap request. Cache bersifat per-proses: di
+# worker lain entry lama tetap hidup sampai TTL habis.
+class PrincipalCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple[int, str], tuple[float, AppUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, user_id: int, token: str) -> tuple[int, str]:
+        return (int(user_id), hashlib.sha256(token.encode("utf-8")).hexdigest())
+
+    def get(self, user_id: int, token: str) -> Optional[AppUser]:
+        if self.ttl_seconds <= 0:
+            return None
+        key = self._key(user_id, token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return AppUser(**user.dict())
+
+    def put(self, user_id: int, token: str, user: AppUser) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        key = self._key(user_id, token)
+        snapshot = AppUser(**user.dict())
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == int(user_id)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+)
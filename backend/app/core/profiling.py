@@ -0,0 +1,312 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "__profile"
+TOP_FUNCTIONS = 40
+MAX_STACK_DEPTH = 128
+# Event loop yang sedang menunggu I/O bukan waktu CPU request.
+IDLE_LEAF_PREFIXES = ("selectors.py:",)
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _short_filename(filename: str) -> str:
+    if filename.startswith(_BACKEND_ROOT):
+        return os.path.relpath(filename, _BACKEND_ROOT)
+    marker = f"{os.sep}site-packages{os.sep}"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{_short_filename(code.co_filename)}:{code.co_qualname}"
+
+
+# Sampling profiler untuk satu request. Sampler membaca sys._current_frames()
+# secara periodik, tapi hanya thread yang "terdaftar" untuk request ini yang
+# dihitung: event loop (middleware), thread endpoint sync, dan thread loader
+# report. Thread didaftarkan lewat track_phase dan hook cursor SQLAlchemy
+# yang berjalan di context request.
+class RequestProfile:
+    def __init__(self, method: str, path: str, username: str, interval_ms: float):
+        self.profile_id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.username = username
+        self.interval_ms = interval_ms
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._process_cpu_started = time.process_time()
+        self._lock = threading.Lock()
+        self._threads: set[int] = set()
+        self._db_active: Dict[int, int] = {}
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._db_wait_samples = 0
+        self._idle_samples = 0
+        self._db_wait_ms: Dict[str, float] = {}
+        self._db_queries: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self.result: Optional[Dict[str, Any]] = None
+
+    def attach_current_thread(self) -> None:
+        ident = threading.get_ident()
+        if ident in self._threads:
+            return
+        with self._lock:
+            self._threads.add(ident)
+
+    def db_started(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads.add(ident)
+            self._db_active[ident] = self._db_active.get(ident, 0) + 1
+
+    def db_finished(self, database: str, duration_ms: Optional[float]) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._db_active.get(ident, 0) - 1
+            if depth > 0:
+                self._db_active[ident] = depth
+            else:
+                self._db_active.pop(ident, None)
+            if duration_ms is not None:
+                self._db_wait_ms[database] = self._db_wait_ms.get(database, 0.0) + duration_ms
+                self._db_queries[database] = self._db_queries.get(database, 0) + 1
+
+    def start(self) -> None:
+        self._sampler = threading.Thread(
+            target=self._sample_loop,
+            name=f"request-profiler-{self.profile_id[:8]}",
+            daemon=True,
+        )
+        self._sampler.start()
+
+    def _sample_loop(self) -> None:
+        interval = self.interval_ms / 1000
+        deadline = self._started + settings.PROFILE_MAX_SECONDS
+        sampler_ident = threading.get_ident()
+        while not self._stop.wait(interval):
+            if time.perf_counter() > deadline:
+                break
+            frames = sys._current_frames()
+            with self._lock:
+                threads = set(self._threads)
+                db_active = set(self._db_active)
+            for ident, frame in frames.items():
+                if ident == sampler_ident or ident not in threads:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if stack and stack[0].startswith(IDLE_LEAF_PREFIXES):
+                    with self._lock:
+                        self._idle_samples += 1
+                    continue
+                stack.reverse()
+                with self._lock:
+                    self._stacks[tuple(stack)] += 1
+                    self._samples += 1
+                    if ident in db_active:
+                        self._db_wait_samples += 1
+
+    def finish(self, status_code: int, phases: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1)
+        wall_ms = (time.perf_counter() - self._started) * 1000
+        process_cpu_ms = (time.process_time() - self._process_cpu_started) * 1000
+        with self._lock:
+            stacks = dict(self._stacks)
+            samples = self._samples
+            db_wait_samples = self._db_wait_samples
+            idle_samples = self._idle_samples
+            db_wait_ms = dict(self._db_wait_ms)
+            db_queries = dict(self._db_queries)
+            thread_count = len(self._threads)
+
+        self_counts: Counter = Counter()
+        cumulative_counts: Counter = Counter()
+        for stack, count in stacks.items():
+            if not stack:
+                continue
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                cumulative_counts[label] += count
+
+        def _top(counter: Counter) -> List[Dict[str, Any]]:
+            return [
+                {
+                    "function": label,
+                    "samples": count,
+                    "percent": round(count * 100 / samples, 2) if samples else 0.0,
+                }
+                for label, count in counter.most_common(TOP_FUNCTIONS)
+            ]
+
+        self.result = {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "username": self.username,
+            "status_code": status_code,
+            "started_at": self.started_at,
+            "wall_ms": round(wall_ms, 2),
+            "sample_interval_ms": self.interval_ms,
+            "samples": samples,
+            "threads": thread_count,
+            "breakdown": {
+                "db_wait_ms": round(sum(db_wait_ms.values()), 2),
+                "db_wait_ms_by_database": {key: round(value, 2) for key, value in db_wait_ms.items()},
+                "db_queries_by_database": db_queries,
+                "db_wait_samples": db_wait_samples,
+                "python_samples": samples - db_wait_samples,
+                "idle_loop_samples": idle_samples,
+                "python_ms_estimate": round((samples - db_wait_samples) * self.interval_ms, 2),
+                # CPU seluruh proses selama request; ikut terisi request lain
+                # yang berjalan bersamaan.
+                "process_cpu_ms": round(process_cpu_ms, 2),
+            },
+            "phases": phases or {},
+            "top_self": _top(self_counts),
+            "top_cumulative": _top(cumulative_counts),
+            "folded": stacks,
+        }
+        return self.result
+
+
+class ProfileStore:
+    def __init__(self, max_profiles: int):
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=max_profiles)
+        self._lock = threading.Lock()
+
+    def add(self, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._profiles.append(result)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {
+                key: profile[key]
+                for key in (
+                    "profile_id",
+                    "method",
+                    "path",
+                    "username",
+                    "status_code",
+                    "started_at",
+                    "wall_ms",
+                    "samples",
+                )
+            }
+            | {"db_wait_ms": profile["breakdown"]["db_wait_ms"]}
+            for profile in reversed(profiles)
+        ]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile["profile_id"] == profile_id:
+                    return profile
+        return None
+
+
+profile_store = ProfileStore(settings.PROFILE_MAX_STORED)
+
+_active_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "active_profile",
+    default=None,
+)
+# Satu profile aktif per proses supaya overhead sampler tetap terbatas.
+_profile_slot = threading.Semaphore(1)
+
+
+def profile_requested(headers: Any, query_params: Any) -> bool:
+    value = headers.get(PROFILE_HEADER) or query_params.get(PROFILE_QUERY_PARAM)
+    return str(value or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def start_profile(method: str, path: str, username: str) -> Optional[RequestProfile]:
+    if not _profile_slot.acquire(blocking=False):
+        return None
+    profile = RequestProfile(method, path, username, settings.PROFILE_SAMPLE_INTERVAL_MS)
+    _active_profile.set(profile)
+    profile.attach_current_thread()
+    profile.start()
+    return profile
+
+
+def finish_profile(
+    profile: RequestProfile,
+    status_code: int,
+    phases: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    try:
+        result = profile.finish(status_code, phases)
+        profile_store.add(result)
+        return result
+    finally:
+        _active_profile.set(None)
+        _profile_slot.release()
+
+
+def attach_current_thread() -> None:
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.attach_current_thread()
+
+
+def folded_stacks(result: Dict[str, Any]) -> str:
+    # Format "collapsed stack" (flamegraph.pl / speedscope).
+    lines = [
+        f"{';'.join(stack)} {count}"
+        for stack, count in sorted(result["folded"].items(), key=lambda item: -item[1])
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def install_profile_hooks(engine: Engine, database: str) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _active_profile.get()
+        if profile is None:
+            return
+        conn.info.setdefault("profile_query_started", []).append(time.perf_counter())
+        profile.db_started()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _active_profile.get()
+        stack = conn.info.get("profile_query_started")
+        if profile is None or not stack:
+            return
+        profile.db_finished(database, (time.perf_counter() - stack.pop()) * 1000)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        profile = _active_profile.get()
+        connection = exception_context.connection
+        stack = connection.info.get("profile_query_started") if connection is not None else None
+        if profile is None or not stack:
+            return
+        profile.db_finished(database, (time.perf_counter() - stack.pop()) * 1000)
@@ -1,6 +1,12 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -9,15 +15,155 @@ from app.core.config import settings
 
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_password_executor: Optional[ProcessPoolExecutor] = None
+_password_executor_lock = threading.Lock()
+_password_stats_lock = threading.Lock()
+_password_stats: Dict[str, float] = {
+    "submitted": 0,
+    "completed": 0,
+    "failed": 0,
+    "rejected": 0,
+    "in_flight": 0,
+    "peak_in_flight": 0,
+    "total_latency_ms": 0.0,
+    "max_latency_ms": 0.0,
+}
 
-def hash_password(password: str) -> str:
+
+def _hash_in_worker(password: str) -> str:
     return password_context.hash(password)
 
 
-def verify_password(plain_password: str, password_hash: str) -> bool:
+def _verify_in_worker(plain_password: str, password_hash: str) -> bool:
     return password_context.verify(plain_password, password_hash)
 
 
+def _ping_worker() -> bool:
+    return True
+
+
+def _get_password_executor() -> Optional[ProcessPoolExecutor]:
+    global _password_executor
+
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _password_executor is None:
+        with _password_executor_lock:
+            if _password_executor is None:
+                _password_executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _password_executor
+
+
+def warm_password_executor() -> None:
+    executor = _get_password_executor()
+    if executor is None:
+        return
+    futures = [
+        executor.submit(_ping_worker)
+        for _ in range(settings.PASSWORD_HASH_WORKERS)
+    ]
+    for future in futures:
+        future.result()
+
+
+def shutdown_password_executor() -> None:
+    global _password_executor
+
+    with _password_executor_lock:
+        if _password_executor is not None:
+            _password_executor.shutdown(wait=False, cancel_futures=True)
+            _password_executor = None
+
+
+def _submit_password_task(fn: Callable[..., Any], *args: Any) -> Future:
+    # Admission control: bila antrean penuh langsung ditolak, tidak menunggu,
+    # supaya thread request tidak menumpuk di belakang bcrypt.
+    with _password_stats_lock:
+        if _password_stats["in_flight"] >= settings.PASSWORD_HASH_MAX_PENDING:
+            _password_stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server sedang sibuk memproses login, silakan coba lagi",
+                headers={"Retry-After": "1"},
+            )
+        _password_stats["submitted"] += 1
+        _password_stats["in_flight"] += 1
+        _password_stats["peak_in_flight"] = max(
+            _password_stats["peak_in_flight"],
+            _password_stats["in_flight"],
+        )
+
+    started = time.perf_counter()
+    executor = _get_password_executor()
+    if executor is None:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+    else:
+        future = executor.submit(fn, *args)
+
+    def _record(done: Future) -> None:
+        latency_ms = (time.perf_counter() - started) * 1000
+        with _password_stats_lock:
+            _password_stats["in_flight"] -= 1
+            if done.exception() is not None:
+                _password_stats["failed"] += 1
+            else:
+                _password_stats["completed"] += 1
+            _password_stats["total_latency_ms"] += latency_ms
+            _password_stats["max_latency_ms"] = max(
+                _password_stats["max_latency_ms"],
+                latency_ms,
+            )
+
+    future.add_done_callback(_record)
+    return future
+
+
+def password_executor_stats() -> Dict[str, Any]:
+    with _password_stats_lock:
+        stats = dict(_password_stats)
+    finished = stats["completed"] + stats["failed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "submitted": int(stats["submitted"]),
+        "completed": int(stats["completed"]),
+        "failed": int(stats["failed"]),
+        "rejected": int(stats["rejected"]),
+        "in_flight": int(stats["in_flight"]),
+        "queued": max(0, int(stats["in_flight"]) - settings.PASSWORD_HASH_WORKERS),
+        "peak_in_flight": int(stats["peak_in_flight"]),
+        "avg_latency_ms": round(stats["total_latency_ms"] / finished, 2)
+        if finished
+        else 0.0,
+        "max_latency_ms": round(stats["max_latency_ms"], 2),
+    }
+
+
+def hash_password(password: str) -> str:
+    return _submit_password_task(_hash_in_worker, password).result()
+
+
+def verify_password(plain_password: str, password_hash: str) -> bool:
+    return _submit_password_task(
+        _verify_in_worker,
+        plain_password,
+        password_hash,
+    ).result()
+
+
+async def verify_password_async(plain_password: str, password_hash: str) -> bool:
+    return await asyncio.wrap_future(
+        _submit_password_task(_verify_in_worker, plain_password, password_hash)
+    )
+
+
 def create_access_token(subject: str, additional_claims: Dict[str, Any] | None = None) -> str:
     expires_at = datetime.now(timezone.utc) + timedelta(
         minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
@@ -1,26 +1,144 @@
 # backend/app/db/database.py
-from typing import Generator, Optional
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    Optional,
+    Type,
+)
 
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import Pool
 from sqlmodel import Session, create_engine
 
 from app.core.config import settings
+from app.core.metrics import install_query_metrics
+from app.core.profiling import install_profile_hooks
+from app.db.pool import (
+    PoolStats,
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    install_idle_pre_ping,
+    pool_snapshot,
+    timed_pool_class,
+)
+from app.db.slow_query import SlowQueryLog, install_slow_query_log
 
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-)
+logger = logging.getLogger(__name__)
+
+_pool_stats: Dict[str, PoolStats] = {
+    "mssql": PoolStats(),
+    "mysql_pipeline": PoolStats(),
+    "mysql_pipeline_async": PoolStats(),
+}
+_instrumented_engines: Dict[str, Engine] = {}
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-    class_=Session,
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    max_entries=settings.SLOW_QUERY_MAX_ENTRIES,
 )
 
+
+def _pool_options(
+    name: str,
+    pool_class: Type[Pool],
+    pool_size: int,
+    max_overflow: int,
+    pool_recycle: int,
+    pool_timeout: float,
+    pre_ping: str,
+) -> Dict[str, Any]:
+    return {
+        "poolclass": timed_pool_class(pool_class, _pool_stats[name]),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": pool_recycle,
+        "pool_timeout": pool_timeout,
+        "pool_pre_ping": pre_ping == "always",
+    }
+
+
+def _instrument_engine(
+    name: str,
+    sync_engine: Engine,
+    pre_ping: str,
+    ping_idle_seconds: float,
+    explain_engine: Optional[Callable[[], Engine]] = None,
+) -> None:
+    if pre_ping == "idle":
+        install_idle_pre_ping(sync_engine, _pool_stats[name], ping_idle_seconds)
+    install_query_metrics(sync_engine, name)
+    install_profile_hooks(sync_engine, name)
+    install_slow_query_log(
+        sync_engine,
+        name,
+        slow_query_log,
+        explain_engine if settings.SLOW_QUERY_EXPLAIN else None,
+    )
+    _instrumented_engines[name] = sync_engine
+
+
+# Engine SQL Server dibuat saat pertama dipakai, bukan saat import: membangun
+# DATABASE_URL berarti import pyodbc dan enumerasi driver ODBC, yang tidak
+# perlu dibayar oleh setiap worker/CLI sebelum benar-benar butuh koneksi.
+_engine: Optional[Engine] = None
+_session_factory = None
+
+
+def _get_session_factory():
+    global _engine
+    global _session_factory
+
+    if _session_factory is None:
+        _engine = create_engine(
+            settings.DATABASE_URL,
+            echo=False,
+            **_pool_options(
+                "mssql",
+                TimedQueuePool,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pre_ping=settings.DB_POOL_PRE_PING,
+            ),
+        )
+        _instrument_engine(
+            "mssql",
+            _engine,
+            settings.DB_POOL_PRE_PING,
+            settings.DB_POOL_PING_IDLE_SECONDS,
+        )
+        _session_factory = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=_engine,
+            class_=Session,
+        )
+
+    return _session_factory
+
+
+def get_engine() -> Engine:
+    _get_session_factory()
+    assert _engine is not None
+    return _engine
+
+
 _mysql_pipeline_engine: Optional[Engine] = None
 _mysql_pipeline_session_factory = None
 
@@ -33,15 +151,27 @@ def _get_mysql_pipeline_session_factory():
         _mysql_pipeline_engine = create_engine(
             settings.MYSQL_PIPELINE_DATABASE_URL,
             echo=False,
-            pool_pre_ping=True,
-            pool_recycle=1800,
-            pool_size=5,
-            max_overflow=5,
             connect_args={
                 "connect_timeout": settings.MYSQL_PIPELINE_CONNECT_TIMEOUT,
                 "read_timeout": settings.MYSQL_PIPELINE_READ_TIMEOUT,
                 "write_timeout": settings.MYSQL_PIPELINE_WRITE_TIMEOUT,
             },
+            **_pool_options(
+                "mysql_pipeline",
+                TimedQueuePool,
+                pool_size=settings.MYSQL_PIPELINE_POOL_SIZE,
+                max_overflow=settings.MYSQL_PIPELINE_MAX_OVERFLOW,
+                pool_recycle=settings.MYSQL_PIPELINE_POOL_RECYCLE,
+                pool_timeout=settings.MYSQL_PIPELINE_POOL_TIMEOUT,
+                pre_ping=settings.MYSQL_PIPELINE_POOL_PRE_PING,
+            ),
+        )
+        _instrument_engine(
+            "mysql_pipeline",
+            _mysql_pipeline_engine,
+            settings.MYSQL_PIPELINE_POOL_PRE_PING,
+            settings.MYSQL_PIPELINE_POOL_PING_IDLE_SECONDS,
+            explain_engine=get_mysql_pipeline_engine,
         )
         _mysql_pipeline_session_factory = sessionmaker(
             autocommit=False,
@@ -53,18 +183,146 @@ def _get_mysql_pipeline_session_factory():
     return _mysql_pipeline_session_factory
 
 
-def get_session() -> Generator[Session, None, None]:
-    db = SessionLocal()
+def get_mysql_pipeline_engine() -> Engine:
+    _get_mysql_pipeline_session_factory()
+    assert _mysql_pipeline_engine is not None
+    return _mysql_pipeline_engine
+
+
+_mysql_pipeline_async_engine: Optional[AsyncEngine] = None
+_mysql_pipeline_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def _get_mysql_pipeline_async_session_factory() -> async_sessionmaker:
+    global _mysql_pipeline_async_engine
+    global _mysql_pipeline_async_session_factory
+
+    if _mysql_pipeline_async_session_factory is None:
+        _mysql_pipeline_async_engine = create_async_engine(
+            settings.MYSQL_PIPELINE_ASYNC_DATABASE_URL,
+            echo=False,
+            connect_args={
+                "connect_timeout": settings.MYSQL_PIPELINE_CONNECT_TIMEOUT,
+            },
+            **_pool_options(
+                "mysql_pipeline_async",
+                TimedAsyncAdaptedQueuePool,
+                pool_size=settings.MYSQL_PIPELINE_ASYNC_POOL_SIZE,
+                max_overflow=settings.MYSQL_PIPELINE_ASYNC_MAX_OVERFLOW,
+                pool_recycle=settings.MYSQL_PIPELINE_POOL_RECYCLE,
+                pool_timeout=settings.MYSQL_PIPELINE_POOL_TIMEOUT,
+                pre_ping=settings.MYSQL_PIPELINE_POOL_PRE_PING,
+            ),
+        )
+        _instrument_engine(
+            "mysql_pipeline_async",
+            _mysql_pipeline_async_engine.sync_engine,
+            settings.MYSQL_PIPELINE_POOL_PRE_PING,
+            settings.MYSQL_PIPELINE_POOL_PING_IDLE_SECONDS,
+            explain_engine=get_mysql_pipeline_engine,
+        )
+        _mysql_pipeline_async_session_factory = async_sessionmaker(
+            bind=_mysql_pipeline_async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    return _mysql_pipeline_async_session_factory
+
+
+def _mysql_pipeline_configured() -> bool:
+    return bool(settings.MYSQL_PIPELINE_HOST)
+
+
+def _warm_engine(name: str, get_target: Callable[[], Engine], count: int) -> int:
+    connections = []
+    try:
+        target = get_target()
+        for _ in range(count):
+            connections.append(target.connect())
+    except Exception as error:
+        logger.warning("Warmup pool %s berhenti di %s koneksi: %s", name, len(connections), error)
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def warm_pools() -> Dict[str, int]:
+    warmed = {}
+    if settings.DB_POOL_WARMUP > 0:
+        warmed["mssql"] = _warm_engine("mssql", get_engine, settings.DB_POOL_WARMUP)
+    if _mysql_pipeline_configured() and settings.MYSQL_PIPELINE_POOL_WARMUP > 0:
+        warmed["mysql_pipeline"] = _warm_engine(
+            "mysql_pipeline",
+            get_mysql_pipeline_engine,
+            settings.MYSQL_PIPELINE_POOL_WARMUP,
+        )
+    return warmed
+
+
+async def warm_async_pools() -> Dict[str, int]:
+    if not _mysql_pipeline_configured() or settings.MYSQL_PIPELINE_POOL_WARMUP <= 0:
+        return {}
+    connections = []
+    try:
+        _get_mysql_pipeline_async_session_factory()
+        assert _mysql_pipeline_async_engine is not None
+        for _ in range(settings.MYSQL_PIPELINE_POOL_WARMUP):
+            connections.append(await _mysql_pipeline_async_engine.connect())
+    except Exception as error:
+        logger.warning("Warmup pool mysql_pipeline_async gagal: %s", error)
+    finally:
+        for connection in connections:
+            await connection.close()
+    return {"mysql_pipeline_async": len(connections)}
+
+
+def pool_statistics() -> Dict[str, Dict[str, Any]]:
+    return {
+        name: pool_snapshot(target, _pool_stats[name])
+        for name, target in _instrumented_engines.items()
+    }
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    factory = _get_session_factory()
+    db = factory()
     try:
         yield db
     finally:
         db.close()
 
 
-def get_mysql_pipeline_session() -> Generator[Session, None, None]:
+@contextmanager
+def mysql_pipeline_session_scope() -> Iterator[Session]:
     factory = _get_mysql_pipeline_session_factory()
     db = factory()
     try:
         yield db
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def mysql_pipeline_async_session_scope() -> AsyncIterator[AsyncSession]:
+    factory = _get_mysql_pipeline_async_session_factory()
+    async with factory() as db:
+        yield db
+
+
+def get_session() -> Generator[Session, None, None]:
+    with session_scope() as db:
+        yield db
+
+
+def get_mysql_pipeline_session() -> Generator[Session, None, None]:
+    with mysql_pipeline_session_scope() as db:
+        yield db
+
+
+async def get_mysql_pipeline_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with mysql_pipeline_async_session_scope() as db:
+        yield db
@@ -0,0 +1,128 @@
+import threading
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+PRE_PING_STRATEGIES = {"always", "idle", "never"}
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_ping(self, ok: bool) -> None:
+        with self._lock:
+            self.pings += 1
+            if not ok:
+                self.ping_failures += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3)
+                if self.checkouts
+                else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "total_wait_ms": round(self.total_wait_ms, 3),
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+            }
+
+
+class _TimedPoolMixin:
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def timed_pool_class(base: Type[Pool], stats: PoolStats) -> Type[Pool]:
+    # Stats ditaruh di class (bukan instance) karena Pool.recreate() membuat
+    # instance baru dari self.__class__.
+    return type(f"{base.__name__}WithStats", (base,), {"stats": stats})
+
+
+def install_idle_pre_ping(
+    engine: Engine,
+    stats: PoolStats,
+    idle_seconds: float,
+) -> None:
+    # Ping hanya koneksi yang sudah idle lebih dari idle_seconds, sehingga
+    # checkout beruntun tidak membayar round trip tambahan.
+    @event.listens_for(engine, "checkin")
+    def _mark_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            stats.record_ping(True)
+        except Exception as error:
+            stats.record_ping(False)
+            raise exc.DisconnectionError() from error
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+
+def pool_snapshot(engine: Engine, stats: PoolStats) -> Dict[str, Any]:
+    pool = engine.pool
+    snapshot: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        snapshot.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            }
+        )
+    snapshot.update(stats.as_dict())
+    return snapshot
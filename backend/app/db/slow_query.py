@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = {"max_ms", "total_ms", "avg_ms", "count", "last_seen"}
+MAX_SQL_LENGTH = 4000
+EXPLAIN_MAX_PENDING = 4
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w@#:])-?\b\d+(?:\.\d+)?\b")
+_PYFORMAT_PARAM = re.compile(r"%\([^)]+\)s|%s")
+_NAMED_PARAM = re.compile(r"(?<!:):[A-Za-z_]\w*")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_sql(statement: str) -> str:
+    # Nilai literal dan placeholder diganti "?" dan daftar IN (...) dipadatkan
+    # agar query dengan jumlah filter berbeda tetap satu fingerprint.
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PYFORMAT_PARAM.sub("?", normalized)
+    normalized = _NAMED_PARAM.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _PLACEHOLDER_LIST.sub("(?...)", normalized)
+    return normalized[:MAX_SQL_LENGTH]
+
+
+def parameter_shape(parameters: Any) -> Dict[str, Any]:
+    # Hanya bentuk parameter (nama dan tipe) yang disimpan, bukan nilainya.
+    if isinstance(parameters, dict):
+        keys = sorted({_DIGITS.sub("#", str(key)) for key in parameters})
+        types = Counter(type(value).__name__ for value in parameters.values())
+        return {"style": "named", "count": len(parameters), "keys": keys, "types": dict(types)}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            shape = parameter_shape(parameters[0])
+            shape["executemany"] = len(parameters)
+            return shape
+        types = Counter(type(value).__name__ for value in parameters)
+        return {"style": "positional", "count": len(parameters), "types": dict(types)}
+    return {"style": "none", "count": 0}
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, max_entries: int):
+        self.threshold_ms = threshold_ms
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def record(
+        self,
+        database: str,
+        statement: str,
+        parameters: Any,
+        duration_ms: float,
+        rowcount: Optional[int],
+    ) -> tuple[str, bool]:
+        normalized = normalize_sql(statement)
+        fingerprint = hashlib.sha1(f"{database}:{normalized}".encode("utf-8")).hexdigest()[:16]
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                self._evict_if_full()
+                entry = {
+                    "fingerprint": fingerprint,
+                    "database": database,
+                    "sql": normalized,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "first_seen": now,
+                    "explain": None,
+                    "explain_error": None,
+                }
+                self._entries[fingerprint] = entry
+            is_new_max = duration_ms > entry["max_ms"]
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["last_ms"] = duration_ms
+            entry["last_seen"] = now
+            entry["last_rowcount"] = rowcount
+            if is_new_max:
+                entry["max_ms"] = duration_ms
+                entry["max_rowcount"] = rowcount
+                entry["parameters"] = parameter_shape(parameters)
+        return fingerprint, is_new_max
+
+    def _evict_if_full(self) -> None:
+        while len(self._entries) >= self.max_entries:
+            victim = min(self._entries.values(), key=lambda item: item["total_ms"])
+            del self._entries[victim["fingerprint"]]
+
+    def set_explain(self, fingerprint: str, plan: Optional[List[Dict[str, Any]]], error: Optional[str]) -> None:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                entry["explain"] = plan
+                entry["explain_error"] = error
+
+    def worst(self, limit: int = 20, sort_by: str = "max_ms", database: Optional[str] = None) -> List[Dict[str, Any]]:
+        if sort_by not in SORT_KEYS:
+            sort_by = "max_ms"
+        with self._lock:
+            items = [
+                {
+                    **entry,
+                    "avg_ms": entry["total_ms"] / entry["count"],
+                }
+                for entry in self._entries.values()
+                if database is None or entry["database"] == database
+            ]
+        items.sort(key=lambda item: item[sort_by], reverse=True)
+        for item in items:
+            for key in ("total_ms", "max_ms", "last_ms", "avg_ms"):
+                item[key] = round(item[key], 3)
+        return items[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_explain_executor: Optional[ThreadPoolExecutor] = None
+_explain_pending = 0
+_explain_lock = threading.Lock()
+
+
+def _get_explain_executor() -> ThreadPoolExecutor:
+    global _explain_executor
+    with _explain_lock:
+        if _explain_executor is None:
+            _explain_executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="slow-query-explain",
+            )
+        return _explain_executor
+
+
+def _run_explain(
+    log: SlowQueryLog,
+    fingerprint: str,
+    get_engine: Callable[[], Engine],
+    statement: str,
+    parameters: Any,
+) -> None:
+    global _explain_pending
+    try:
+        # Koneksi terpisah supaya EXPLAIN tidak menahan transaksi request.
+        with get_engine().connect().execution_options(slow_query_skip=True) as connection:
+            result = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plan = [dict(row) for row in result.mappings().all()]
+        log.set_explain(fingerprint, plan, None)
+    except Exception as error:
+        log.set_explain(fingerprint, None, str(error)[:500])
+    finally:
+        with _explain_lock:
+            _explain_pending -= 1
+
+
+def _schedule_explain(
+    log: SlowQueryLog,
+    fingerprint: str,
+    get_engine: Callable[[], Engine],
+    statement: str,
+    parameters: Any,
+) -> None:
+    global _explain_pending
+    with _explain_lock:
+        if _explain_pending >= EXPLAIN_MAX_PENDING:
+            return
+        _explain_pending += 1
+    try:
+        _get_explain_executor().submit(
+            _run_explain, log, fingerprint, get_engine, statement, parameters
+        )
+    except RuntimeError:
+        with _explain_lock:
+            _explain_pending -= 1
+
+
+def install_slow_query_log(
+    engine: Engine,
+    database: str,
+    log: SlowQueryLog,
+    explain_engine: Optional[Callable[[], Engine]] = None,
+) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("slow_query_started")
+        if not stack:
+            return
+        duration_ms = (time.perf_counter() - stack.pop()) * 1000
+        if not log.enabled or duration_ms < log.threshold_ms:
+            return
+        if conn.get_execution_options().get("slow_query_skip"):
+            return
+        rowcount = getattr(cursor, "rowcount", -1)
+        fingerprint, is_new_max = log.record(
+            database,
+            statement,
+            parameters,
+            duration_ms,
+            rowcount if isinstance(rowcount, int) and rowcount >= 0 else None,
+        )
+        logger.warning("Slow query %s [%s] %.1f ms", fingerprint, database, duration_ms)
+        if (
+            explain_engine is not None
+            and is_new_max
+            and not executemany
+            and statement.lstrip().upper().startswith("SELECT")
+        ):
+            _schedule_explain(log, fingerprint, explain_engine, statement, parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None:
+            stack = connection.info.get("slow_query_started")
+            if stack:
+                stack.pop()
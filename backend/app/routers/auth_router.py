@@ -1,7 +1,9 @@
+import hashlib
+import json
 import secrets
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlmodel import Session
 
 from app.core.auth_dependencies import (
@@ -15,6 +17,7 @@ from app.db.database import get_session
 from app.models.app_user import AppUser
 from app.schemas.auth import (
     AppUserCreate,
+    AppUserPage,
     AppUserRead,
     AppUserUpdate,
     LoginRequest,
@@ -29,8 +32,12 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/login", response_model=ApiResponse[LoginResponse])
-def login(payload: LoginRequest, db: Session = Depends(get_session)):
-    user = auth_service.authenticate_user(db, payload.username, payload.password)
+async def login(payload: LoginRequest, db: Session = Depends(get_session)):
+    user = await auth_service.authenticate_user_async(
+        db,
+        payload.username,
+        payload.password,
+    )
     access_token = create_access_token(
         subject=str(user.user_id),
         additional_claims={"username": user.username, "role": user.role},
@@ -86,6 +93,45 @@ def list_users(
     )
 
 
+@router.get("/users/directory", response_model=ApiResponse[AppUserPage])
+def list_user_directory(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(25, ge=1, le=200),
+    search: str | None = None,
+    role: str | None = None,
+    is_active: bool | None = None,
+    sort_by: str = "username",
+    sort_dir: str = Query("asc", regex="^(asc|desc)$"),
+    db: Session = Depends(get_session),
+    _: AppUser = Depends(require_user_directory_viewer),
+):
+    data = auth_service.get_user_directory(
+        db=db,
+        page=page,
+        page_size=page_size,
+        search=search,
+        role=role,
+        is_active=is_active,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+    )
+    payload = ApiResponse(success=True, data=AppUserPage(**data))
+    digest = hashlib.sha256(
+        json.dumps(payload.dict(), sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    etag = f'W/"{digest[:32]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+        )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return payload
+
+
 @router.post("/users", response_model=ApiResponse[AppUserRead])
 def create_user(
     payload: AppUserCreate,
@@ -1,16 +1,33 @@
-from fastapi import APIRouter, Depends, Query
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import Session
 
 from app.core.auth_dependencies import get_current_user
-from app.db.database import get_mysql_pipeline_session, get_session
+from app.core.config import settings
+from app.db.database import (
+    get_mysql_pipeline_async_session,
+    get_mysql_pipeline_session,
+    get_session,
+)
 from app.models.app_user import AppUser
 from app.schemas.odists_parsing import (
     OdistsBatchUpdateRequest,
     OdistsBatchUpdateResult,
+    OdistsClaimNextRequest,
+    OdistsLeaseRequest,
     OdistsPage,
     OdistsUpdateRequest,
 )
-from app.services import odists_parsing_service, parsing_baseline_service
+from app.services import (
+    odists_claim_service,
+    odists_duplicate_service,
+    odists_parsing_service,
+    parsing_baseline_service,
+)
+from app.services.odists_lease_service import lease_store
 from app.types import ApiResponse
 
 
@@ -18,17 +35,17 @@ router = APIRouter(prefix="/odists-parsing", tags=["ODIST Parsing"])
 
 
 @router.get("", response_model=ApiResponse[OdistsPage])
-def get_odists_page(
+async def get_odists_page(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=200),
     columns: str | None = None,
     filters: str | None = None,
     sort_by: str = "id",
     sort_dir: str = Query("asc", regex="^(asc|desc)$"),
-    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    mysql_db: AsyncSession = Depends(get_mysql_pipeline_async_session),
     _: AppUser = Depends(get_current_user),
 ):
-    data = odists_parsing_service.get_page(
+    data = await odists_parsing_service.get_page_async(
         db=mysql_db,
         page=page,
         page_size=page_size,
@@ -40,16 +57,82 @@ def get_odists_page(
     return ApiResponse(success=True, data=OdistsPage(**data))
 
 
+def _sse(event: str, data: object, event_id: object = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@router.get("/events")
+async def stream_odists_changes(
+    request: Request,
+    filters: str | None = None,
+    mysql_db: AsyncSession = Depends(get_mysql_pipeline_async_session),
+    _: AppUser = Depends(get_current_user),
+):
+    # Event "change" = {id, changed_fields, values, updated_by} dari
+    # update_rows; "resync" dikirim bila buffer klien penuh dan ada event yang
+    # terbuang, klien sebaiknya refetch halaman yang sedang tampil.
+    row_filter = await odists_parsing_service.change_filter_async(mysql_db, filters)
+    subscription = odists_parsing_service.change_broker.subscribe(row_filter)
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Koneksi live update sedang penuh, coba lagi nanti",
+        )
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                events, dropped = await subscription.next_batch(
+                    settings.ODISTS_EVENTS_KEEPALIVE_SECONDS
+                )
+                if dropped:
+                    yield _sse("resync", {"dropped": dropped})
+                for event in events:
+                    yield _sse("change", event, event["seq"])
+                if not events and not dropped:
+                    yield ": keepalive\n\n"
+        finally:
+            odists_parsing_service.change_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/autocomplete/{field}", response_model=ApiResponse[list[dict]])
+async def autocomplete_values(
+    field: str,
+    prefix: str = "",
+    limit: int = Query(20, ge=1, le=200),
+    mysql_db: AsyncSession = Depends(get_mysql_pipeline_async_session),
+    _: AppUser = Depends(get_current_user),
+):
+    values = await odists_parsing_service.autocomplete_async(
+        db=mysql_db,
+        field=field,
+        prefix=prefix,
+        limit=limit,
+    )
+    return ApiResponse(success=True, data=values)
+
+
 @router.get("/values/{field}", response_model=ApiResponse[list[dict]])
-def get_distinct_values(
+async def get_distinct_values(
     field: str,
     search: str | None = None,
     filters: str | None = None,
     limit: int = Query(100, ge=1, le=200),
-    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    mysql_db: AsyncSession = Depends(get_mysql_pipeline_async_session),
     _: AppUser = Depends(get_current_user),
 ):
-    values = odists_parsing_service.get_distinct_values(
+    values = await odists_parsing_service.get_distinct_values_async(
         db=mysql_db,
         field=field,
         search=search,
@@ -59,23 +142,92 @@ def get_distinct_values(
     return ApiResponse(success=True, data=values)
 
 
+@router.post("/leases", response_model=ApiResponse[dict])
+def claim_leases(
+    payload: OdistsLeaseRequest,
+    current_user: AppUser = Depends(get_current_user),
+):
+    result = lease_store.claim(payload.ids, current_user)
+    return ApiResponse(
+        success=True,
+        data=result,
+        message=f"{len(result['claimed'])} row ODIST ditandai sedang dikerjakan",
+    )
+
+
+@router.post("/claim-next", response_model=ApiResponse[dict])
+def claim_next_rows(
+    payload: OdistsClaimNextRequest,
+    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    current_user: AppUser = Depends(get_current_user),
+):
+    result = odists_parsing_service.claim_next(
+        db=mysql_db,
+        current_user=current_user,
+        limit=payload.limit,
+        dist_code=payload.dist_code,
+        province=payload.province,
+    )
+    return ApiResponse(
+        success=True,
+        data=result,
+        message=(
+            f"{result['claimed_count']} row ODIST berhasil diklaim"
+            if result["claimed_count"]
+            else "Tidak ada row ODIST yang belum diparsing"
+        ),
+    )
+
+
+@router.post("/leases/renew", response_model=ApiResponse[dict])
+def renew_leases(
+    payload: OdistsLeaseRequest,
+    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    current_user: AppUser = Depends(get_current_user),
+):
+    # Klaim claim-next di MySQL ikut diperpanjang supaya tidak diambil proses
+    # lain selama lease lokal masih hidup.
+    odists_claim_service.renew(mysql_db, payload.ids, current_user, lease_store.ttl_seconds)
+    return ApiResponse(success=True, data=lease_store.renew(payload.ids, current_user))
+
+
+@router.post("/leases/release", response_model=ApiResponse[dict])
+def release_leases(
+    payload: OdistsLeaseRequest,
+    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    current_user: AppUser = Depends(get_current_user),
+):
+    odists_claim_service.release(mysql_db, payload.ids, current_user)
+    released = lease_store.release(payload.ids, current_user)
+    return ApiResponse(success=True, data={"released_count": released})
+
+
 @router.put("/batch", response_model=ApiResponse[OdistsBatchUpdateResult])
-def update_odists_batch(
+async def update_odists_batch(
     payload: OdistsBatchUpdateRequest,
-    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    mysql_db: AsyncSession = Depends(get_mysql_pipeline_async_session),
     audit_db: Session = Depends(get_session),
     current_user: AppUser = Depends(get_current_user),
 ):
-    parsing_baseline_service.ensure_baselines_before_update(
+    items = [item.dict() for item in payload.items]
+    # Lease dan validasi dicek sebelum baseline ditulis ke MSSQL, supaya batch
+    # yang pasti ditolak tidak meninggalkan baseline.
+    metadata = await odists_parsing_service.precheck_update_async(
+        mysql_db,
+        items,
+        current_user,
+    )
+    await parsing_baseline_service.ensure_baselines_before_update_async(
         mysql_db=mysql_db,
         audit_db=audit_db,
         odist_ids=[item.id for item in payload.items],
     )
-    result = odists_parsing_service.update_rows(
+    result = await odists_parsing_service.update_rows_async(
         mysql_db=mysql_db,
         audit_db=audit_db,
-        items=[item.dict() for item in payload.items],
+        items=items,
         current_user=current_user,
+        metadata=metadata,
     )
     return ApiResponse(
         success=True,
@@ -84,25 +236,56 @@ def update_odists_batch(
     )
 
 
+@router.get("/{odist_id}/ogal-suggestions", response_model=ApiResponse[dict])
+def get_ogal_suggestions(
+    odist_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    _: AppUser = Depends(get_current_user),
+):
+    result = odists_parsing_service.suggest_ogal_ids(
+        db=mysql_db,
+        odist_id=odist_id,
+        limit=limit,
+    )
+    return ApiResponse(success=True, data=result)
+
+
+@router.get("/{odist_id}/duplicates", response_model=ApiResponse[list[dict]])
+def get_odist_duplicates(
+    odist_id: int,
+    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    _: AppUser = Depends(get_current_user),
+):
+    items = odists_duplicate_service.duplicates_for(mysql_db, odist_id)
+    return ApiResponse(success=True, data=items)
+
+
 @router.put("/{odist_id}", response_model=ApiResponse[dict])
-def update_odist(
+async def update_odist(
     odist_id: int,
     payload: OdistsUpdateRequest,
-    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    mysql_db: AsyncSession = Depends(get_mysql_pipeline_async_session),
     audit_db: Session = Depends(get_session),
     current_user: AppUser = Depends(get_current_user),
 ):
-    parsing_baseline_service.ensure_baselines_before_update(
+    metadata = await odists_parsing_service.precheck_update_async(
+        mysql_db,
+        [{"id": odist_id, "values": payload.values}],
+        current_user,
+    )
+    await parsing_baseline_service.ensure_baselines_before_update_async(
         mysql_db=mysql_db,
         audit_db=audit_db,
         odist_ids=[odist_id],
     )
-    updated = odists_parsing_service.update_row(
+    updated = await odists_parsing_service.update_row_async(
         mysql_db=mysql_db,
         audit_db=audit_db,
         odist_id=odist_id,
         values=payload.values,
         current_user=current_user,
+        metadata=metadata,
     )
     return ApiResponse(
         success=True,
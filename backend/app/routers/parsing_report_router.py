@@ -1,11 +1,13 @@
 from datetime import date, datetime, time
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
 from app.core.auth_dependencies import get_current_user
 from app.db.database import get_mysql_pipeline_session, get_session
 from app.models.app_user import AppUser
+from app.services import parsing_report_export_service
 from app.services import parsing_report_filter_service
 from app.services import parsing_report_service
 from app.types import ApiResponse
@@ -114,3 +116,57 @@ def get_activity_history(
         sort_dir=sort_dir,
     )
     return ApiResponse(success=True, data=data)
+
+
+@router.get("/field-history", response_model=ApiResponse[dict])
+def get_field_history(
+    odist_id: int = Query(..., ge=1),
+    field: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=500),
+    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    audit_db: Session = Depends(get_session),
+    current_user: AppUser = Depends(get_current_user),
+):
+    data = parsing_report_filter_service.get_field_history(
+        mysql_db=mysql_db,
+        audit_db=audit_db,
+        odist_id=odist_id,
+        field=field,
+        user_id=_effective_user_id(current_user, None),
+        limit=limit,
+    )
+    return ApiResponse(success=True, data=data)
+
+
+@router.get("/history/export")
+def export_activity_history(
+    export_format: str = Query("csv", alias="format", regex="^(csv|ndjson)$"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    odist_id: int | None = Query(default=None, ge=1),
+    user_id: int | None = None,
+    change_type: str | None = None,
+    revert_state: str | None = None,
+    search: str | None = None,
+    sort_dir: str = Query("desc", regex="^(asc|desc)$"),
+    current_user: AppUser = Depends(get_current_user),
+):
+    # Tanpa session dari dependency: generator membuka session sendiri karena
+    # respons masih dikirim setelah dependency ditutup.
+    body = parsing_report_export_service.export_history(
+        export_format,
+        date_from=_start_of_day(date_from),
+        date_to=_start_of_day(date_to),
+        odist_id=odist_id,
+        user_id=_effective_user_id(current_user, user_id),
+        change_type=change_type,
+        revert_state=revert_state,
+        search=search,
+        sort_dir=sort_dir,
+    )
+    filename = f"parsing-history-{datetime.now():%Y%m%d-%H%M%S}.{export_format}"
+    return StreamingResponse(
+        body,
+        media_type=parsing_report_export_service.EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,145 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from sqlmodel import Session
+
+from app.core.auth_dependencies import require_admin
+from app.core.profiling import folded_stacks, profile_store
+from app.core.security import password_executor_stats
+from app.db.database import get_mysql_pipeline_session, pool_statistics, slow_query_log
+from app.models.app_user import AppUser
+from app.services import odists_duplicate_service
+from app.services.odists_lease_service import lease_store
+from app.services.odists_parsing_service import (
+    autocomplete_index,
+    change_broker,
+    ogal_suggestions,
+)
+from app.services.parsing_report_core import normalize_cache_stats
+from app.services.parsing_report_service import report_cache
+from app.types import ApiResponse
+
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+
+@router.get("/password-hashing", response_model=ApiResponse[dict])
+def get_password_hashing_stats(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=password_executor_stats())
+
+
+@router.get("/pools", response_model=ApiResponse[dict])
+def get_pool_stats(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=pool_statistics())
+
+
+@router.get("/report-normalize-cache", response_model=ApiResponse[dict])
+def get_report_normalize_cache_stats(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=normalize_cache_stats())
+
+
+@router.get("/odists-events", response_model=ApiResponse[dict])
+def get_odists_event_stats(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=change_broker.stats())
+
+
+@router.get("/odists-autocomplete", response_model=ApiResponse[dict])
+def get_odists_autocomplete_stats(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=autocomplete_index.stats())
+
+
+@router.post("/odists-autocomplete/rebuild", response_model=ApiResponse[dict])
+def rebuild_odists_autocomplete(_: AppUser = Depends(require_admin)):
+    autocomplete_index.start_background_build()
+    return ApiResponse(success=True, data=autocomplete_index.stats())
+
+
+@router.get("/ogal-suggestions", response_model=ApiResponse[dict])
+def get_ogal_suggestion_stats(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=ogal_suggestions.stats())
+
+
+@router.post("/ogal-suggestions/rebuild", response_model=ApiResponse[dict])
+def rebuild_ogal_suggestions(_: AppUser = Depends(require_admin)):
+    ogal_suggestions.start_background_build()
+    return ApiResponse(success=True, data=ogal_suggestions.stats())
+
+
+@router.get("/odists-duplicates", response_model=ApiResponse[dict | None])
+def get_odists_duplicate_job(
+    mysql_db: Session = Depends(get_mysql_pipeline_session),
+    _: AppUser = Depends(require_admin),
+):
+    if not odists_duplicate_service.tables_ready(mysql_db):
+        return ApiResponse(success=True, data=None)
+    return ApiResponse(success=True, data=odists_duplicate_service.get_job(mysql_db))
+
+
+@router.get("/odists-leases", response_model=ApiResponse[dict])
+def get_odists_lease_stats(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=lease_store.stats())
+
+
+@router.get("/report-cache", response_model=ApiResponse[dict])
+def get_report_cache_stats(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=report_cache.stats())
+
+
+@router.delete("/report-cache", response_model=ApiResponse[dict])
+def clear_report_cache(_: AppUser = Depends(require_admin)):
+    report_cache.clear()
+    return ApiResponse(success=True, data=report_cache.stats())
+
+
+@router.get("/slow-queries", response_model=ApiResponse[dict])
+def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    sort_by: str = Query("max_ms", regex="^(max_ms|total_ms|avg_ms|count|last_seen)$"),
+    database: str | None = Query(default=None),
+    _: AppUser = Depends(require_admin),
+):
+    return ApiResponse(
+        success=True,
+        data={
+            "threshold_ms": slow_query_log.threshold_ms,
+            "items": slow_query_log.worst(limit, sort_by, database),
+        },
+    )
+
+
+@router.delete("/slow-queries", response_model=ApiResponse[dict])
+def clear_slow_queries(_: AppUser = Depends(require_admin)):
+    slow_query_log.clear()
+    return ApiResponse(success=True, data={"cleared": True})
+
+
+def _require_profile(profile_id: str) -> dict:
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile tidak ditemukan atau sudah tergeser profile yang lebih baru",
+        )
+    return profile
+
+
+@router.get("/profiles", response_model=ApiResponse[list[dict]])
+def list_profiles(_: AppUser = Depends(require_admin)):
+    return ApiResponse(success=True, data=profile_store.list())
+
+
+@router.get("/profiles/{profile_id}", response_model=ApiResponse[dict])
+def get_profile(profile_id: str, _: AppUser = Depends(require_admin)):
+    profile = _require_profile(profile_id)
+    data = {key: value for key, value in profile.items() if key != "folded"}
+    return ApiResponse(success=True, data=data)
+
+
+@router.get("/profiles/{profile_id}/folded", response_class=PlainTextResponse)
+def download_profile_folded(profile_id: str, _: AppUser = Depends(require_admin)):
+    profile = _require_profile(profile_id)
+    return PlainTextResponse(
+        folded_stacks(profile),
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'
+        },
+    )
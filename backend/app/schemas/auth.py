@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, validator
 
@@ -85,6 +85,14 @@ class AppUserRead(BaseModel):
         orm_mode = True
 
 
+class AppUserPage(BaseModel):
+    items: List[AppUserRead]
+    total: int
+    page: int
+    page_size: int
+    total_pages: int
+
+
 class LoginResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
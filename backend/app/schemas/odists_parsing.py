@@ -7,6 +7,10 @@ class OdistsColumn(BaseModel):
     name: str
     label: str
     data_type: str
+    column_type: Optional[str] = None
+    max_length: Optional[int] = None
+    numeric_precision: Optional[int] = None
+    numeric_scale: Optional[int] = None
     is_nullable: bool
     ordinal_position: int
     editable: bool
@@ -19,6 +23,7 @@ class OdistsPage(BaseModel):
     page_size: int
     total_pages: int
     columns: List[OdistsColumn]
+    leases: Dict[int, Dict[str, Any]] = Field(default_factory=dict)
 
 
 class OdistsUpdateRequest(BaseModel):
@@ -37,3 +42,13 @@ class OdistsBatchUpdateRequest(BaseModel):
 class OdistsBatchUpdateResult(BaseModel):
     updated_count: int
     updated_ids: List[int]
+
+
+class OdistsLeaseRequest(BaseModel):
+    ids: List[int] = Field(..., min_items=1, max_items=200)
+
+
+class OdistsClaimNextRequest(BaseModel):
+    limit: int = Field(10, ge=1, le=50)
+    dist_code: Optional[str] = None
+    province: Optional[str] = None
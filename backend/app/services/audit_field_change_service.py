@@ -0,0 +1,285 @@
+# Tabel anak [tools].[odists_parsing_audit_field_change]: satu baris per field
+# per audit, ditulis setelah audit log-nya commit (best effort; baris yang
+# gagal ditulis diisi ulang oleh backfill_audit_field_changes.py). Lookup
+# owner dan revert per (odist_id, field) jadi seek index, tanpa parse JSON
+# audit.
+import threading
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.services import parsing_report_core as core
+
+
+TABLE_NAME = "[tools].[odists_parsing_audit_field_change]"
+
+ENSURE_TABLE_SQL = text(
+    f"""
+    IF OBJECT_ID(N'{TABLE_NAME}', N'U') IS NULL
+    BEGIN
+        CREATE TABLE {TABLE_NAME} (
+            [audit_id] BIGINT NOT NULL,
+            [odist_id] BIGINT NOT NULL,
+            [field] NVARCHAR(128) NOT NULL,
+            [old_value] NVARCHAR(MAX) NULL,
+            [new_value] NVARCHAR(MAX) NULL,
+            [normalized_new_value] NVARCHAR(MAX) NOT NULL,
+            [normalized_new_hash] AS CAST(
+                HASHBYTES('SHA2_256', [normalized_new_value]) AS BINARY(32)
+            ) PERSISTED,
+            CONSTRAINT [PK_odists_parsing_audit_field_change]
+                PRIMARY KEY CLUSTERED ([audit_id] ASC, [field] ASC)
+        );
+        CREATE INDEX [IX_odists_parsing_audit_field_change_owner]
+            ON {TABLE_NAME}
+                ([odist_id] ASC, [field] ASC, [normalized_new_hash] ASC, [audit_id] DESC);
+        CREATE INDEX [IX_odists_parsing_audit_field_change_history]
+            ON {TABLE_NAME}
+                ([odist_id] ASC, [field] ASC, [audit_id] DESC)
+            INCLUDE ([normalized_new_hash]);
+    END;
+    """
+)
+
+INSERT_SQL = text(
+    f"""
+    INSERT INTO {TABLE_NAME}
+        ([audit_id], [odist_id], [field], [old_value], [new_value], [normalized_new_value])
+    VALUES
+        (:audit_id, :odist_id, :field, :old_value, :new_value, :normalized_new_value)
+    """
+)
+
+DEFAULT_BACKFILL_CHUNK = 5000
+
+_table_ready = False
+_table_lock = threading.Lock()
+
+
+def _text_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return str(value)
+
+
+def field_change_rows(
+    audit_id: int,
+    odist_id: int,
+    old_values: Mapping[str, Any],
+    new_values: Mapping[str, Any],
+) -> List[Dict[str, Any]]:
+    # Satu baris per field yang diisi audit (key new_values), sama dengan
+    # field yang dipakai find_field_owner / event_revert_state di core.
+    return [
+        {
+            "audit_id": int(audit_id),
+            "odist_id": int(odist_id),
+            "field": field,
+            "old_value": _text_value(old_values.get(field)),
+            "new_value": _text_value(value),
+            "normalized_new_value": core.normalize(value),
+        }
+        for field, value in new_values.items()
+    ]
+
+
+def rows_from_audit_record(audit_id: int, record: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    old_values = core.safe_json(record.get("old_values"), {})
+    new_values = core.safe_json(record.get("new_values"), {})
+    return field_change_rows(
+        audit_id,
+        record["odist_id"],
+        old_values if isinstance(old_values, dict) else {},
+        new_values if isinstance(new_values, dict) else {},
+    )
+
+
+def ensure_table(audit_db: Session) -> None:
+    # Sekali per proses di jalur tulis, tanpa menunggu halaman report
+    # menjalankan _ensure_schema.
+    global _table_ready
+    if _table_ready:
+        return
+    with _table_lock:
+        if _table_ready:
+            return
+        audit_db.execute(ENSURE_TABLE_SQL)
+        audit_db.commit()
+        _table_ready = True
+
+
+def insert_field_changes(audit_db: Session, rows: List[Dict[str, Any]]) -> int:
+    # Tidak commit: pemanggil yang menentukan batas transaksinya.
+    if rows:
+        audit_db.execute(INSERT_SQL, rows)
+    return len(rows)
+
+
+def backfill_chunk(
+    audit_db: Session,
+    after_audit_id: int,
+    chunk_size: int = DEFAULT_BACKFILL_CHUNK,
+) -> tuple[int, int, int]:
+    # Ambil audit berikutnya (urut audit_id) yang belum punya baris field
+    # change, tulis barisnya lalu commit. Aman diulang/dilanjutkan kapan saja.
+    audits = audit_db.execute(
+        text(
+            f"""
+            SELECT TOP (:chunk_size) a.audit_id, a.odist_id, a.old_values, a.new_values
+            FROM [tools].[odists_parsing_audit_log] AS a
+            WHERE a.audit_id > :after_audit_id
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM {TABLE_NAME} AS fc
+                  WHERE fc.audit_id = a.audit_id
+              )
+            ORDER BY a.audit_id ASC
+            """
+        ),
+        {"chunk_size": chunk_size, "after_audit_id": after_audit_id},
+    ).mappings().all()
+    if not audits:
+        return after_audit_id, 0, 0
+
+    rows: List[Dict[str, Any]] = []
+    for audit in audits:
+        rows.extend(rows_from_audit_record(int(audit["audit_id"]), audit))
+    try:
+        insert_field_changes(audit_db, rows)
+        audit_db.commit()
+    except Exception:
+        audit_db.rollback()
+        raise
+    return int(audits[-1]["audit_id"]), len(audits), len(rows)
+
+
+def backfill(
+    audit_db: Session,
+    chunk_size: int = DEFAULT_BACKFILL_CHUNK,
+    after_audit_id: int = 0,
+) -> Iterator[tuple[int, int, int]]:
+    while True:
+        last_audit_id, audit_count, row_count = backfill_chunk(
+            audit_db,
+            after_audit_id,
+            chunk_size,
+        )
+        if not audit_count:
+            return
+        yield last_audit_id, audit_count, row_count
+        after_audit_id = last_audit_id
+
+
+def load_baseline(audit_db: Session, odist_id: int) -> Optional[Dict[str, Any]]:
+    row = audit_db.execute(
+        text(
+            """
+            SELECT odist_id, original_values, baseline_source,
+                   baseline_created_at, baseline_updated_at
+            FROM [tools].[odists_parsing_baseline]
+            WHERE odist_id = :odist_id
+            """
+        ),
+        {"odist_id": odist_id},
+    ).mappings().one_or_none()
+    return core.parse_baseline_row(row) if row is not None else None
+
+
+_AUDIT_COLUMNS = """
+    a.audit_id,
+    a.user_id,
+    a.username,
+    COALESCE(NULLIF(a.actor_full_name, N''), NULLIF(u.full_name, N''), a.username)
+        AS actor_full_name,
+    a.changed_at,
+    a.change_type
+"""
+
+
+def find_field_owner(
+    audit_db: Session,
+    odist_id: int,
+    field: str,
+    current_value: Any,
+) -> Optional[Dict[str, Any]]:
+    # Padanan SQL dari parsing_report_core.find_field_owner: audit COMMITTED
+    # terakhir yang mengisi field dengan nilai (ternormalisasi) saat ini.
+    normalized = core.normalize(current_value)
+    row = audit_db.execute(
+        text(
+            f"""
+            SELECT TOP (1) {_AUDIT_COLUMNS}, fc.new_value
+            FROM {TABLE_NAME} AS fc
+            INNER JOIN [tools].[odists_parsing_audit_log] AS a
+                ON a.audit_id = fc.audit_id
+            LEFT JOIN [tools].[app_users] AS u
+                ON u.user_id = a.user_id
+            WHERE fc.odist_id = :odist_id
+              AND fc.field = :field
+              AND fc.normalized_new_hash = CAST(
+                  HASHBYTES('SHA2_256', CAST(:normalized AS NVARCHAR(MAX))) AS BINARY(32)
+              )
+              AND fc.normalized_new_value = :normalized
+              AND COALESCE(a.apply_status, N'COMMITTED') = N'COMMITTED'
+            ORDER BY a.changed_at DESC, a.audit_id DESC
+            """
+        ),
+        {"odist_id": odist_id, "field": field, "normalized": normalized},
+    ).mappings().one_or_none()
+    return dict(row) if row is not None else None
+
+
+def field_history(
+    audit_db: Session,
+    odist_id: int,
+    field: str,
+    baseline_norm: Mapping[str, str],
+    user_id: Optional[int] = None,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    # Perubahan terbaru satu field; is_revert = nilai baru sama dengan baseline
+    # (perbandingan yang sama dengan event_revert_state per field).
+    params: Dict[str, Any] = {"odist_id": odist_id, "field": field, "limit": limit}
+    user_filter = ""
+    if user_id is not None:
+        user_filter = "AND a.user_id = :user_id"
+        params["user_id"] = user_id
+
+    rows = audit_db.execute(
+        text(
+            f"""
+            SELECT TOP (:limit) {_AUDIT_COLUMNS},
+                   fc.old_value, fc.new_value, fc.normalized_new_value
+            FROM {TABLE_NAME} AS fc
+            INNER JOIN [tools].[odists_parsing_audit_log] AS a
+                ON a.audit_id = fc.audit_id
+            LEFT JOIN [tools].[app_users] AS u
+                ON u.user_id = a.user_id
+            WHERE fc.odist_id = :odist_id
+              AND fc.field = :field
+              AND COALESCE(a.apply_status, N'COMMITTED') = N'COMMITTED'
+              {user_filter}
+            ORDER BY a.changed_at DESC, a.audit_id DESC
+            """
+        ),
+        params,
+    ).mappings().all()
+
+    baseline_value = baseline_norm.get(field, "")
+    return [
+        {
+            "audit_id": int(row["audit_id"]),
+            "user_id": int(row["user_id"]),
+            "username": row["username"],
+            "actor_full_name": row["actor_full_name"],
+            "changed_at": core.iso(row["changed_at"]),
+            "change_type": row["change_type"],
+            "old_value": row["old_value"],
+            "new_value": row["new_value"],
+            "is_revert": row["normalized_new_value"] == baseline_value,
+        }
+        for row in rows
+    ]
@@ -1,40 +1,69 @@
+import math
 from datetime import datetime
-from typing import List, cast
+from typing import Any, Dict, List, cast
 
 from fastapi import HTTPException, status
+from sqlalchemy import func, or_, update
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 
-from app.core.security import hash_password, verify_password
+from app.core.principal_cache import principal_cache
+from app.core.security import hash_password, verify_password, verify_password_async
 from app.models.app_user import AppUser
-from app.schemas.auth import AppUserCreate, AppUserUpdate
+from app.schemas.auth import AppUserCreate, AppUserRead, AppUserUpdate
 
 
 VALID_ROLES = {"ADMIN", "PARSER-TEAM", "PARSER-INTERN", "MANAGER"}
 LEGACY_ROLE_MAP = {"PARSER": "PARSER-TEAM"}
 ADMIN_EDIT_FIELDS = {"username", "full_name", "password", "role", "is_active"}
 MANAGER_EDIT_FIELDS = {"is_active"}
+USER_SORT_COLUMNS = {
+    "user_id": AppUser.user_id,
+    "username": AppUser.username,
+    "full_name": AppUser.full_name,
+    "role": AppUser.role,
+    "is_active": AppUser.is_active,
+    "last_login_at": AppUser.last_login_at,
+    "created_at": AppUser.created_at,
+    "updated_at": AppUser.updated_at,
+}
+
+
+def _effective_role(role: str) -> str:
+    return LEGACY_ROLE_MAP.get(role, role)
+
+
+def _apply_legacy_role(db: Session, user: AppUser) -> AppUser:
+    # Hanya di memori: penulisan role legacy ke database dilakukan oleh
+    # normalize_legacy_roles (batch), bukan oleh jalur baca. Instance
+    # dilepas dari session dulu supaya role hasil mapping tidak ikut
+    # ter-flush oleh commit lain di session yang sama.
+    role = _effective_role(user.role)
+    if role != user.role:
+        db.expunge(user)
+        user.role = role
+    return user
 
 
-def _normalize_legacy_role(user: AppUser) -> bool:
-    mapped_role = LEGACY_ROLE_MAP.get(user.role)
-    if not mapped_role:
-        return False
-    user.role = mapped_role
-    user.updated_at = datetime.now()
-    return True
+def normalize_legacy_roles(db: Session) -> int:
+    updated = 0
+    for legacy_role, mapped_role in LEGACY_ROLE_MAP.items():
+        result = db.execute(
+            update(AppUser)
+            .where(AppUser.role == legacy_role)
+            .values(role=mapped_role, updated_at=datetime.now())
+        )
+        updated += result.rowcount or 0
+    db.commit()
+    return updated
 
 
-def get_user_by_username(db: Session, username: str) -> AppUser | None:
+def _find_user_by_username(db: Session, username: str) -> AppUser | None:
     statement = select(AppUser).where(AppUser.username == username.strip().lower())
-    user = db.exec(statement).one_or_none()
-    if user is not None and _normalize_legacy_role(user):
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    return user
+    return db.exec(statement).one_or_none()
 
 
-def get_user_by_id(db: Session, user_id: int) -> AppUser:
+def _find_user_by_id(db: Session, user_id: int) -> AppUser:
     statement = select(AppUser).where(AppUser.user_id == user_id)
     user = db.exec(statement).one_or_none()
     if user is None:
@@ -42,30 +71,83 @@ def get_user_by_id(db: Session, user_id: int) -> AppUser:
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User tidak ditemukan",
         )
-    if _normalize_legacy_role(user):
-        db.add(user)
-        db.commit()
-        db.refresh(user)
     return user
 
 
+def get_user_by_username(db: Session, username: str) -> AppUser | None:
+    user = _find_user_by_username(db, username)
+    return _apply_legacy_role(db, user) if user is not None else None
+
+
+def get_user_by_id(db: Session, user_id: int) -> AppUser:
+    return _apply_legacy_role(db, _find_user_by_id(db, user_id))
+
+
 def get_all_users(db: Session) -> List[AppUser]:
     results = cast(List[AppUser], db.exec(select(AppUser).order_by(AppUser.user_id)).all())
-    changed = False
-    for user in results:
-        if _normalize_legacy_role(user):
-            db.add(user)
-            changed = True
-    if changed:
-        db.commit()
-        for user in results:
-            db.refresh(user)
-    return results
+    return [_apply_legacy_role(db, user) for user in results]
 
 
-def authenticate_user(db: Session, username: str, password: str) -> AppUser:
-    user = get_user_by_username(db, username)
-    if user is None or not verify_password(password, user.password_hash):
+def get_user_directory(
+    db: Session,
+    page: int,
+    page_size: int,
+    search: str | None = None,
+    role: str | None = None,
+    is_active: bool | None = None,
+    sort_by: str = "username",
+    sort_dir: str = "asc",
+) -> Dict[str, Any]:
+    conditions = []
+    if search and search.strip():
+        # Prefix match supaya bisa memakai index username / full_name.
+        prefix = f"{search.strip()}%"
+        conditions.append(
+            or_(
+                AppUser.username.like(prefix.lower()),
+                AppUser.full_name.like(prefix),
+            )
+        )
+    if role:
+        legacy_roles = [
+            legacy_role
+            for legacy_role, mapped_role in LEGACY_ROLE_MAP.items()
+            if mapped_role == role
+        ]
+        conditions.append(AppUser.role.in_([role, *legacy_roles]))
+    if is_active is not None:
+        conditions.append(AppUser.is_active == is_active)
+
+    sort_column = USER_SORT_COLUMNS.get(sort_by, AppUser.username)
+    order = sort_column.desc() if sort_dir.lower() == "desc" else sort_column.asc()
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), 200)
+
+    total = int(
+        db.exec(select(func.count()).select_from(AppUser).where(*conditions)).one()
+    )
+    users = db.exec(
+        select(AppUser)
+        .where(*conditions)
+        .order_by(order, AppUser.user_id.asc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    ).all()
+
+    return {
+        "items": [
+            AppUserRead(**{**user.dict(), "role": _effective_role(user.role)})
+            for user in users
+        ],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": max(1, math.ceil(total / page_size)),
+    }
+
+
+def _ensure_can_login(user: AppUser | None, password_ok: bool) -> AppUser:
+    if user is None or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Username atau password salah",
@@ -76,11 +158,32 @@ def authenticate_user(db: Session, username: str, password: str) -> AppUser:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User sudah tidak aktif",
         )
+    return user
+
+
+def _record_login(db: Session, user: AppUser) -> AppUser:
     user.last_login_at = datetime.now()
     db.add(user)
     db.commit()
     db.refresh(user)
-    return user
+    return _apply_legacy_role(db, user)
+
+
+def authenticate_user(db: Session, username: str, password: str) -> AppUser:
+    user = _find_user_by_username(db, username)
+    password_ok = user is not None and verify_password(password, user.password_hash)
+    return _record_login(db, _ensure_can_login(user, password_ok))
+
+
+async def authenticate_user_async(db: Session, username: str, password: str) -> AppUser:
+    # Query SQL Server tetap di threadpool, tetapi verifikasi bcrypt ditunggu
+    # secara async sehingga thread tidak tertahan selama hashing.
+    user = await run_in_threadpool(_find_user_by_username, db, username)
+    password_ok = user is not None and await verify_password_async(
+        password,
+        user.password_hash,
+    )
+    return await run_in_threadpool(_record_login, db, _ensure_can_login(user, password_ok))
 
 
 def create_user(db: Session, payload: AppUserCreate) -> AppUser:
@@ -142,7 +245,8 @@ def update_user(
     payload: AppUserUpdate,
     actor: AppUser,
 ) -> AppUser:
-    user = get_user_by_id(db, user_id)
+    # Instance dari session (role apa adanya di database) karena akan di-commit.
+    user = _find_user_by_id(db, user_id)
     update_data = payload.dict(exclude_unset=True)
     if not update_data:
         raise HTTPException(
@@ -152,7 +256,7 @@ def update_user(
 
     _validate_actor_permissions(actor, update_data)
 
-    next_role = update_data.get("role", user.role)
+    next_role = update_data.get("role", _effective_role(user.role))
     next_is_active = update_data.get("is_active", user.is_active)
 
     if actor.user_id == user_id and not next_is_active:
@@ -206,4 +310,5 @@ def update_user(
     db.add(user)
     db.commit()
     db.refresh(user)
-    return user
+    principal_cache.invalidate_user(user.user_id)
+    return _apply_legacy_role(db, user)
@@ -0,0 +1,248 @@
+import bisect
+import heapq
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.db.database import mysql_pipeline_session_scope
+
+
+MAX_QUEUED_DELTAS = 50_000
+
+# Index prefix (case-insensitive) atas nilai distinct satu kolom beserta
+# jumlah row-nya. Key disimpan terurut sehingga semua nilai berawalan X ada di
+# satu rentang bisect; rentang besar (prefix pendek) di-rank sekali lalu hasil
+# top-N-nya di-cache (per prefix, lalu per limit) sampai count salah satu nilai
+# berawalan prefix itu berubah.
+class PrefixIndex:
+    def __init__(self, result_cache_size: int = 2048):
+        self.result_cache_size = result_cache_size
+        self._counts: Dict[str, int] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._results: "OrderedDict[str, Dict[int, List[Dict[str, Any]]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _fold(value: str) -> str:
+        return value.casefold()
+
+    def rebuild(self, counts: Dict[Any, int]) -> None:
+        # Nilai disimpan sebagai teks supaya edit dari request (string) dan
+        # nilai kolom numerik dari database jatuh ke key yang sama.
+        merged: Dict[str, int] = {}
+        for value, count in counts.items():
+            if value is not None and str(value) != "" and count > 0:
+                merged[str(value)] = merged.get(str(value), 0) + count
+        self._counts = merged
+        self._keys = sorted((self._fold(value), value) for value in merged)
+        self._results.clear()
+
+    def adjust(self, raw_value: Any, delta: int) -> None:
+        if raw_value is None or str(raw_value) == "" or delta == 0:
+            return
+        value = str(raw_value)
+        folded = self._fold(value)
+        key = (folded, value)
+        count = self._counts.get(value, 0) + delta
+        if count > 0:
+            if value not in self._counts:
+                bisect.insort(self._keys, key)
+            self._counts[value] = count
+        elif value in self._counts:
+            del self._counts[value]
+            position = bisect.bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+        # Hanya prefix dari nilai ini yang hasilnya bisa berubah.
+        for end in range(len(folded) + 1):
+            self._results.pop(folded[:end], None)
+
+    def search(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        folded = self._fold(prefix)
+        by_limit = self._results.get(folded)
+        if by_limit is not None:
+            self._results.move_to_end(folded)
+            cached = by_limit.get(limit)
+            if cached is not None:
+                return cached
+
+        start = bisect.bisect_left(self._keys, (folded,))
+        end = bisect.bisect_left(self._keys, (folded + "\U0010ffff",), lo=start)
+        counts = self._counts
+        # Urutan sama dengan /values/{field}: row_count terbanyak, lalu nilai.
+        best = heapq.nsmallest(
+            limit,
+            (value for _, value in self._keys[start:end]),
+            key=lambda value: (-counts[value], value),
+        )
+        result = [{"value": value, "row_count": counts[value]} for value in best]
+        self._results.setdefault(folded, {})[limit] = result
+        while len(self._results) > self.result_cache_size:
+            self._results.popitem(last=False)
+        return result
+
+
+# Index autocomplete per kolom ODIST. Dibangun penuh (GROUP BY per kolom) saat
+# startup dan dibangun ulang berkala di background untuk menangkap refresh
+# DWH; edit lewat update_rows diterapkan lewat apply_changes.
+#
+# apply_changes dipanggil di event loop, jadi hanya mengantrekan delta
+# (_delta_lock melindungi append); delta diterapkan oleh search berikutnya di
+# bawah _lock, sehingga penulis tidak pernah menunggu search.
+class OdistsAutocomplete:
+    def __init__(self, table_name: str, fields: List[str], rebuild_seconds: float):
+        self.table_name = table_name
+        self.fields = fields
+        self.rebuild_seconds = rebuild_seconds
+        self._indexes: Dict[str, PrefixIndex] = {}
+        self._built_at: Optional[float] = None
+        self._build_seconds: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._pending: Optional[List[Tuple[str, Any, int]]] = None
+        self._deltas: deque = deque()
+        self._lock = threading.Lock()
+        self._delta_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._built_at is not None
+
+    def _load_counts(self, db: Session, field: str) -> Dict[Any, int]:
+        quoted = f"`{field.replace('`', '``')}`"
+        rows = db.execute(
+            text(
+                f"""
+                SELECT {quoted} AS value, COUNT(*) AS row_count
+                FROM `{self.table_name}`
+                WHERE {quoted} IS NOT NULL AND CAST({quoted} AS CHAR) <> ''
+                GROUP BY {quoted}
+                """
+            )
+        ).mappings().all()
+        return {row["value"]: int(row["row_count"]) for row in rows}
+
+    def build(self, db: Session) -> None:
+        if not self._build_lock.acquire(blocking=False):
+            return
+        started = time.perf_counter()
+        try:
+            # Semua GROUP BY membaca satu snapshot. Delta baru dicatat setelah
+            # snapshot diambil: perubahan yang commit sebelumnya sudah ada di
+            # count, jadi tidak boleh diterapkan ulang (dihitung dua kali).
+            db.execute(text("START TRANSACTION WITH CONSISTENT SNAPSHOT"))
+            with self._delta_lock:
+                self._pending = []
+            indexes: Dict[str, PrefixIndex] = {}
+            for field in self.fields:
+                index = PrefixIndex()
+                index.rebuild(self._load_counts(db, field))
+                indexes[field] = index
+            with self._lock:
+                # Delta yang masih antre sudah tercakup snapshot atau pending;
+                # keduanya diambil bersamaan supaya tidak ada delta yang jatuh
+                # di antara keduanya.
+                with self._delta_lock:
+                    pending, self._pending = self._pending or [], None
+                    self._deltas.clear()
+                for field, value, delta in pending:
+                    indexes[field].adjust(value, delta)
+                self._indexes = indexes
+                self._built_at = time.monotonic()
+                self._build_seconds = round(time.perf_counter() - started, 3)
+                self._last_error = None
+        except Exception as error:
+            with self._delta_lock:
+                self._pending = None
+            self._last_error = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            self._build_lock.release()
+
+    def build_isolated(self) -> None:
+        try:
+            with mysql_pipeline_session_scope() as db:
+                self.build(db)
+        except Exception:
+            # Sudah dicatat di _last_error; endpoint jatuh ke query database.
+            pass
+
+    def start_background_build(self) -> None:
+        threading.Thread(
+            target=self.build_isolated,
+            name="odists-autocomplete-build",
+            daemon=True,
+        ).start()
+
+    def _maybe_rebuild(self) -> None:
+        if (
+            self.rebuild_seconds > 0
+            and self._built_at is not None
+            and time.monotonic() - self._built_at > self.rebuild_seconds
+            and not self._build_lock.locked()
+        ):
+            self.start_background_build()
+
+    def apply_changes(self, old_row: Dict[str, Any], changed_values: Dict[str, Any]) -> None:
+        deltas = [
+            (field, value, delta)
+            for field in self.fields
+            if field in changed_values
+            for value, delta in ((old_row.get(field), -1), (changed_values[field], 1))
+        ]
+        if not deltas:
+            return
+        overflow = False
+        with self._delta_lock:
+            if self._indexes:
+                self._deltas.extend(deltas)
+            if self._pending is not None:
+                self._pending.extend(deltas)
+            if len(self._deltas) > MAX_QUEUED_DELTAS:
+                # Tidak ada search yang menguras antrean; bangun ulang saja.
+                self._deltas.clear()
+                overflow = True
+        if overflow and not self._build_lock.locked():
+            self.start_background_build()
+
+    def _drain(self) -> None:
+        # Dipanggil dengan _lock dipegang.
+        with self._delta_lock:
+            deltas = list(self._deltas)
+            self._deltas.clear()
+        for field, value, delta in deltas:
+            index = self._indexes.get(field)
+            if index is not None:
+                index.adjust(value, delta)
+
+    def search(self, field: str, prefix: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        # None = index belum siap (pemanggil memakai query database).
+        self._maybe_rebuild()
+        with self._lock:
+            index = self._indexes.get(field)
+            if index is None:
+                return None
+            self._drain()
+            return index.search(prefix, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "fields": {field: len(index) for field, index in self._indexes.items()},
+                "age_seconds": (
+                    round(time.monotonic() - self._built_at, 1)
+                    if self._built_at is not None
+                    else None
+                ),
+                "build_seconds": self._build_seconds,
+                "building": self._build_lock.locked(),
+                "queued_deltas": len(self._deltas),
+                "last_error": self._last_error,
+            }
@@ -0,0 +1,125 @@
+import asyncio
+import itertools
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.core.metrics import odists_events_dropped_total, odists_events_published_total
+
+
+RowFilter = Callable[[Dict[str, Any]], bool]
+
+
+# Event perubahan row ODIST untuk grid live (SSE). Per-proses: event dari
+# worker lain tidak terlihat, klien tetap perlu refetch berkala/saat resync.
+class OdistsChangeSubscription:
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        row_filter: Optional[RowFilter],
+        buffer_size: int,
+    ):
+        self.loop = loop
+        self.row_filter = row_filter
+        self.buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self.dropped = 0
+        self._wakeup = asyncio.Event()
+
+    def matches(self, old_row: Dict[str, Any], new_row: Dict[str, Any]) -> bool:
+        # Row yang keluar dari filter juga dikirim supaya klien bisa membuangnya.
+        if self.row_filter is None:
+            return True
+        return self.row_filter(old_row) or self.row_filter(new_row)
+
+    def _push(self, event: Dict[str, Any]) -> None:
+        # Dipanggil di event loop milik subscriber (lihat publish).
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+            odists_events_dropped_total.inc()
+        self.buffer.append(event)
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float) -> tuple[List[Dict[str, Any]], int]:
+        # (event, jumlah event yang dibuang sejak batch sebelumnya); list
+        # kosong berarti timeout (kirim keepalive).
+        if not self.buffer:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return [], 0
+        events = list(self.buffer)
+        self.buffer.clear()
+        dropped, self.dropped = self.dropped, 0
+        return events, dropped
+
+
+class OdistsChangeBroker:
+    def __init__(self, buffer_size: int, max_subscribers: int):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: List[OdistsChangeSubscription] = []
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def subscribe(self, row_filter: Optional[RowFilter] = None) -> Optional[OdistsChangeSubscription]:
+        subscription = OdistsChangeSubscription(
+            asyncio.get_running_loop(),
+            row_filter,
+            self.buffer_size,
+        )
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: OdistsChangeSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(
+        self,
+        odist_id: int,
+        old_row: Dict[str, Any],
+        changed_values: Dict[str, Any],
+        updated_by: Dict[str, Any],
+    ) -> int:
+        # Aman dipanggil dari thread mana pun (update_rows jalan di threadpool).
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return 0
+
+        new_row = {**old_row, **changed_values}
+        event = {
+            "seq": next(self._sequence),
+            "id": odist_id,
+            "changed_fields": list(changed_values),
+            "values": changed_values,
+            "updated_by": updated_by,
+        }
+        delivered = 0
+        for subscription in subscribers:
+            if not subscription.matches(old_row, new_row):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._push, event)
+            except RuntimeError:
+                # Event loop subscriber sudah ditutup.
+                self.unsubscribe(subscription)
+                continue
+            delivered += 1
+        odists_events_published_total.inc()
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "subscribers": len(subscribers),
+            "max_subscribers": self.max_subscribers,
+            "buffer_size": self.buffer_size,
+            "buffered_events": sum(len(item.buffer) for item in subscribers),
+        }
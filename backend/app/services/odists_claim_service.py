@@ -0,0 +1,143 @@
+import math
+import threading
+from typing import Iterable, List
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.models.app_user import AppUser
+
+
+# Klaim row dari antrian claim-next disimpan di MySQL (database yang sama
+# dengan tabel ODIST) dan ditulis di transaksi yang sama dengan
+# SELECT ... FOR UPDATE SKIP LOCKED, supaya proses/host lain tidak bisa
+# mengklaim row yang sama. Lease SQLite (odists_lease_service) tetap dipakai
+# untuk cek edit lokal; klaim di sini hanya menjaga antrian.
+CLAIM_TABLE = "odists_claim"
+
+ENSURE_TABLE_SQL = text(
+    f"""
+    CREATE TABLE IF NOT EXISTS `{CLAIM_TABLE}` (
+        `odist_id` BIGINT NOT NULL,
+        `user_id` INT NOT NULL,
+        `claimed_at` DATETIME NOT NULL,
+        `expires_at` DATETIME NOT NULL,
+        PRIMARY KEY (`odist_id`),
+        KEY `ix_odists_claim_expires` (`expires_at`)
+    )
+    """
+)
+
+_table_ready = False
+_table_lock = threading.Lock()
+
+
+def ensure_table(db: Session) -> None:
+    # DDL MySQL melakukan commit implisit, jadi dipanggil sebelum transaksi
+    # klaim dimulai (dan cukup sekali per proses).
+    global _table_ready
+    if _table_ready:
+        return
+    with _table_lock:
+        if _table_ready:
+            return
+        db.execute(ENSURE_TABLE_SQL)
+        db.commit()
+        _table_ready = True
+
+
+def _id_params(odist_ids: List[int]) -> tuple[str, dict]:
+    placeholders = ", ".join(f":id_{index}" for index in range(len(odist_ids)))
+    return placeholders, {f"id_{index}": odist_id for index, odist_id in enumerate(odist_ids)}
+
+
+def not_claimed_sql(id_column: str) -> str:
+    # Dipakai di WHERE kandidat; subquery dibaca tanpa lock (FOR UPDATE OF).
+    return (
+        f"NOT EXISTS (SELECT 1 FROM `{CLAIM_TABLE}` c "
+        f"WHERE c.`odist_id` = {id_column} AND c.`expires_at` > NOW())"
+    )
+
+
+def claim(db: Session, odist_ids: Iterable[int], user: AppUser, ttl_seconds: float) -> List[int]:
+    # Tidak commit: pemanggil menjalankannya di dalam transaksi klaim. Klaim
+    # kedaluwarsa dihapus dulu, lalu INSERT IGNORE; pemenang ditentukan dari
+    # pembacaan ulang (current read), bukan dari snapshot transaksi.
+    ids = sorted({int(value) for value in odist_ids})
+    if not ids:
+        return []
+    placeholders, params = _id_params(ids)
+    db.execute(
+        text(
+            f"""
+            DELETE FROM `{CLAIM_TABLE}`
+            WHERE `odist_id` IN ({placeholders}) AND `expires_at` <= NOW()
+            """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            f"""
+            INSERT IGNORE INTO `{CLAIM_TABLE}` (`odist_id`, `user_id`, `claimed_at`, `expires_at`)
+            VALUES (:odist_id, :user_id, NOW(), NOW() + INTERVAL :ttl SECOND)
+            """
+        ),
+        [
+            {"odist_id": odist_id, "user_id": int(user.user_id), "ttl": math.ceil(ttl_seconds)}
+            for odist_id in ids
+        ],
+    )
+    rows = db.execute(
+        text(
+            f"""
+            SELECT `odist_id`
+            FROM `{CLAIM_TABLE}`
+            WHERE `odist_id` IN ({placeholders}) AND `user_id` = :user_id
+            FOR SHARE
+            """
+        ),
+        {**params, "user_id": int(user.user_id)},
+    ).scalars().all()
+    return sorted(int(value) for value in rows)
+
+
+def renew(db: Session, odist_ids: Iterable[int], user: AppUser, ttl_seconds: float) -> int:
+    ids = sorted({int(value) for value in odist_ids})
+    if not ids:
+        return 0
+    ensure_table(db)
+    placeholders, params = _id_params(ids)
+    result = db.execute(
+        text(
+            f"""
+            UPDATE `{CLAIM_TABLE}`
+            SET `expires_at` = NOW() + INTERVAL :ttl SECOND
+            WHERE `odist_id` IN ({placeholders})
+              AND `user_id` = :user_id
+              AND `expires_at` > NOW()
+            """
+        ),
+        {**params, "user_id": int(user.user_id), "ttl": math.ceil(ttl_seconds)},
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+def release(db: Session, odist_ids: Iterable[int], user: AppUser) -> int:
+    ids = sorted({int(value) for value in odist_ids})
+    if not ids:
+        return 0
+    ensure_table(db)
+    placeholders, params = _id_params(ids)
+    result = db.execute(
+        text(
+            f"""
+            DELETE FROM `{CLAIM_TABLE}`
+            WHERE `odist_id` IN ({placeholders}) AND `user_id` = :user_id
+            """
+        ),
+        {**params, "user_id": int(user.user_id)},
+    )
+    db.commit()
+    return result.rowcount or 0
@@ -0,0 +1,557 @@
+# Deteksi outlet duplikat di gold_odists_parsing_manual: row yang menjelaskan
+# outlet yang sama dengan cust_code/dist_code berbeda. Row dikelompokkan
+# (blocking) per kota|token nama, pasangan di tiap blok diberi skor
+# kemiripan trigram nama+alamat di pool multiprocessing, lalu hasilnya
+# disimpan di MySQL (tabel yang sama database-nya dengan tabel ODIST) supaya
+# grid bisa memfilter dengan subquery.
+import multiprocessing
+from collections import Counter, defaultdict
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import Session
+
+from app.services.ogal_suggestion import document_text, trigrams
+
+
+ODISTS_TABLE = "gold_odists_parsing_manual"
+PAIR_TABLE = "odists_duplicate_pair"
+ROW_TABLE = "odists_duplicate"
+JOB_TABLE = "odists_duplicate_job"
+
+# Key filter grid (lihat odists_parsing_service._build_where): nilai apa pun
+# = row yang punya duplikat, "__EQ__:<cluster_id>" = satu cluster.
+DUPLICATE_FILTER = "duplicate_cluster"
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_MAX_BLOCK = 2000
+DEFAULT_BLOCKS_PER_TASK = 200
+WRITE_BATCH = 1000
+
+# Awalan badan usaha/jenis outlet dan kata umum alamat: ditulis dengan
+# banyak singkatan, jadi tidak dipakai untuk blok maupun skor.
+NAME_STOPWORDS = {
+    "TOKO", "TK", "UD", "CV", "PT", "WARUNG", "WR", "APOTEK", "APT", "TB",
+    "KIOS", "MM", "MINIMARKET", "GROSIR", "SUPERMARKET", "BPK", "IBU",
+}
+ADDRESS_STOPWORDS = {"JL", "JLN", "JALAN", "NO", "NOMOR", "RT", "RW", "GG", "GANG", "KEL", "KEC"}
+
+ENSURE_TABLE_SQL = [
+    text(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{JOB_TABLE}` (
+            `run_id` BIGINT NOT NULL AUTO_INCREMENT,
+            `status` VARCHAR(16) NOT NULL,
+            `threshold` DECIMAL(5,4) NOT NULL,
+            `max_block` INT NOT NULL,
+            `blocks_total` INT NOT NULL DEFAULT 0,
+            `blocks_done` INT NOT NULL DEFAULT 0,
+            `oversized_blocks` INT NOT NULL DEFAULT 0,
+            `pairs_found` BIGINT NOT NULL DEFAULT 0,
+            `last_block_key` VARCHAR(512) NULL,
+            `started_at` DATETIME NOT NULL,
+            `updated_at` DATETIME NOT NULL,
+            `finished_at` DATETIME NULL,
+            PRIMARY KEY (`run_id`)
+        )
+        """
+    ),
+    text(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{PAIR_TABLE}` (
+            `run_id` BIGINT NOT NULL,
+            `odist_id_a` BIGINT NOT NULL,
+            `odist_id_b` BIGINT NOT NULL,
+            `score` DECIMAL(5,4) NOT NULL,
+            `name_score` DECIMAL(5,4) NOT NULL,
+            `address_score` DECIMAL(5,4) NULL,
+            `block_key` VARCHAR(512) NOT NULL,
+            PRIMARY KEY (`run_id`, `odist_id_a`, `odist_id_b`),
+            KEY `ix_odists_duplicate_pair_b` (`run_id`, `odist_id_b`)
+        )
+        """
+    ),
+    text(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{ROW_TABLE}` (
+            `odist_id` BIGINT NOT NULL,
+            `cluster_id` BIGINT NOT NULL,
+            `cluster_size` INT NOT NULL,
+            `best_match_id` BIGINT NOT NULL,
+            `best_score` DECIMAL(5,4) NOT NULL,
+            `run_id` BIGINT NOT NULL,
+            PRIMARY KEY (`odist_id`),
+            KEY `ix_odists_duplicate_cluster` (`cluster_id`)
+        )
+        """
+    ),
+]
+
+# Cek read-only untuk jalur request API; DDL-nya dikirim lewat
+# sql/20260807_odists_duplicate_mysql.sql (atau dibuat job saat pertama jalan).
+TABLES_EXIST_SQL = text(
+    f"""
+    SELECT COUNT(*)
+    FROM information_schema.tables
+    WHERE table_schema = DATABASE()
+      AND table_name IN ('{JOB_TABLE}', '{PAIR_TABLE}', '{ROW_TABLE}')
+    """
+)
+
+# (odist_id, dist_code, cust_code, nama, alamat, kecamatan, blocking keys);
+# nama dan alamat sudah dinormalisasi tanpa stopword.
+BlockRow = Tuple[int, str, str, str, str, str, Tuple[str, ...]]
+Pair = Tuple[int, int, float, float, Optional[float], str]
+
+
+_tables_ready = False
+
+
+def _mark_tables_ready(count: Any) -> bool:
+    # Hanya hasil "ada" yang disimpan: tabel bisa dibuat kapan saja oleh
+    # migrasi atau job pertama tanpa restart API.
+    global _tables_ready
+    if int(count or 0) == len(ENSURE_TABLE_SQL):
+        _tables_ready = True
+    return _tables_ready
+
+
+def tables_ready(db: Session) -> bool:
+    if _tables_ready:
+        return True
+    return _mark_tables_ready(db.execute(TABLES_EXIST_SQL).scalar())
+
+
+async def tables_ready_async(db: AsyncSession) -> bool:
+    if _tables_ready:
+        return True
+    result = await db.execute(TABLES_EXIST_SQL)
+    return _mark_tables_ready(result.scalar())
+
+
+def ensure_tables(db: Session) -> None:
+    # Hanya untuk job deteksi (CLI), bukan jalur request API.
+    global _tables_ready
+    for statement in ENSURE_TABLE_SQL:
+        db.execute(statement)
+    db.commit()
+    _tables_ready = True
+
+
+def _strip_words(value: Any, stopwords: set) -> str:
+    return " ".join(word for word in document_text(value, None).split() if word not in stopwords)
+
+
+def blocking_keys(row: Dict[str, Any]) -> Tuple[str, ...]:
+    # Kecamatan sering kosong, jadi tidak ikut key (row yang sama bisa jatuh
+    # ke blok berbeda); kecamatan yang berbeda ditolak saat penilaian.
+    city = document_text(row.get("kota"), None) or document_text(row.get("city"), None)
+    if not city:
+        return ()
+    tokens = {
+        token
+        for token in _strip_words(row.get("cust_name"), NAME_STOPWORDS).split()
+        if len(token) >= 3 and not token.isdigit()
+    }
+    return tuple(sorted(f"{city}|{token}" for token in tokens))
+
+
+def _jaccard(left: set, right: set) -> float:
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def score_blocks(
+    blocks: Sequence[Tuple[str, Sequence[BlockRow]]],
+    threshold: float,
+) -> Tuple[str, int, List[Pair]]:
+    # Dijalankan di worker pool. Pasangan yang berbagi beberapa blok hanya
+    # dinilai di blok dengan key terkecil supaya tidak dihitung dua kali.
+    pairs: List[Pair] = []
+    for block_key, members in blocks:
+        prepared = [
+            (
+                row,
+                trigrams(row[3]),
+                trigrams(row[4]) if row[4] else set(),
+                set(row[6]),
+            )
+            for row in members
+        ]
+        for index, (left, left_name, left_address, left_keys) in enumerate(prepared):
+            for right, right_name, right_address, right_keys in prepared[index + 1:]:
+                if left[1] == right[1] and left[2] == right[2]:
+                    continue
+                if left[5] and right[5] and left[5] != right[5]:
+                    continue
+                if min(left_keys & right_keys) != block_key:
+                    continue
+                name_score = _jaccard(left_name, right_name)
+                if name_score < threshold * 0.6:
+                    continue
+                if left_address and right_address:
+                    address_score: Optional[float] = _jaccard(left_address, right_address)
+                    score = 0.6 * name_score + 0.4 * address_score
+                else:
+                    # Tanpa alamat bukti lebih lemah: skor nama dipotong.
+                    address_score = None
+                    score = 0.85 * name_score
+                if score >= threshold:
+                    first, second = sorted((left[0], right[0]))
+                    pairs.append(
+                        (
+                            first,
+                            second,
+                            round(score, 4),
+                            round(name_score, 4),
+                            round(address_score, 4) if address_score is not None else None,
+                            block_key,
+                        )
+                    )
+    return blocks[-1][0], len(blocks), pairs
+
+
+def load_blocks(
+    db: Session,
+    max_block: int,
+    fetch_size: int = 5000,
+) -> Tuple[Dict[str, List[BlockRow]], int]:
+    rows: List[BlockRow] = []
+    sizes: Counter = Counter()
+    result = db.execute(
+        text(
+            f"""
+            SELECT `id`, `dist_code`, `cust_code`, `cust_name`, `address`,
+                   `kota`, `city`, `kecamatan`
+            FROM `{ODISTS_TABLE}`
+            """
+        ).execution_options(stream_results=True, yield_per=fetch_size)
+    ).mappings()
+    for row in result:
+        keys = blocking_keys(row)
+        if not keys:
+            continue
+        sizes.update(keys)
+        rows.append(
+            (
+                int(row["id"]),
+                str(row["dist_code"] or ""),
+                str(row["cust_code"] or ""),
+                _strip_words(row["cust_name"], NAME_STOPWORDS),
+                _strip_words(row["address"], ADDRESS_STOPWORDS),
+                document_text(row["kecamatan"], None),
+                keys,
+            )
+        )
+
+    # Blok berisi satu row tidak punya pasangan; blok raksasa (token umum di
+    # kota besar) dilewati karena biayanya kuadratik dan row-nya hampir
+    # selalu juga ada di blok lain yang lebih spesifik. Key yang dibuang juga
+    # dihapus dari row supaya aturan "blok key terkecil" di score_blocks
+    # hanya melihat blok yang benar-benar dinilai.
+    active = {key for key, size in sizes.items() if 2 <= size <= max_block}
+    oversized = sum(1 for size in sizes.values() if size > max_block)
+    blocks: Dict[str, List[BlockRow]] = defaultdict(list)
+    for item in rows:
+        keys = tuple(key for key in item[6] if key in active)
+        if not keys:
+            continue
+        kept = (*item[:6], keys)
+        for key in keys:
+            blocks[key].append(kept)
+    return blocks, oversized
+
+
+def _create_job(db: Session, threshold: float, max_block: int) -> int:
+    db.execute(
+        text(
+            f"""
+            INSERT INTO `{JOB_TABLE}`
+                (`status`, `threshold`, `max_block`, `started_at`, `updated_at`)
+            VALUES ('RUNNING', :threshold, :max_block, NOW(), NOW())
+            """
+        ),
+        {"threshold": threshold, "max_block": max_block},
+    )
+    run_id = int(db.execute(text("SELECT LAST_INSERT_ID()")).scalar_one())
+    db.commit()
+    return run_id
+
+
+def get_job(db: Session, run_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    where = "WHERE `run_id` = :run_id" if run_id is not None else ""
+    row = db.execute(
+        text(
+            f"""
+            SELECT `run_id`, `status`, `threshold`, `max_block`, `blocks_total`,
+                   `blocks_done`, `oversized_blocks`, `pairs_found`, `last_block_key`,
+                   `started_at`, `updated_at`, `finished_at`
+            FROM `{JOB_TABLE}`
+            {where}
+            ORDER BY `run_id` DESC
+            LIMIT 1
+            """
+        ),
+        {"run_id": run_id},
+    ).mappings().one_or_none()
+    return dict(row) if row is not None else None
+
+
+def _write_chunk(db: Session, run_id: int, last_key: str, block_count: int, pairs: List[Pair]) -> None:
+    # Pasangan dan checkpoint satu transaksi: setelah crash, run dilanjutkan
+    # dari blok sesudah last_block_key tanpa pasangan ganda/hilang.
+    try:
+        for start in range(0, len(pairs), WRITE_BATCH):
+            db.execute(
+                text(
+                    f"""
+                    INSERT IGNORE INTO `{PAIR_TABLE}`
+                        (`run_id`, `odist_id_a`, `odist_id_b`, `score`,
+                         `name_score`, `address_score`, `block_key`)
+                    VALUES (:run_id, :a, :b, :score, :name_score, :address_score, :block_key)
+                    """
+                ),
+                [
+                    {
+                        "run_id": run_id,
+                        "a": a,
+                        "b": b,
+                        "score": score,
+                        "name_score": name_score,
+                        "address_score": address_score,
+                        "block_key": block_key,
+                    }
+                    for a, b, score, name_score, address_score, block_key in pairs[start:start + WRITE_BATCH]
+                ],
+            )
+        db.execute(
+            text(
+                f"""
+                UPDATE `{JOB_TABLE}`
+                SET `blocks_done` = `blocks_done` + :block_count,
+                    `pairs_found` = `pairs_found` + :pair_count,
+                    `last_block_key` = :last_key,
+                    `updated_at` = NOW()
+                WHERE `run_id` = :run_id
+                """
+            ),
+            {
+                "run_id": run_id,
+                "block_count": block_count,
+                "pair_count": len(pairs),
+                "last_key": last_key,
+            },
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _chunks(
+    blocks: Dict[str, List[BlockRow]],
+    keys: List[str],
+    blocks_per_task: int,
+) -> Iterator[List[Tuple[str, List[BlockRow]]]]:
+    for start in range(0, len(keys), blocks_per_task):
+        yield [(key, blocks[key]) for key in keys[start:start + blocks_per_task]]
+
+
+def materialize_clusters(db: Session, run_id: int) -> Dict[str, int]:
+    # Cluster = komponen terhubung dari pasangan; cluster_id = odist_id
+    # terkecil. Tabel odists_duplicate selalu berisi hasil run terakhir.
+    parent: Dict[int, int] = {}
+
+    def find(node: int) -> int:
+        root = node
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    best: Dict[int, Tuple[float, int]] = {}
+    result = db.execute(
+        text(
+            f"""
+            SELECT `odist_id_a`, `odist_id_b`, `score`
+            FROM `{PAIR_TABLE}`
+            WHERE `run_id` = :run_id
+            """
+        ).execution_options(stream_results=True, yield_per=10000),
+        {"run_id": run_id},
+    )
+    for a, b, score in result:
+        a, b, score = int(a), int(b), float(score)
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+        for node, other in ((a, b), (b, a)):
+            if node not in best or score > best[node][0]:
+                best[node] = (score, other)
+
+    clusters: Dict[int, int] = defaultdict(int)
+    roots = {node: find(node) for node in best}
+    for root in roots.values():
+        clusters[root] += 1
+
+    rows = [
+        {
+            "odist_id": node,
+            "cluster_id": roots[node],
+            "cluster_size": clusters[roots[node]],
+            "best_match_id": other,
+            "best_score": score,
+            "run_id": run_id,
+        }
+        for node, (score, other) in best.items()
+    ]
+    try:
+        db.execute(text(f"DELETE FROM `{ROW_TABLE}`"))
+        for start in range(0, len(rows), WRITE_BATCH):
+            db.execute(
+                text(
+                    f"""
+                    INSERT INTO `{ROW_TABLE}`
+                        (`odist_id`, `cluster_id`, `cluster_size`, `best_match_id`,
+                         `best_score`, `run_id`)
+                    VALUES (:odist_id, :cluster_id, :cluster_size, :best_match_id,
+                            :best_score, :run_id)
+                    """
+                ),
+                rows[start:start + WRITE_BATCH],
+            )
+        db.execute(
+            text(f"DELETE FROM `{PAIR_TABLE}` WHERE `run_id` <> :run_id"),
+            {"run_id": run_id},
+        )
+        db.execute(
+            text(
+                f"""
+                UPDATE `{JOB_TABLE}`
+                SET `status` = 'DONE', `updated_at` = NOW(), `finished_at` = NOW()
+                WHERE `run_id` = :run_id
+                """
+            ),
+            {"run_id": run_id},
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"rows": len(rows), "clusters": len(clusters)}
+
+
+def run_job(
+    db: Session,
+    workers: int,
+    threshold: float = DEFAULT_THRESHOLD,
+    max_block: int = DEFAULT_MAX_BLOCK,
+    blocks_per_task: int = DEFAULT_BLOCKS_PER_TASK,
+    resume_run_id: Optional[int] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    ensure_tables(db)
+    if resume_run_id is not None:
+        job = get_job(db, resume_run_id)
+        if job is None or job["status"] != "RUNNING":
+            raise RuntimeError(f"Run deteksi duplikat {resume_run_id} tidak ada atau sudah selesai")
+        run_id = int(job["run_id"])
+        # Parameter run lama dipakai lagi supaya blok sebelum/sesudah
+        # checkpoint dinilai dengan aturan yang sama.
+        threshold = float(job["threshold"])
+        max_block = int(job["max_block"])
+        last_key = job["last_block_key"] or ""
+    else:
+        run_id = _create_job(db, threshold, max_block)
+        last_key = ""
+
+    blocks, oversized = load_blocks(db, max_block)
+    all_keys = sorted(blocks)
+    keys = [key for key in all_keys if key > last_key]
+    db.execute(
+        text(
+            f"""
+            UPDATE `{JOB_TABLE}`
+            SET `blocks_total` = :blocks_total, `oversized_blocks` = :oversized,
+                `blocks_done` = :blocks_done, `updated_at` = NOW()
+            WHERE `run_id` = :run_id
+            """
+        ),
+        {
+            "run_id": run_id,
+            "blocks_total": len(all_keys),
+            "oversized": oversized,
+            "blocks_done": len(all_keys) - len(keys),
+        },
+    )
+    db.commit()
+
+    task = partial(score_blocks, threshold=threshold)
+    chunks = _chunks(blocks, keys, blocks_per_task)
+    if workers > 1:
+        # imap menjaga urutan hasil sama dengan urutan blok, jadi checkpoint
+        # last_block_key selalu maju tanpa celah.
+        with multiprocessing.Pool(processes=workers) as pool:
+            for chunk_key, block_count, pairs in pool.imap(task, chunks):
+                _write_chunk(db, run_id, chunk_key, block_count, pairs)
+                if progress is not None:
+                    progress(get_job(db, run_id))
+    else:
+        for chunk_key, block_count, pairs in map(task, chunks):
+            _write_chunk(db, run_id, chunk_key, block_count, pairs)
+            if progress is not None:
+                progress(get_job(db, run_id))
+
+    clusters = materialize_clusters(db, run_id)
+    return {**(get_job(db, run_id) or {}), **clusters}
+
+
+def duplicates_for(db: Session, odist_id: int) -> List[Dict[str, Any]]:
+    if not tables_ready(db):
+        return []
+    run_id = db.execute(
+        text(f"SELECT `run_id` FROM `{ROW_TABLE}` WHERE `odist_id` = :odist_id"),
+        {"odist_id": odist_id},
+    ).scalar()
+    if run_id is None:
+        return []
+    # Dua lookup terpisah supaya masing-masing memakai index: PK
+    # (run_id, odist_id_a, ...) dan ix_odists_duplicate_pair_b
+    # (run_id, odist_id_b); OR di kedua kolom berakhir dengan scan per run.
+    rows = db.execute(
+        text(
+            f"""
+            SELECT p.`score`, p.`name_score`, p.`address_score`,
+                   o.`id`, o.`ogal_id`, o.`dist_code`, o.`cust_code`,
+                   o.`cust_name`, o.`address`, o.`kota`, o.`kecamatan`
+            FROM (
+                SELECT `odist_id_b` AS `other_id`, `score`, `name_score`, `address_score`
+                FROM `{PAIR_TABLE}`
+                WHERE `run_id` = :run_id AND `odist_id_a` = :odist_id
+                UNION ALL
+                SELECT `odist_id_a` AS `other_id`, `score`, `name_score`, `address_score`
+                FROM `{PAIR_TABLE}`
+                WHERE `run_id` = :run_id AND `odist_id_b` = :odist_id
+            ) AS p
+            INNER JOIN `{ODISTS_TABLE}` AS o ON o.`id` = p.`other_id`
+            ORDER BY p.`score` DESC, o.`id` ASC
+            """
+        ),
+        {"odist_id": odist_id, "run_id": run_id},
+    ).mappings().all()
+    return [
+        {
+            **{key: value for key, value in row.items() if not key.endswith("score")},
+            "score": float(row["score"]),
+            "name_score": float(row["name_score"]),
+            "address_score": (
+                float(row["address_score"]) if row["address_score"] is not None else None
+            ),
+        }
+        for row in rows
+    ]
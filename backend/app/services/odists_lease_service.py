@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.models.app_user import AppUser
+
+
+# Lease lunak per row ODIST: penanda "sedang dikerjakan" dengan masa berlaku,
+# disimpan di SQLite lokal (bukan di MySQL) supaya cek lease tidak mengambil
+# lock database apa pun. Path ":memory:" berarti per-proses; untuk beberapa
+# worker di satu host arahkan ODISTS_LEASE_DB_PATH ke file yang sama.
+class OdistsLeaseStore:
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path,
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS odists_lease (
+                odist_id INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                username TEXT NOT NULL,
+                full_name TEXT,
+                claimed_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_odists_lease_expires ON odists_lease (expires_at)"
+        )
+
+    def _lease(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "odist_id": int(row["odist_id"]),
+            "user_id": int(row["user_id"]),
+            "username": row["username"],
+            "full_name": row["full_name"],
+            "expires_at": row["expires_at"],
+            "expires_in": max(0.0, round(row["expires_at"] - time.time(), 1)),
+        }
+
+    def _select(self, odist_ids: List[int], now: float) -> List[sqlite3.Row]:
+        placeholders = ", ".join("?" for _ in odist_ids)
+        return self._connection.execute(
+            f"""
+            SELECT odist_id, user_id, username, full_name, expires_at
+            FROM odists_lease
+            WHERE odist_id IN ({placeholders}) AND expires_at > ?
+            """,
+            [*odist_ids, now],
+        ).fetchall()
+
+    def leases_for(self, odist_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        ids = sorted({int(value) for value in odist_ids})
+        if not ids:
+            return {}
+        with self._lock:
+            rows = self._select(ids, time.time())
+        return {int(row["odist_id"]): self._lease(row) for row in rows}
+
+    def active_ids(self, limit: int) -> List[int]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT odist_id FROM odists_lease WHERE expires_at > ? ORDER BY odist_id LIMIT ?",
+                [time.time(), limit],
+            ).fetchall()
+        return [int(row[0]) for row in rows]
+
+    def leased_by_others(self, odist_ids: Iterable[int], user_id: int) -> Dict[int, Dict[str, Any]]:
+        return {
+            odist_id: lease
+            for odist_id, lease in self.leases_for(odist_ids).items()
+            if lease["user_id"] != int(user_id)
+        }
+
+    def claim(self, odist_ids: Iterable[int], user: AppUser) -> Dict[str, Any]:
+        # Klaim baru atau perpanjang lease sendiri; row yang dipegang user lain
+        # (dan belum kedaluwarsa) dikembalikan sebagai conflicts.
+        ids = sorted({int(value) for value in odist_ids})
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DELETE FROM odists_lease WHERE expires_at <= ?", [now])
+                self._connection.executemany(
+                    """
+                    INSERT INTO odists_lease
+                        (odist_id, user_id, username, full_name, claimed_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (odist_id) DO UPDATE SET
+                        expires_at = excluded.expires_at
+                    WHERE odists_lease.user_id = excluded.user_id
+                    """,
+                    [
+                        (
+                            odist_id,
+                            int(user.user_id),
+                            user.username,
+                            user.full_name,
+                            now,
+                            now + self.ttl_seconds,
+                        )
+                        for odist_id in ids
+                    ],
+                )
+                rows = self._select(ids, now) if ids else []
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        leases = [self._lease(row) for row in rows]
+        return {
+            "claimed": [lease for lease in leases if lease["user_id"] == int(user.user_id)],
+            "conflicts": [lease for lease in leases if lease["user_id"] != int(user.user_id)],
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def renew(self, odist_ids: Iterable[int], user: AppUser) -> Dict[str, Any]:
+        ids = sorted({int(value) for value in odist_ids})
+        if not ids:
+            return {"renewed": [], "lost": [], "ttl_seconds": self.ttl_seconds}
+        now = time.time()
+        placeholders = ", ".join("?" for _ in ids)
+        with self._lock:
+            self._connection.execute(
+                f"""
+                UPDATE odists_lease
+                SET expires_at = ?
+                WHERE user_id = ? AND expires_at > ? AND odist_id IN ({placeholders})
+                """,
+                [now + self.ttl_seconds, int(user.user_id), now, *ids],
+            )
+            rows = self._select(ids, now)
+        renewed = {
+            int(row["odist_id"]) for row in rows if int(row["user_id"]) == int(user.user_id)
+        }
+        return {
+            "renewed": sorted(renewed),
+            "lost": [odist_id for odist_id in ids if odist_id not in renewed],
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def release(self, odist_ids: Iterable[int], user: AppUser) -> int:
+        ids = sorted({int(value) for value in odist_ids})
+        if not ids:
+            return 0
+        placeholders = ", ".join("?" for _ in ids)
+        with self._lock:
+            cursor = self._connection.execute(
+                f"DELETE FROM odists_lease WHERE user_id = ? AND odist_id IN ({placeholders})",
+                [int(user.user_id), *ids],
+            )
+        return max(cursor.rowcount, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            active = self._connection.execute(
+                "SELECT COUNT(*) FROM odists_lease WHERE expires_at > ?",
+                [time.time()],
+            ).fetchone()[0]
+        return {"path": self.path, "ttl_seconds": self.ttl_seconds, "active_leases": active}
+
+
+lease_store = OdistsLeaseStore(
+    path=settings.ODISTS_LEASE_DB_PATH,
+    ttl_seconds=settings.ODISTS_LEASE_TTL_SECONDS,
+)
+
+
+def ensure_not_leased(odist_ids: Iterable[int], current_user: AppUser) -> None:
+    conflicts = lease_store.leased_by_others(odist_ids, current_user.user_id)
+    if not conflicts:
+        return
+    holders = sorted(
+        {lease["full_name"] or lease["username"] for lease in conflicts.values()}
+    )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=(
+            f"Row ODIST {', '.join(str(odist_id) for odist_id in sorted(conflicts))} "
+            f"sedang dikerjakan oleh {', '.join(holders)}"
+        ),
+    )
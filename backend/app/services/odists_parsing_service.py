@@ -1,13 +1,37 @@
 import json
+import logging
 import math
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException, status
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import settings
+from app.core.metrics import odists_page_rows_total
 from app.models.app_user import AppUser
-
+from app.services import (
+    audit_field_change_service,
+    odists_claim_service,
+    parsing_report_service,
+)
+from app.services.odists_lease_service import ensure_not_leased, lease_store
+from app.services.odists_validation import ensure_valid_items
+from app.services.odists_autocomplete import OdistsAutocomplete
+from app.services.odists_change_broker import OdistsChangeBroker, RowFilter
+from app.services.odists_duplicate_service import (
+    DUPLICATE_FILTER,
+    ROW_TABLE as DUPLICATE_TABLE,
+    tables_ready as duplicate_tables_ready,
+    tables_ready_async as duplicate_tables_ready_async,
+)
+from app.services.ogal_suggestion import OgalSuggestionService
+
+
+logger = logging.getLogger(__name__)
 
 TABLE_NAME = "gold_odists_parsing_manual"
 READ_ONLY_FIELDS = {
@@ -43,25 +67,31 @@ def _quote(name: str) -> str:
     return f"`{name.replace('`', '``')}`"
 
 
-def _column_metadata(db: Session) -> List[Dict[str, Any]]:
-    rows = db.execute(
-        text(
-            """
-            SELECT
-                COLUMN_NAME AS name,
-                DATA_TYPE AS data_type,
-                CASE WHEN IS_NULLABLE = 'YES' THEN 1 ELSE 0 END AS is_nullable,
-                ORDINAL_POSITION AS ordinal_position,
-                EXTRA AS extra
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = :table_name
-            ORDER BY ORDINAL_POSITION
-            """
-        ),
-        {"table_name": TABLE_NAME},
-    ).mappings().all()
-
+COLUMN_METADATA_SQL = text(
+    """
+    SELECT
+        COLUMN_NAME AS name,
+        DATA_TYPE AS data_type,
+        COLUMN_TYPE AS column_type,
+        CHARACTER_MAXIMUM_LENGTH AS max_length,
+        NUMERIC_PRECISION AS numeric_precision,
+        NUMERIC_SCALE AS numeric_scale,
+        CASE WHEN IS_NULLABLE = 'YES' THEN 1 ELSE 0 END AS is_nullable,
+        ORDINAL_POSITION AS ordinal_position,
+        EXTRA AS extra
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = :table_name
+    ORDER BY ORDINAL_POSITION
+    """
+)
+SELECT_FOR_UPDATE_SQL = text(
+    f"SELECT * FROM {_quote(TABLE_NAME)} WHERE `id` = :id FOR UPDATE"
+)
+SELECT_ROW_SQL = text(f"SELECT * FROM {_quote(TABLE_NAME)} WHERE `id` = :id")
+
+
+def _columns_from_rows(rows: List[Any]) -> List[Dict[str, Any]]:
     if not rows:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -73,6 +103,14 @@ def _column_metadata(db: Session) -> List[Dict[str, Any]]:
             "name": row["name"],
             "label": "odists_id" if row["name"] == "id" else row["name"],
             "data_type": row["data_type"],
+            "column_type": row.get("column_type"),
+            "max_length": int(row["max_length"]) if row.get("max_length") is not None else None,
+            "numeric_precision": (
+                int(row["numeric_precision"]) if row.get("numeric_precision") is not None else None
+            ),
+            "numeric_scale": (
+                int(row["numeric_scale"]) if row.get("numeric_scale") is not None else None
+            ),
             "is_nullable": bool(row["is_nullable"]),
             "ordinal_position": row["ordinal_position"],
             "editable": row["name"] not in READ_ONLY_FIELDS
@@ -82,6 +120,19 @@ def _column_metadata(db: Session) -> List[Dict[str, Any]]:
     ]
 
 
+def _column_metadata(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(
+        COLUMN_METADATA_SQL,
+        {"table_name": TABLE_NAME},
+    ).mappings().all()
+    return _columns_from_rows(rows)
+
+
+async def _column_metadata_async(db: AsyncSession) -> List[Dict[str, Any]]:
+    result = await db.execute(COLUMN_METADATA_SQL, {"table_name": TABLE_NAME})
+    return _columns_from_rows(result.mappings().all())
+
+
 def _parse_filters(filters_json: str | None) -> Dict[str, Any]:
     try:
         filters = json.loads(filters_json) if filters_json else {}
@@ -101,11 +152,35 @@ def _parse_filters(filters_json: str | None) -> Dict[str, Any]:
 def _build_where(
     filters: Dict[str, Any],
     allowed: set[str],
+    duplicate_ready: bool = False,
 ) -> tuple[str, Dict[str, Any]]:
     where_parts: List[str] = []
     params: Dict[str, Any] = {}
 
     for index, (field, raw_value) in enumerate(filters.items()):
+        if field == DUPLICATE_FILTER and raw_value is not None and str(raw_value) != "":
+            # Hasil job deteksi duplikat (odists_duplicate_service).
+            value = str(raw_value)
+            cluster_sql = ""
+            if value.startswith("__EQ__:"):
+                try:
+                    params[f"filter_{index}"] = int(value[7:])
+                except ValueError as exc:
+                    raise HTTPException(
+                        status_code=422,
+                        detail="Filter duplicate_cluster harus berupa cluster_id",
+                    ) from exc
+                cluster_sql = f" WHERE `cluster_id` = :filter_{index}"
+            if not duplicate_ready:
+                # Tabel hasil belum ada (migrasi/job belum pernah jalan):
+                # belum ada row yang diketahui punya duplikat.
+                params.pop(f"filter_{index}", None)
+                where_parts.append("1 = 0")
+                continue
+            where_parts.append(
+                f"`id` IN (SELECT `odist_id` FROM {_quote(DUPLICATE_TABLE)}{cluster_sql})"
+            )
+            continue
         if field not in allowed or raw_value is None or str(raw_value) == "":
             continue
 
@@ -156,16 +231,103 @@ def _build_where(
     )
 
 
-def get_page(
-    db: Session,
+def _duplicate_filtered(filters_json: str | None, field: str | None = None) -> bool:
+    # Cek tabel hasil duplikat hanya bila filternya benar-benar dipakai.
+    return field != DUPLICATE_FILTER and DUPLICATE_FILTER in _parse_filters(filters_json)
+
+
+async def _duplicate_ready_async(
+    db: AsyncSession,
+    filters_json: str | None,
+    field: str | None = None,
+) -> bool:
+    if not _duplicate_filtered(filters_json, field):
+        return False
+    return await duplicate_tables_ready_async(db)
+
+
+def _filter_text(value: Any) -> str:
+    # Pendekatan perbandingan MySQL: collation case-insensitive dan spasi
+    # di akhir diabaikan.
+    return ("" if value is None else str(value)).rstrip().casefold()
+
+
+def _row_filter(filters: Dict[str, Any], allowed: set[str]) -> RowFilter | None:
+    # Padanan _build_where untuk satu row di memori (dipakai event stream).
+    # Filter duplicate_cluster tidak ikut dicek: event row tersebut tetap
+    # dikirim dan klien menyaringnya saat refetch.
+    checks: List[Any] = []
+    for field, raw_value in filters.items():
+        if field not in allowed or raw_value is None or str(raw_value) == "":
+            continue
+
+        value = str(raw_value)
+        if value == "__NULL__":
+            checks.append(lambda row, field=field: row.get(field) is None)
+        elif value == "__EMPTY__":
+            checks.append(lambda row, field=field: _filter_text(row.get(field)) == "")
+        elif value.startswith("__IN__:"):
+            try:
+                selected_values = json.loads(value[7:])
+            except json.JSONDecodeError as exc:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Format multi-value filter untuk field {field} tidak valid",
+                ) from exc
+            if not isinstance(selected_values, list):
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Multi-value filter untuk field {field} harus berupa list",
+                )
+            if not selected_values:
+                continue
+            accept_null = any(item is None for item in selected_values)
+            accepted = {_filter_text(item) for item in selected_values if item is not None}
+            checks.append(
+                lambda row, field=field, accepted=accepted, accept_null=accept_null: (
+                    accept_null
+                    if row.get(field) is None
+                    else _filter_text(row.get(field)) in accepted
+                )
+            )
+        elif value.startswith("__EQ__:"):
+            expected = _filter_text(value[7:])
+            checks.append(
+                lambda row, field=field, expected=expected: (
+                    row.get(field) is not None and _filter_text(row.get(field)) == expected
+                )
+            )
+        else:
+            needle = value.casefold()
+            checks.append(
+                lambda row, field=field, needle=needle: (
+                    row.get(field) is not None and needle in str(row.get(field)).casefold()
+                )
+            )
+
+    if not checks:
+        return None
+    return lambda row: all(check(row) for check in checks)
+
+
+async def change_filter_async(db: AsyncSession, filters_json: str | None) -> RowFilter | None:
+    filters = _parse_filters(filters_json)
+    if not filters:
+        return None
+    metadata = await _column_metadata_async(db)
+    return _row_filter(filters, {item["name"] for item in metadata})
+
+
+def _page_query(
+    metadata: List[Dict[str, Any]],
     page: int,
     page_size: int,
     columns_csv: str | None,
     filters_json: str | None,
     sort_by: str,
     sort_dir: str,
+    duplicate_ready: bool = False,
 ) -> Dict[str, Any]:
-    metadata = _column_metadata(db)
     allowed = {item["name"] for item in metadata}
 
     requested = [
@@ -180,7 +342,7 @@ def get_page(
         selected.insert(0, "id")
 
     filters = _parse_filters(filters_json)
-    where_sql, params = _build_where(filters, allowed)
+    where_sql, params = _build_where(filters, allowed, duplicate_ready)
 
     safe_sort = sort_by if sort_by in allowed else "id"
     direction = "DESC" if sort_dir.lower() == "desc" else "ASC"
@@ -188,17 +350,14 @@ def get_page(
     page_size = min(max(page_size, 1), 200)
     offset = (page - 1) * page_size
 
-    total = int(
-        db.execute(
-            text(f"SELECT COUNT(*) FROM {_quote(TABLE_NAME)}{where_sql}"),
-            params,
-        ).scalar_one()
-    )
-
     data_params = dict(params)
     data_params.update({"offset": offset, "page_size": page_size})
-    rows = db.execute(
-        text(
+    return {
+        "page": page,
+        "page_size": page_size,
+        "count_sql": text(f"SELECT COUNT(*) FROM {_quote(TABLE_NAME)}{where_sql}"),
+        "count_params": params,
+        "data_sql": text(
             f"""
             SELECT {', '.join(_quote(name) for name in selected)}
             FROM {_quote(TABLE_NAME)}
@@ -207,27 +366,66 @@ def get_page(
             LIMIT :page_size OFFSET :offset
             """
         ),
-        data_params,
-    ).mappings().all()
+        "data_params": data_params,
+    }
+
 
+def _page_result(
+    query: Dict[str, Any],
+    metadata: List[Dict[str, Any]],
+    total: int,
+    rows: List[Any],
+) -> Dict[str, Any]:
+    odists_page_rows_total.inc(len(rows))
+    items = [dict(row) for row in rows]
     return {
-        "items": [dict(row) for row in rows],
+        "items": items,
         "total": total,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": max(1, math.ceil(total / page_size)),
+        "page": query["page"],
+        "page_size": query["page_size"],
+        "total_pages": max(1, math.ceil(total / query["page_size"])),
         "columns": metadata,
+        "leases": lease_store.leases_for(
+            item["id"] for item in items if item.get("id") is not None
+        ),
     }
 
 
-def get_distinct_values(
-    db: Session,
+async def get_page_async(
+    db: AsyncSession,
+    page: int,
+    page_size: int,
+    columns_csv: str | None,
+    filters_json: str | None,
+    sort_by: str,
+    sort_dir: str,
+) -> Dict[str, Any]:
+    metadata = await _column_metadata_async(db)
+    duplicate_ready = await _duplicate_ready_async(db, filters_json)
+    query = _page_query(
+        metadata,
+        page,
+        page_size,
+        columns_csv,
+        filters_json,
+        sort_by,
+        sort_dir,
+        duplicate_ready,
+    )
+    count_result = await db.execute(query["count_sql"], query["count_params"])
+    total = int(count_result.scalar_one())
+    data_result = await db.execute(query["data_sql"], query["data_params"])
+    return _page_result(query, metadata, total, data_result.mappings().all())
+
+
+def _distinct_values_query(
+    metadata: List[Dict[str, Any]],
     field: str,
     search: str | None,
     filters_json: str | None,
     limit: int,
-) -> List[Dict[str, Any]]:
-    metadata = _column_metadata(db)
+    duplicate_ready: bool = False,
+) -> tuple[TextClause, Dict[str, Any]]:
     allowed = {item["name"] for item in metadata}
     if field not in allowed:
         raise HTTPException(
@@ -241,7 +439,7 @@ def get_distinct_values(
         for filter_field, filter_value in filters.items()
         if filter_field != field
     }
-    where_sql, params = _build_where(related_filters, allowed)
+    where_sql, params = _build_where(related_filters, allowed, duplicate_ready)
 
     if search:
         search_condition = f"CAST({_quote(field)} AS CHAR) LIKE :value_search"
@@ -255,7 +453,7 @@ def get_distinct_values(
     limit = min(max(limit, 1), 200)
     params["limit"] = limit
 
-    rows = db.execute(
+    return (
         text(
             f"""
             SELECT {_quote(field)} AS value, COUNT(*) AS row_count
@@ -267,20 +465,227 @@ def get_distinct_values(
             """
         ),
         params,
-    ).mappings().all()
+    )
 
+
+def _distinct_values_result(rows: List[Any]) -> List[Dict[str, Any]]:
     return [
         {"value": row["value"], "row_count": int(row["row_count"])}
         for row in rows
     ]
 
 
-def update_rows(
-    mysql_db: Session,
-    audit_db: Session,
-    items: List[Dict[str, Any]],
+def get_distinct_values(
+    db: Session,
+    field: str,
+    search: str | None,
+    filters_json: str | None,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    metadata = _column_metadata(db)
+    duplicate_ready = _duplicate_filtered(filters_json, field) and duplicate_tables_ready(db)
+    sql, params = _distinct_values_query(
+        metadata, field, search, filters_json, limit, duplicate_ready
+    )
+    return _distinct_values_result(db.execute(sql, params).mappings().all())
+
+
+async def get_distinct_values_async(
+    db: AsyncSession,
+    field: str,
+    search: str | None,
+    filters_json: str | None,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    metadata = await _column_metadata_async(db)
+    duplicate_ready = await _duplicate_ready_async(db, filters_json, field)
+    sql, params = _distinct_values_query(
+        metadata, field, search, filters_json, limit, duplicate_ready
+    )
+    result = await db.execute(sql, params)
+    return _distinct_values_result(result.mappings().all())
+
+
+AUTOCOMPLETE_FIELDS = ["ogal_id", "kecamatan", "kota", "provinsi"]
+
+autocomplete_index = OdistsAutocomplete(
+    table_name=TABLE_NAME,
+    fields=AUTOCOMPLETE_FIELDS,
+    rebuild_seconds=settings.ODISTS_AUTOCOMPLETE_REBUILD_SECONDS,
+)
+
+
+async def autocomplete_async(
+    db: AsyncSession,
+    field: str,
+    prefix: str,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    if field not in AUTOCOMPLETE_FIELDS:
+        raise HTTPException(
+            status_code=422,
+            detail="Field autocomplete tidak valid",
+        )
+    limit = min(max(limit, 1), 200)
+    if settings.ODISTS_AUTOCOMPLETE_ENABLED:
+        values = autocomplete_index.search(field, prefix, limit)
+        if values is not None:
+            return values
+    # Index belum siap/nonaktif: pakai query distinct biasa (LIKE %x%).
+    return await get_distinct_values_async(db, field, prefix or None, None, limit)
+
+
+ogal_suggestions = OgalSuggestionService(
+    table_name=TABLE_NAME,
+    rebuild_seconds=settings.ODISTS_SUGGEST_REBUILD_SECONDS,
+    posting_budget=settings.ODISTS_SUGGEST_POSTING_BUDGET,
+)
+
+
+def suggest_ogal_ids(db: Session, odist_id: int, limit: int) -> Dict[str, Any]:
+    # Kandidat ogal_id dari row lain yang sudah di-parse dengan nama+alamat
+    # paling mirip; row itu sendiri tidak dihitung sebagai bukti.
+    if not settings.ODISTS_SUGGEST_ENABLED:
+        raise HTTPException(
+            status_code=404,
+            detail="Fitur saran ogal_id tidak aktif",
+        )
+    row = _require_row(
+        db.execute(SELECT_ROW_SQL, {"id": odist_id}).mappings().one_or_none(),
+        odist_id,
+    )
+    items = ogal_suggestions.suggest(
+        row.get("cust_name"),
+        row.get("address"),
+        limit=min(max(limit, 1), 50),
+        exclude_odist_id=odist_id,
+    )
+    if items is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Index saran ogal_id sedang dibangun, coba lagi beberapa saat",
+        )
+    return {
+        "odist_id": odist_id,
+        "ogal_id": row.get("ogal_id"),
+        "items": items,
+    }
+
+
+CLAIM_NEXT_MAX = 50
+CLAIM_NEXT_MAX_ROUNDS = 10
+# Lease aktif sebanyak ini masih dikecualikan langsung di SQL (NOT IN);
+# di atasnya disaring setelah SELECT.
+CLAIM_NEXT_EXCLUDE_LIMIT = 2000
+
+
+def claim_next(
+    db: Session,
     current_user: AppUser,
+    limit: int,
+    dist_code: str | None = None,
+    province: str | None = None,
 ) -> Dict[str, Any]:
+    # Antrian kerja: row dengan ogal_id kosong dikunci dengan SKIP LOCKED
+    # (row yang sedang diklaim parser lain dilewati, bukan ditunggu), row yang
+    # sudah diklaim/punya lease disaring, lalu sisanya dicatat sebagai klaim
+    # di MySQL dalam transaksi yang sama (berlaku lintas proses) dan sebagai
+    # lease lokal. Lock MySQL hanya hidup selama klaim; setelah commit klaim
+    # yang menjaga row tetap milik user sampai kedaluwarsa.
+    limit = min(max(limit, 1), CLAIM_NEXT_MAX)
+    odists_claim_service.ensure_table(db)
+    table = _quote(TABLE_NAME)
+    where_parts = [
+        "(`ogal_id` IS NULL OR `ogal_id` = '')",
+        "`id` > :after_id",
+        odists_claim_service.not_claimed_sql(f"{table}.`id`"),
+    ]
+    params: Dict[str, Any] = {"batch": limit * 2}
+    if dist_code:
+        where_parts.append("`dist_code` = :dist_code")
+        params["dist_code"] = dist_code
+    if province:
+        where_parts.append("`province` = :province")
+        params["province"] = province
+    leased_ids = lease_store.active_ids(CLAIM_NEXT_EXCLUDE_LIMIT + 1)
+    if leased_ids and len(leased_ids) <= CLAIM_NEXT_EXCLUDE_LIMIT:
+        where_parts.append(
+            f"`id` NOT IN ({', '.join(f':leased_{index}' for index in range(len(leased_ids)))})"
+        )
+        params.update({f"leased_{index}": odist_id for index, odist_id in enumerate(leased_ids)})
+    candidate_sql = text(
+        f"""
+        SELECT `id`
+        FROM {table}
+        WHERE {' AND '.join(where_parts)}
+        ORDER BY `id` ASC
+        LIMIT :batch
+        FOR UPDATE OF {table} SKIP LOCKED
+        """
+    )
+
+    claimed_ids: List[int] = []
+    after_id = 0
+    try:
+        for _ in range(CLAIM_NEXT_MAX_ROUNDS):
+            candidate_ids = [
+                int(value)
+                for value in db.execute(
+                    candidate_sql,
+                    {**params, "after_id": after_id},
+                ).scalars().all()
+            ]
+            if not candidate_ids:
+                break
+            after_id = candidate_ids[-1]
+
+            leased = lease_store.leases_for(candidate_ids)
+            free_ids = [odist_id for odist_id in candidate_ids if odist_id not in leased]
+            free_ids = free_ids[: limit - len(claimed_ids)]
+            if free_ids:
+                free_ids = odists_claim_service.claim(
+                    db,
+                    free_ids,
+                    current_user,
+                    lease_store.ttl_seconds,
+                )
+            if free_ids:
+                result = lease_store.claim(free_ids, current_user)
+                claimed_ids.extend(lease["odist_id"] for lease in result["claimed"])
+            if len(claimed_ids) >= limit:
+                break
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    items: List[Dict[str, Any]] = []
+    if claimed_ids:
+        allowed = {item["name"] for item in _column_metadata(db)}
+        selected = [name for name in DEFAULT_COLUMNS if name in allowed]
+        placeholders = ", ".join(f":id_{index}" for index in range(len(claimed_ids)))
+        rows = db.execute(
+            text(
+                f"""
+                SELECT {', '.join(_quote(name) for name in selected)}
+                FROM {_quote(TABLE_NAME)}
+                WHERE `id` IN ({placeholders})
+                ORDER BY `id` ASC
+                """
+            ),
+            {f"id_{index}": odist_id for index, odist_id in enumerate(claimed_ids)},
+        ).mappings().all()
+        items = [dict(row) for row in rows]
+
+    return {
+        "items": items,
+        "claimed_count": len(claimed_ids),
+        "leases": lease_store.leases_for(claimed_ids),
+        "ttl_seconds": lease_store.ttl_seconds,
+    }
+
+
+def _validate_batch(items: List[Dict[str, Any]]) -> None:
     if not items:
         raise HTTPException(
             status_code=422,
@@ -299,126 +704,154 @@ def update_rows(
             detail="Terdapat odists_id duplikat dalam batch",
         )
 
-    metadata = _column_metadata(mysql_db)
-    editable = {item["name"] for item in metadata if item["editable"]}
-    parser_name = (current_user.full_name or current_user.username).strip()
-    status_upd = f"Parsed by {parser_name}"
-    audit_records: List[Dict[str, Any]] = []
 
-    try:
-        for item in items:
-            odist_id = int(item["id"])
-            values = item.get("values") or {}
-            clean_values = {
-                key: value for key, value in values.items() if key in editable
-            }
-            if not clean_values:
-                raise HTTPException(
-                    status_code=422,
-                    detail=f"Tidak ada field editable untuk odists_id {odist_id}",
-                )
+def _editable_values(
+    item: Dict[str, Any],
+    editable: set[str],
+) -> tuple[int, Dict[str, Any]]:
+    odist_id = int(item["id"])
+    values = item.get("values") or {}
+    clean_values = {
+        key: value for key, value in values.items() if key in editable
+    }
+    if not clean_values:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Tidak ada field editable untuk odists_id {odist_id}",
+        )
+    return odist_id, clean_values
 
-            old_row = mysql_db.execute(
-                text(
-                    f"SELECT * FROM {_quote(TABLE_NAME)} "
-                    "WHERE `id` = :id FOR UPDATE"
-                ),
-                {"id": odist_id},
-            ).mappings().one_or_none()
-            if old_row is None:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Data ODIST {odist_id} tidak ditemukan",
-                )
 
-            changed_values: Dict[str, Any] = {}
-            for changed_field, value in clean_values.items():
-                normalized = None if value == "" else value
-                if normalized != old_row.get(changed_field):
-                    changed_values[changed_field] = normalized
+def _require_row(old_row: Any, odist_id: int) -> Any:
+    if old_row is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Data ODIST {odist_id} tidak ditemukan",
+        )
+    return old_row
 
-            if not changed_values:
-                continue
 
-            params: Dict[str, Any] = {
-                "id": odist_id,
-                "updated_by": current_user.user_id,
-                "status_upd": status_upd,
-            }
-            set_parts: List[str] = []
-            for index, (changed_field, value) in enumerate(
-                changed_values.items()
-            ):
-                key = f"value_{index}"
-                set_parts.append(f"{_quote(changed_field)} = :{key}")
-                params[key] = value
-
-            set_parts.extend(
-                [
-                    "`updated_at` = CURRENT_TIMESTAMP",
-                    "`parsed_at` = CURRENT_TIMESTAMP",
-                    "`status_upd` = :status_upd",
-                    "`updated_by` = :updated_by",
-                ]
-            )
+def _changed_values(old_row: Any, clean_values: Dict[str, Any]) -> Dict[str, Any]:
+    changed_values: Dict[str, Any] = {}
+    for changed_field, value in clean_values.items():
+        normalized = None if value == "" else value
+        if normalized != old_row.get(changed_field):
+            changed_values[changed_field] = normalized
+    return changed_values
 
-            mysql_db.execute(
-                text(
-                    f"UPDATE {_quote(TABLE_NAME)} "
-                    f"SET {', '.join(set_parts)} WHERE `id` = :id"
-                ),
-                params,
-            )
 
-            audit_records.append(
-                {
-                    "odist_id": odist_id,
-                    "user_id": current_user.user_id,
-                    "username": current_user.username,
-                    "changed_fields": json.dumps(
-                        list(changed_values.keys()),
-                        ensure_ascii=False,
-                    ),
-                    "old_values": json.dumps(
-                        {
-                            changed_field: old_row.get(changed_field)
-                            for changed_field in changed_values
-                        },
-                        ensure_ascii=False,
-                        default=str,
-                    ),
-                    "new_values": json.dumps(
-                        changed_values,
-                        ensure_ascii=False,
-                        default=str,
-                    ),
-                }
-            )
+def _update_statement(
+    odist_id: int,
+    changed_values: Dict[str, Any],
+    current_user: AppUser,
+) -> tuple[TextClause, Dict[str, Any]]:
+    parser_name = (current_user.full_name or current_user.username).strip()
+    params: Dict[str, Any] = {
+        "id": odist_id,
+        "updated_by": current_user.user_id,
+        "status_upd": f"Parsed by {parser_name}",
+    }
+    set_parts: List[str] = []
+    for index, (changed_field, value) in enumerate(changed_values.items()):
+        key = f"value_{index}"
+        set_parts.append(f"{_quote(changed_field)} = :{key}")
+        params[key] = value
+
+    set_parts.extend(
+        [
+            "`updated_at` = CURRENT_TIMESTAMP",
+            "`parsed_at` = CURRENT_TIMESTAMP",
+            "`status_upd` = :status_upd",
+            "`updated_by` = :updated_by",
+        ]
+    )
+    return (
+        text(
+            f"UPDATE {_quote(TABLE_NAME)} "
+            f"SET {', '.join(set_parts)} WHERE `id` = :id"
+        ),
+        params,
+    )
 
-        if not audit_records:
-            mysql_db.rollback()
-            return {"updated_count": 0, "updated_ids": []}
 
-        mysql_db.commit()
-    except HTTPException:
-        mysql_db.rollback()
-        raise
-    except Exception:
-        mysql_db.rollback()
-        raise
+def _audit_record(
+    odist_id: int,
+    old_row: Any,
+    changed_values: Dict[str, Any],
+    current_user: AppUser,
+) -> Dict[str, Any]:
+    return {
+        "odist_id": odist_id,
+        "user_id": current_user.user_id,
+        "username": current_user.username,
+        "changed_fields": json.dumps(
+            list(changed_values.keys()),
+            ensure_ascii=False,
+        ),
+        "old_values": json.dumps(
+            {
+                changed_field: old_row.get(changed_field)
+                for changed_field in changed_values
+            },
+            ensure_ascii=False,
+            default=str,
+        ),
+        "new_values": json.dumps(
+            changed_values,
+            ensure_ascii=False,
+            default=str,
+        ),
+    }
+
+
+change_broker = OdistsChangeBroker(
+    buffer_size=settings.ODISTS_EVENTS_BUFFER_SIZE,
+    max_subscribers=settings.ODISTS_EVENTS_MAX_SUBSCRIBERS,
+)
+
+
+def _after_rows_updated(
+    applied_changes: List[tuple[int, Dict[str, Any], Dict[str, Any]]],
+    current_user: AppUser,
+) -> None:
+    updated_by = {
+        "user_id": current_user.user_id,
+        "username": current_user.username,
+        "full_name": current_user.full_name,
+    }
+    for odist_id, old_row, changed_values in applied_changes:
+        parsing_report_service.current_row_mirror.apply_changes(
+            odist_id,
+            changed_values,
+        )
+        autocomplete_index.apply_changes(old_row, changed_values)
+        ogal_suggestions.apply_changes(odist_id, old_row, changed_values)
+        change_broker.publish(odist_id, old_row, changed_values, updated_by)
 
+
+def _write_audit_records(
+    audit_db: Session,
+    audit_records: List[Dict[str, Any]],
+) -> None:
     try:
+        field_changes: List[Dict[str, Any]] = []
         for record in audit_records:
-            audit_db.execute(
+            # SCOPE_IDENTITY tidak terpengaruh trigger enrich di audit log.
+            audit_id = audit_db.execute(
                 text(
                     """
+                    SET NOCOUNT ON;
                     INSERT INTO [tools].[odists_parsing_audit_log]
                         ([odist_id], [user_id], [username], [changed_fields], [old_values], [new_values])
                     VALUES
-                        (:odist_id, :user_id, :username, :changed_fields, :old_values, :new_values)
+                        (:odist_id, :user_id, :username, :changed_fields, :old_values, :new_values);
+                    SELECT CAST(SCOPE_IDENTITY() AS BIGINT) AS audit_id;
                     """
                 ),
                 record,
+            ).scalar_one()
+            field_changes.extend(
+                audit_field_change_service.rows_from_audit_record(audit_id, record)
             )
         audit_db.commit()
     except Exception:
@@ -429,31 +862,117 @@ def update_rows(
                 "Batch ODIST berhasil diperbarui, tetapi pencatatan audit gagal"
             ),
         )
+    _write_field_changes(audit_db, field_changes)
+
+
+def _write_field_changes(audit_db: Session, field_changes: List[Dict[str, Any]]) -> None:
+    # Tabel turunan ditulis setelah audit log commit, supaya kegagalannya
+    # tidak pernah membatalkan audit utama; baris yang hilang diisi ulang
+    # oleh backfill_audit_field_changes.py.
+    try:
+        audit_field_change_service.ensure_table(audit_db)
+        audit_field_change_service.insert_field_changes(audit_db, field_changes)
+        audit_db.commit()
+    except Exception as error:
+        audit_db.rollback()
+        logger.warning("Pencatatan audit field change gagal (%s baris): %s", len(field_changes), error)
+
 
+def _update_result(audit_records: List[Dict[str, Any]]) -> Dict[str, Any]:
     return {
         "updated_count": len(audit_records),
         "updated_ids": [record["odist_id"] for record in audit_records],
     }
 
 
-def update_row(
-    mysql_db: Session,
+async def precheck_update_async(
+    mysql_db: AsyncSession,
+    items: List[Dict[str, Any]],
+    current_user: AppUser,
+) -> List[Dict[str, Any]]:
+    # Cek murah tanpa menulis apa pun: dipanggil router sebelum baseline
+    # ditulis ke MSSQL, dan oleh update_rows_async bila belum dicek.
+    _validate_batch(items)
+    # Cek lease sebelum SELECT ... FOR UPDATE supaya row yang sedang
+    # dikerjakan user lain tidak sampai dikunci. Lease store memakai SQLite
+    # (blocking), jadi dijalankan di threadpool.
+    await run_in_threadpool(
+        ensure_not_leased,
+        [item["id"] for item in items],
+        current_user,
+    )
+    metadata = await _column_metadata_async(mysql_db)
+    # Semua item divalidasi dulu; batch yang tidak valid ditolak utuh
+    # sebelum SELECT ... FOR UPDATE pertama.
+    ensure_valid_items(items, metadata)
+    return metadata
+
+
+async def update_rows_async(
+    mysql_db: AsyncSession,
+    audit_db: Session,
+    items: List[Dict[str, Any]],
+    current_user: AppUser,
+    metadata: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    # metadata terisi = batch sudah lolos precheck_update_async.
+    if metadata is None:
+        metadata = await precheck_update_async(mysql_db, items, current_user)
+    editable = {item["name"] for item in metadata if item["editable"]}
+    audit_records: List[Dict[str, Any]] = []
+    applied_changes: List[tuple[int, Dict[str, Any], Dict[str, Any]]] = []
+
+    try:
+        for item in items:
+            odist_id, clean_values = _editable_values(item, editable)
+            result = await mysql_db.execute(SELECT_FOR_UPDATE_SQL, {"id": odist_id})
+            old_row = _require_row(result.mappings().one_or_none(), odist_id)
+
+            changed_values = _changed_values(old_row, clean_values)
+            if not changed_values:
+                continue
+
+            await mysql_db.execute(
+                *_update_statement(odist_id, changed_values, current_user)
+            )
+            applied_changes.append((odist_id, dict(old_row), changed_values))
+            audit_records.append(
+                _audit_record(odist_id, old_row, changed_values, current_user)
+            )
+
+        if not audit_records:
+            await mysql_db.rollback()
+            return _update_result(audit_records)
+
+        await mysql_db.commit()
+    except Exception:
+        await mysql_db.rollback()
+        raise
+
+    _after_rows_updated(applied_changes, current_user)
+    # Audit log tetap lewat pyodbc (sync), jadi dijalankan di threadpool.
+    await run_in_threadpool(_write_audit_records, audit_db, audit_records)
+    return _update_result(audit_records)
+
+
+async def update_row_async(
+    mysql_db: AsyncSession,
     audit_db: Session,
     odist_id: int,
     values: Dict[str, Any],
     current_user: AppUser,
+    metadata: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
-    update_rows(
+    await update_rows_async(
         mysql_db=mysql_db,
         audit_db=audit_db,
         items=[{"id": odist_id, "values": values}],
         current_user=current_user,
+        metadata=metadata,
     )
 
-    updated = mysql_db.execute(
-        text(f"SELECT * FROM {_quote(TABLE_NAME)} WHERE `id` = :id"),
-        {"id": odist_id},
-    ).mappings().one_or_none()
+    result = await mysql_db.execute(SELECT_ROW_SQL, {"id": odist_id})
+    updated = result.mappings().one_or_none()
     if updated is None:
         raise HTTPException(
             status_code=404,
@@ -0,0 +1,190 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+
+RowLoader = Callable[[Session, Iterable[int]], Dict[int, Dict[str, Any]]]
+WATERMARK_FIELDS = ["updated_at", "dwh_refreshed_at"]
+
+
+# Mirror per-proses untuk kolom ODIST yang dibaca report. Row dimuat saat
+# pertama diminta, lalu diperbarui dengan polling updated_at/dwh_refreshed_at
+# melewati watermark sisi MySQL. Perubahan dari proses ini diterapkan langsung
+# lewat apply_changes.
+#
+# Poll membaca ulang jendela safety_lag_seconds di belakang watermark:
+# updated_at diisi saat statement jalan, bukan saat commit, jadi transaksi
+# yang commit belakangan bisa punya updated_at di bawah watermark terakhir.
+class OdistsRowMirror:
+    def __init__(
+        self,
+        table_name: str,
+        fields: List[str],
+        loader: RowLoader,
+        poll_seconds: float,
+        delta_limit: int,
+        safety_lag_seconds: float = 0.0,
+    ):
+        self.table_name = table_name
+        self.fields = fields
+        self.loader = loader
+        self.poll_seconds = poll_seconds
+        self.delta_limit = delta_limit
+        self.safety_lag = timedelta(seconds=safety_lag_seconds)
+
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._watermark: Optional[datetime] = None
+        self._last_polled_at = 0.0
+        # Naik setiap kali isi mirror bisa berubah (poll/apply_changes/clear);
+        # dipakai get_rows untuk mendeteksi perubahan selama loader berjalan.
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _quote(self, name: str) -> str:
+        return f"`{name.replace('`', '``')}`"
+
+    def _read_watermark(self, mysql_db: Session) -> Optional[datetime]:
+        # Satu subquery per kolom: masing-masing cukup membaca ujung index
+        # (sql/20260809_odists_watermark_indexes.sql).
+        table = self._quote(self.table_name)
+        row = mysql_db.execute(
+            text(
+                f"""
+                SELECT (SELECT MAX(`updated_at`) FROM {table}) AS updated_at,
+                       (SELECT MAX(`dwh_refreshed_at`) FROM {table}) AS dwh_refreshed_at
+                """
+            )
+        ).mappings().one()
+        values = [row[field] for field in WATERMARK_FIELDS if row[field] is not None]
+        return max(values) if values else None
+
+    def _poll(self, mysql_db: Session) -> None:
+        if self._watermark is None:
+            self._watermark = self._read_watermark(mysql_db)
+            self._last_polled_at = time.monotonic()
+            return
+
+        limit = max(self.delta_limit, len(self._rows))
+        columns = ", ".join(
+            self._quote(field) for field in [*self.fields, *WATERMARK_FIELDS]
+        )
+        table = self._quote(self.table_name)
+        # Dua range scan di index masing-masing kolom; OR di dua kolom
+        # berakhir dengan full scan. UNION membuang row yang cocok di keduanya.
+        rows = mysql_db.execute(
+            text(
+                f"""
+                (SELECT {columns} FROM {table}
+                 WHERE `updated_at` >= :watermark LIMIT :limit)
+                UNION
+                (SELECT {columns} FROM {table}
+                 WHERE `dwh_refreshed_at` >= :watermark LIMIT :limit)
+                LIMIT :limit
+                """
+            ),
+            {"watermark": self._watermark - self.safety_lag, "limit": limit + 1},
+        ).mappings().all()
+
+        if len(rows) > limit:
+            # Refresh massal (mis. reload DWH) menyentuh lebih banyak row dari
+            # isi mirror: lebih murah dikosongkan lalu dimuat ulang saat diminta.
+            next_watermark = self._read_watermark(mysql_db)
+            with self._lock:
+                self._rows.clear()
+                self._watermark = next_watermark
+                self._generation += 1
+            self._last_polled_at = time.monotonic()
+            return
+
+        next_watermark = self._watermark
+        with self._lock:
+            for row in rows:
+                odist_id = int(row["id"])
+                if odist_id in self._rows:
+                    self._rows[odist_id] = {field: row[field] for field in self.fields}
+                for field in WATERMARK_FIELDS:
+                    value = row[field]
+                    if value is not None and value > next_watermark:
+                        next_watermark = value
+            self._watermark = next_watermark
+            if rows:
+                self._generation += 1
+        self._last_polled_at = time.monotonic()
+
+    def refresh(self, mysql_db: Session, force: bool = False) -> None:
+        if not force and time.monotonic() - self._last_polled_at < self.poll_seconds:
+            return
+        with self._refresh_lock:
+            if not force and time.monotonic() - self._last_polled_at < self.poll_seconds:
+                return
+            self._poll(mysql_db)
+
+    def get_rows(
+        self,
+        mysql_db: Session,
+        odist_ids: Iterable[int],
+    ) -> Dict[int, Dict[str, Any]]:
+        ids = sorted({int(value) for value in odist_ids})
+        if not ids:
+            return {}
+
+        self.refresh(mysql_db)
+
+        with self._lock:
+            result = {
+                odist_id: dict(self._rows[odist_id])
+                for odist_id in ids
+                if odist_id in self._rows
+            }
+            generation = self._generation
+        missing_ids = [odist_id for odist_id in ids if odist_id not in result]
+        if not missing_ids:
+            return result
+
+        loaded = self.loader(mysql_db, missing_ids)
+        with self._lock:
+            # Bila ada poll/apply_changes selama loader berjalan, hasil loader
+            # bisa lebih tua dari perubahan yang sudah dilewati watermark:
+            # hasilnya tetap dikembalikan tapi tidak disimpan, supaya mirror
+            # tidak tertimpa row basi. Row yang sudah ada juga tidak ditimpa.
+            keep = generation == self._generation
+            for odist_id, row in loaded.items():
+                values = {field: row.get(field) for field in self.fields}
+                if keep:
+                    values = self._rows.setdefault(odist_id, values)
+                result[odist_id] = dict(values)
+        return result
+
+    def apply_changes(self, odist_id: int, values: Dict[str, Any]) -> None:
+        with self._lock:
+            self._generation += 1
+            row = self._rows.get(int(odist_id))
+            if row is None:
+                return
+            for field, value in values.items():
+                if field in row:
+                    row[field] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self._watermark = None
+            self._last_polled_at = 0.0
+            self._generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rows": len(self._rows),
+                "watermark": self._watermark,
+                "seconds_since_poll": (
+                    round(time.monotonic() - self._last_polled_at, 3)
+                    if self._last_polled_at
+                    else None
+                ),
+            }
@@ -0,0 +1,192 @@
+import re
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+
+# Validasi batch edit ODIST sebelum ada row yang dikunci: tipe, nullability
+# dan panjang dicek dari metadata INFORMATION_SCHEMA (_column_metadata),
+# nilai kolom wilayah dari settings.ODISTS_VALUE_RULES. Semua error
+# dikumpulkan lalu dikirim sekaligus dalam satu 422.
+
+INTEGER_BITS = {"tinyint": 8, "smallint": 16, "mediumint": 24, "int": 32, "integer": 32, "bigint": 64}
+DECIMAL_TYPES = {"decimal", "numeric"}
+FLOAT_TYPES = {"float", "double", "real"}
+TEXT_TYPES = {"char", "varchar", "tinytext", "text", "mediumtext", "longtext"}
+
+_INTEGER_TEXT = re.compile(r"[+-]?\d+")
+_ENUM_VALUE = re.compile(r"'((?:[^']|'')*)'")
+
+_COMPILED_PATTERNS = {
+    field: re.compile(rule["pattern"])
+    for field, rule in settings.ODISTS_VALUE_RULES.items()
+    if rule.get("pattern")
+}
+
+
+def _empty(value: Any) -> bool:
+    # Sama dengan _changed_values: "" disimpan sebagai NULL.
+    return value is None or value == ""
+
+
+def _integer_error(column: Dict[str, Any], value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "harus berupa bilangan bulat"
+    if isinstance(value, float) and value.is_integer():
+        number = int(value)
+    elif isinstance(value, int):
+        number = value
+    elif isinstance(value, str) and _INTEGER_TEXT.fullmatch(value.strip()):
+        number = int(value.strip())
+    else:
+        return "harus berupa bilangan bulat"
+    bits = INTEGER_BITS[column["data_type"]]
+    if "unsigned" in str(column.get("column_type") or "").lower():
+        low, high = 0, 2 ** bits - 1
+    else:
+        low, high = -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+    if not low <= number <= high:
+        return f"harus di antara {low} dan {high}"
+    return None
+
+
+def _decimal_error(column: Dict[str, Any], value: Any) -> Optional[str]:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return "harus berupa angka"
+    try:
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        return "harus berupa angka"
+    if not number.is_finite():
+        return "harus berupa angka"
+    precision = column.get("numeric_precision")
+    if column["data_type"] in DECIMAL_TYPES and precision:
+        scale = column.get("numeric_scale") or 0
+        # Digit pecahan berlebih dibulatkan MySQL (half up), jadi digit bulat
+        # dihitung setelah pembulatan: '999.999' di DECIMAL(5,2) jadi 1000.00.
+        try:
+            number = number.quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            return f"maksimal {precision - scale} digit sebelum koma"
+        integer_digits = len(str(abs(int(number)))) if int(number) else 0
+        if integer_digits > precision - scale:
+            return f"maksimal {precision - scale} digit sebelum koma"
+    return None
+
+
+def _text_error(column: Dict[str, Any], value: Any) -> Optional[str]:
+    if isinstance(value, (dict, list)):
+        return "harus berupa teks"
+    max_length = column.get("max_length")
+    if max_length and len(str(value)) > max_length:
+        return f"maksimal {max_length} karakter"
+    return None
+
+
+def _temporal_error(column: Dict[str, Any], value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return "harus berupa tanggal (format ISO)"
+    try:
+        if column["data_type"] == "date":
+            date.fromisoformat(value.strip())
+            return None
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return "harus berupa tanggal (format ISO)"
+    # Kolom DATETIME/TIMESTAMP MySQL tidak menyimpan zona waktu; nilai
+    # seperti '...Z' atau '+07:00' akan disimpan tanpa dikonversi.
+    if parsed.tzinfo is not None:
+        return "tidak boleh memakai zona waktu"
+    return None
+
+
+def _enum_error(column: Dict[str, Any], value: Any) -> Optional[str]:
+    allowed = [
+        item.replace("''", "'")
+        for item in _ENUM_VALUE.findall(str(column.get("column_type") or ""))
+    ]
+    if allowed and str(value).casefold() not in {item.casefold() for item in allowed}:
+        return f"harus salah satu dari: {', '.join(allowed)}"
+    return None
+
+
+def _type_error(column: Dict[str, Any], value: Any) -> Optional[str]:
+    data_type = column["data_type"]
+    if data_type in INTEGER_BITS:
+        return _integer_error(column, value)
+    if data_type in DECIMAL_TYPES or data_type in FLOAT_TYPES:
+        return _decimal_error(column, value)
+    if data_type in TEXT_TYPES:
+        return _text_error(column, value)
+    if data_type in ("date", "datetime", "timestamp"):
+        return _temporal_error(column, value)
+    if data_type == "enum":
+        return _enum_error(column, value)
+    if data_type != "json" and isinstance(value, (dict, list)):
+        return "tipe nilai tidak didukung"
+    return None
+
+
+def _rule_error(field: str, value: Any) -> Optional[str]:
+    rule = settings.ODISTS_VALUE_RULES.get(field)
+    if not rule:
+        return None
+    text_value = str(value)
+    if rule.get("trimmed") and text_value != text_value.strip():
+        return "tidak boleh diawali/diakhiri spasi"
+    if "min_length" in rule and len(text_value) < rule["min_length"]:
+        return f"minimal {rule['min_length']} karakter"
+    if "max_length" in rule and len(text_value) > rule["max_length"]:
+        return f"maksimal {rule['max_length']} karakter"
+    if "allowed" in rule and text_value.casefold() not in {
+        str(item).casefold() for item in rule["allowed"]
+    }:
+        return "nilai tidak ada dalam daftar yang diizinkan"
+    pattern = _COMPILED_PATTERNS.get(field)
+    if pattern is not None and not pattern.fullmatch(text_value):
+        return "format nilai tidak valid"
+    return None
+
+
+def item_errors(
+    item: Dict[str, Any],
+    columns: Dict[str, Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    odist_id = int(item["id"])
+    values = {
+        field: value
+        for field, value in (item.get("values") or {}).items()
+        if field in columns and columns[field]["editable"]
+    }
+    if not values:
+        return [{"id": odist_id, "field": None, "message": "Tidak ada field editable"}]
+
+    errors: List[Dict[str, Any]] = []
+    for field, value in values.items():
+        column = columns[field]
+        if _empty(value):
+            message = None if column["is_nullable"] else "wajib diisi"
+        else:
+            message = _type_error(column, value) or _rule_error(field, value)
+        if message:
+            errors.append({"id": odist_id, "field": field, "message": message})
+    return errors
+
+
+def ensure_valid_items(items: List[Dict[str, Any]], metadata: List[Dict[str, Any]]) -> None:
+    columns = {column["name"]: column for column in metadata}
+    errors = [error for item in items for error in item_errors(item, columns)]
+    if not errors:
+        return
+    row_count = len({error["id"] for error in errors})
+    raise HTTPException(
+        status_code=422,
+        detail={
+            "message": f"Validasi gagal: {len(errors)} error pada {row_count} row, tidak ada data yang disimpan",
+            "errors": errors,
+        },
+    )
@@ -0,0 +1,382 @@
+import math
+import re
+import threading
+import time
+from array import array
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.db.database import mysql_pipeline_session_scope
+from app.services import parsing_report_core as core
+
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]+")
+
+SUGGEST_FIELDS = ("ogal_id", "cust_name", "address")
+
+DEFAULT_POSTING_BUDGET = 50_000
+DEFAULT_CANDIDATES = 100
+DEFAULT_MAX_QUEUED_DELTAS = 20_000
+
+
+def document_text(cust_name: Any, address: Any) -> str:
+    # Tanda baca dibuang supaya "JL. X NO.12" dan "JL X NO 12" sama. Tanpa
+    # cache normalize report: build index (dan job duplikat) membaca seluruh
+    # tabel sekali jalan dan akan mengusir working set cache report.
+    return " ".join(
+        part
+        for part in (
+            _NON_ALNUM.sub(" ", core._normalize_text("" if value is None else str(value))).strip()
+            for value in (cust_name, address)
+        )
+        if part
+    )
+
+
+def trigrams(document: str) -> Set[str]:
+    # Trigram karakter atas teks berspasi pembatas: " TO", "TOK", ..., "KO ",
+    # "O M" (trigram lintas kata ikut menangkap urutan kata).
+    padded = f" {document} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+# Index TF-IDF trigram atas row yang sudah punya ogal_id. Row dengan teks dan
+# ogal_id sama digabung jadi satu dokumen (refcount) supaya outlet yang
+# muncul di banyak distributor tidak memperbesar posting list. Skor = cosine
+# (tf biner, bobot idf) antara nama+alamat row yang dicari dan dokumen.
+class TrigramOgalIndex:
+    def __init__(
+        self,
+        posting_budget: int = DEFAULT_POSTING_BUDGET,
+        candidates: int = DEFAULT_CANDIDATES,
+    ):
+        self.posting_budget = posting_budget
+        self.candidates = candidates
+        self._postings: Dict[str, array] = {}
+        self._weights: Dict[str, float] = {}
+        self._doc_key: Dict[Tuple[str, str], int] = {}
+        self._doc_text: List[str] = []
+        self._doc_ogal: List[Optional[str]] = []
+        self._doc_rows = array("I")
+        self._doc_norm = array("d")
+        self._row_doc: Dict[int, int] = {}
+        self._live_docs = 0
+
+    def __len__(self) -> int:
+        return len(self._row_doc)
+
+    def _weight(self, gram: str) -> float:
+        # Bobot = idf^2, di-cache saat finalize; trigram baru (dari update
+        # incremental) dihitung dengan df saat ini.
+        weight = self._weights.get(gram)
+        if weight is None:
+            posting = self._postings.get(gram)
+            if not posting:
+                return 0.0
+            weight = math.log(1.0 + len(self._doc_ogal) / len(posting)) ** 2
+            self._weights[gram] = weight
+        return weight
+
+    def _norm(self, grams: Set[str]) -> float:
+        return math.sqrt(sum(map(self._weight, grams))) or 1.0
+
+    def add_row(
+        self,
+        odist_id: int,
+        ogal_id: Any,
+        cust_name: Any,
+        address: Any,
+        compute_norm: bool = True,
+    ) -> None:
+        self.remove_row(odist_id)
+        ogal = "" if ogal_id is None else str(ogal_id).strip()
+        document = document_text(cust_name, address)
+        if not ogal or not document:
+            return
+
+        key = (document, ogal)
+        doc = self._doc_key.get(key)
+        if doc is None:
+            doc = len(self._doc_ogal)
+            self._doc_key[key] = doc
+            self._doc_text.append(document)
+            self._doc_ogal.append(ogal)
+            self._doc_rows.append(0)
+            grams = trigrams(document)
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("I")
+                posting.append(doc)
+            # Norm dihitung dengan df saat ini; rebuild berkala menyegarkan
+            # norm semua dokumen (lihat finalize).
+            self._doc_norm.append(self._norm(grams) if compute_norm else 1.0)
+            self._live_docs += 1
+        self._doc_rows[doc] += 1
+        self._row_doc[int(odist_id)] = doc
+
+    def remove_row(self, odist_id: int) -> None:
+        doc = self._row_doc.pop(int(odist_id), None)
+        if doc is None:
+            return
+        self._doc_rows[doc] -= 1
+        if self._doc_rows[doc] == 0:
+            # Posting tidak dihapus (append-only); dokumen mati dilewati saat
+            # scoring dan hilang pada rebuild berikutnya.
+            del self._doc_key[(self._doc_text[doc], self._doc_ogal[doc])]
+            self._doc_ogal[doc] = None
+            self._live_docs -= 1
+
+    def finalize(self) -> None:
+        documents = len(self._doc_ogal)
+        self._weights = {
+            gram: math.log(1.0 + documents / len(posting)) ** 2
+            for gram, posting in self._postings.items()
+        }
+        weights = self._weights
+        for doc, document in enumerate(self._doc_text):
+            self._doc_norm[doc] = math.sqrt(sum(map(weights.__getitem__, trigrams(document)))) or 1.0
+
+    def search(
+        self,
+        document: str,
+        limit: int,
+        exclude_odist_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        postings = self._postings
+        query = {gram for gram in trigrams(document) if gram in postings}
+        if not query:
+            return []
+        query_norm = math.sqrt(sum(map(self._weight, query)))
+
+        # Tahap 1, kandidat: posting list trigram paling jarang dijumlahkan
+        # sampai budget posting habis. Trigram umum ("JL ", "TOK") panjang
+        # posting-nya tapi hampir tidak membedakan outlet.
+        # Cukup jumlah trigram yang cocok (Counter.update berjalan di C);
+        # bobot idf dipakai di tahap 2.
+        scores: Counter = Counter()
+        budget = self.posting_budget
+        for gram in sorted(query, key=lambda value: len(postings[value])):
+            posting = postings[gram]
+            if len(posting) > budget and scores:
+                break
+            budget -= len(posting)
+            scores.update(posting)
+
+        # Tahap 2: kandidat teratas diberi skor cosine penuh atas semua
+        # trigram query, lalu digabung per ogal_id (skor terbaik, total row).
+        exclude_doc = self._row_doc.get(exclude_odist_id) if exclude_odist_id is not None else None
+        best: Dict[str, Dict[str, Any]] = {}
+        for doc, _ in scores.most_common(self.candidates):
+            ogal = self._doc_ogal[doc]
+            rows = self._doc_rows[doc] - (1 if doc == exclude_doc else 0)
+            if ogal is None or rows <= 0:
+                continue
+            shared = query.intersection(trigrams(self._doc_text[doc]))
+            similarity = sum(map(self._weight, shared)) / (query_norm * self._doc_norm[doc])
+            current = best.get(ogal)
+            if current is None:
+                best[ogal] = {
+                    "ogal_id": ogal,
+                    "score": similarity,
+                    "matched_rows": rows,
+                    "example_text": self._doc_text[doc],
+                }
+                continue
+            current["matched_rows"] += rows
+            if similarity > current["score"]:
+                current.update(score=similarity, example_text=self._doc_text[doc])
+
+        items = sorted(best.values(), key=lambda item: (-item["score"], item["ogal_id"]))[:limit]
+        for item in items:
+            item["score"] = round(min(item["score"], 1.0), 4)
+        return items
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rows": len(self._row_doc),
+            "documents": self._live_docs,
+            "dead_documents": len(self._doc_ogal) - self._live_docs,
+            "trigrams": len(self._postings),
+            "postings": sum(len(posting) for posting in self._postings.values()),
+        }
+
+
+# Pembungkus index untuk tabel ODIST: dibangun di background saat startup,
+# dibangun ulang berkala (membersihkan dokumen mati dan menyegarkan idf), dan
+# diperbarui dari update_rows lewat apply_changes.
+#
+# apply_changes dipanggil di event loop, jadi tidak boleh menunggu _lock yang
+# dipegang selama search. Perubahan cukup diantrekan (_delta_lock hanya
+# melindungi append) lalu diterapkan oleh pembaca berikutnya sebelum search.
+class OgalSuggestionService:
+    def __init__(
+        self,
+        table_name: str,
+        rebuild_seconds: float,
+        posting_budget: int = DEFAULT_POSTING_BUDGET,
+        fetch_size: int = 5000,
+        max_queued_deltas: int = DEFAULT_MAX_QUEUED_DELTAS,
+    ):
+        self.table_name = table_name
+        self.rebuild_seconds = rebuild_seconds
+        self.posting_budget = posting_budget
+        self.fetch_size = fetch_size
+        self.max_queued_deltas = max_queued_deltas
+        self._index: Optional[TrigramOgalIndex] = None
+        self._built_at: Optional[float] = None
+        self._build_seconds: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._pending: Optional[List[Tuple[int, Dict[str, Any]]]] = None
+        self._deltas: deque = deque()
+        self._lock = threading.Lock()
+        self._delta_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    def _load(self, db: Session) -> TrigramOgalIndex:
+        index = TrigramOgalIndex(posting_budget=self.posting_budget)
+        result = db.execute(
+            text(
+                f"""
+                SELECT `id`, `ogal_id`, `cust_name`, `address`
+                FROM `{self.table_name}`
+                WHERE `ogal_id` IS NOT NULL AND `ogal_id` <> ''
+                """
+            ).execution_options(stream_results=True, yield_per=self.fetch_size)
+        )
+        for row in result:
+            index.add_row(row[0], row[1], row[2], row[3], compute_norm=False)
+        return index
+
+    def build(self, db: Session) -> None:
+        if not self._build_lock.acquire(blocking=False):
+            return
+        started = time.perf_counter()
+        try:
+            with self._delta_lock:
+                self._pending = []
+            index = self._load(db)
+            index.finalize()
+            # Perubahan selama load bisa terlewat oleh stream, jadi diterapkan
+            # ulang ke index baru. Antrean _deltas tetap dipertahankan:
+            # urutannya sama dan add_row idempoten, jadi hasil akhirnya tetap
+            # nilai terbaru.
+            with self._delta_lock:
+                pending, self._pending = self._pending or [], None
+            for odist_id, row in pending:
+                self._apply(index, odist_id, row)
+            with self._lock:
+                self._index = index
+                self._built_at = time.monotonic()
+                self._build_seconds = round(time.perf_counter() - started, 3)
+                self._last_error = None
+        except Exception as error:
+            with self._delta_lock:
+                self._pending = None
+            self._last_error = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            self._build_lock.release()
+
+    def build_isolated(self) -> None:
+        try:
+            with mysql_pipeline_session_scope() as db:
+                self.build(db)
+        except Exception:
+            # Sudah dicatat di _last_error; endpoint menjawab 503 sampai siap.
+            pass
+
+    def start_background_build(self) -> None:
+        threading.Thread(
+            target=self.build_isolated,
+            name="ogal-suggestion-build",
+            daemon=True,
+        ).start()
+
+    def _maybe_rebuild(self) -> None:
+        if (
+            self.rebuild_seconds > 0
+            and self._built_at is not None
+            and time.monotonic() - self._built_at > self.rebuild_seconds
+            and not self._build_lock.locked()
+        ):
+            self.start_background_build()
+
+    @staticmethod
+    def _apply(index: TrigramOgalIndex, odist_id: int, row: Dict[str, Any]) -> None:
+        index.add_row(odist_id, row.get("ogal_id"), row.get("cust_name"), row.get("address"))
+
+    def apply_changes(
+        self,
+        odist_id: int,
+        old_row: Dict[str, Any],
+        changed_values: Dict[str, Any],
+    ) -> None:
+        if not any(field in changed_values for field in SUGGEST_FIELDS):
+            return
+        new_row = {field: changed_values.get(field, old_row.get(field)) for field in SUGGEST_FIELDS}
+        overflow = False
+        with self._delta_lock:
+            if self._index is None and self._pending is None:
+                return
+            self._deltas.append((odist_id, new_row))
+            if self._pending is not None:
+                self._pending.append((odist_id, new_row))
+            if len(self._deltas) > self.max_queued_deltas:
+                # Tidak ada pembaca yang menguras antrean: lebih murah
+                # membangun ulang daripada menahan antrean tanpa batas.
+                self._deltas.clear()
+                overflow = True
+        if overflow and not self._build_lock.locked():
+            self.start_background_build()
+
+    def _drain(self) -> None:
+        # Dipanggil dengan _lock dipegang.
+        while self._deltas:
+            with self._delta_lock:
+                if not self._deltas:
+                    break
+                odist_id, row = self._deltas.popleft()
+            if self._index is not None:
+                self._apply(self._index, odist_id, row)
+
+    def suggest(
+        self,
+        cust_name: Any,
+        address: Any,
+        limit: int,
+        exclude_odist_id: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        # None = index belum siap.
+        self._maybe_rebuild()
+        document = document_text(cust_name, address)
+        with self._lock:
+            if self._index is None:
+                return None
+            if not document:
+                return []
+            self._drain()
+            return self._index.search(document, limit, exclude_odist_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                **(self._index.stats() if self._index is not None else {}),
+                "age_seconds": (
+                    round(time.monotonic() - self._built_at, 1)
+                    if self._built_at is not None
+                    else None
+                ),
+                "build_seconds": self._build_seconds,
+                "building": self._build_lock.locked(),
+                "queued_deltas": len(self._deltas),
+                "last_error": self._last_error,
+            }
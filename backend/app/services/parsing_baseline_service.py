@@ -3,9 +3,19 @@ from collections import defaultdict
 from typing import Any, Dict, Iterable, List
 
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.services import parsing_report_service
+from app.core.metrics import parsing_baselines_inserted_total
+from app.services import parsing_report_core, parsing_report_service
+
+
+# baseline_source per jalur (row punya audit, row belum pernah diaudit).
+BASELINE_SOURCES = {
+    "before_update": ("RECONSTRUCTED_BEFORE_UPDATE", "CAPTURED_BEFORE_FIRST_UPDATE"),
+    "export": ("RECONSTRUCTED_FROM_FIRST_AUDIT", "CURRENT_AT_FIRST_REPORT"),
+}
 
 
 def _chunks(values: List[int], size: int = 500) -> Iterable[List[int]]:
@@ -25,15 +35,7 @@ def _safe_dict(value: Any) -> Dict[str, Any]:
         return {}
 
 
-def ensure_baselines_before_update(
-    mysql_db: Session,
-    audit_db: Session,
-    odist_ids: Iterable[int],
-) -> None:
-    ids = sorted({int(value) for value in odist_ids})
-    if not ids:
-        return
-
+def _missing_baseline_ids(audit_db: Session, ids: List[int]) -> List[int]:
     parsing_report_service._ensure_schema(audit_db)
 
     existing_ids: set[int] = set()
@@ -56,11 +58,16 @@ def ensure_baselines_before_update(
         ).all()
         existing_ids.update(int(row[0]) for row in rows)
 
-    missing_ids = [odist_id for odist_id in ids if odist_id not in existing_ids]
-    if not missing_ids:
-        return
+    return [odist_id for odist_id in ids if odist_id not in existing_ids]
 
-    current_rows = parsing_report_service._load_current_rows(mysql_db, missing_ids)
+
+def _insert_baselines(
+    audit_db: Session,
+    missing_ids: List[int],
+    current_rows: Dict[int, Dict[str, Any]],
+    path: str = "before_update",
+) -> None:
+    reconstructed_source, captured_source = BASELINE_SOURCES[path]
     audit_history: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
 
     for batch in _chunks(missing_ids):
@@ -87,31 +94,20 @@ def ensure_baselines_before_update(
                 {"old_values": _safe_dict(row["old_values"])}
             )
 
+    inserted = 0
     for odist_id in missing_ids:
         current_row = current_rows.get(odist_id)
         if current_row is None:
             continue
 
-        original_values = {
-            field: current_row.get(field)
-            for field in parsing_report_service.TRACKED_FIELDS
-        }
-        seen_fields: set[str] = set()
         history = audit_history.get(odist_id, [])
-
-        for audit in history:
-            old_values = audit["old_values"]
-            for field in parsing_report_service.TRACKED_FIELDS:
-                if field in old_values and field not in seen_fields:
-                    original_values[field] = old_values[field]
-                    seen_fields.add(field)
-
-        source = (
-            "RECONSTRUCTED_BEFORE_UPDATE"
-            if history
-            else "CAPTURED_BEFORE_FIRST_UPDATE"
+        original_values = parsing_report_core.reconstruct_original_values(
+            current_row,
+            (audit["old_values"] for audit in history),
         )
-        audit_db.execute(
+
+        source = reconstructed_source if history else captured_source
+        result = audit_db.execute(
             text(
                 """
                 INSERT INTO [tools].[odists_parsing_baseline]
@@ -134,5 +130,29 @@ def ensure_baselines_before_update(
                 "baseline_source": source,
             },
         )
+        inserted += max(result.rowcount, 0)
 
     audit_db.commit()
+    parsing_baselines_inserted_total.inc(inserted, path=path)
+
+
+async def ensure_baselines_before_update_async(
+    mysql_db: AsyncSession,
+    audit_db: Session,
+    odist_ids: Iterable[int],
+) -> None:
+    ids = sorted({int(value) for value in odist_ids})
+    if not ids:
+        return
+
+    # Baseline/audit lewat pyodbc (sync) di threadpool; row saat ini dibaca
+    # lewat session MySQL async yang juga dipakai UPDATE-nya.
+    missing_ids = await run_in_threadpool(_missing_baseline_ids, audit_db, ids)
+    if not missing_ids:
+        return
+
+    current_rows = await parsing_report_service._load_current_rows_async(
+        mysql_db,
+        missing_ids,
+    )
+    await run_in_threadpool(_insert_baselines, audit_db, missing_ids, current_rows)
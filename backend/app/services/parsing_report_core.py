@@ -0,0 +1,727 @@
+# Inti komputasi report parsing: fungsi murni di atas audit, baseline dan row
+# current yang sudah ada di memori (tanpa Session/DB). Dipakai oleh
+# parsing_report_service, parsing_report_filter_service, parsing_baseline_service
+# dan benchmark micro (benchmarks/report_core.py).
+import json
+import math
+import re
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+
+REVISION_FIELDS = [
+    "dist_code",
+    "cust_code",
+    "cust_name",
+    "address",
+    "type_outlet",
+    "city",
+    "province",
+    "kecamatan",
+    "kota",
+    "provinsi",
+]
+TRACKED_FIELDS = ["ogal_id", *REVISION_FIELDS]
+DISPLAY_FIELDS = ["cust_name", "address", "city", "province"]
+
+SortAccessor = Callable[[Dict[str, Any]], Any]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def safe_json(value: Any, fallback: Any) -> Any:
+    if value is None:
+        return fallback
+    if isinstance(value, (dict, list)):
+        return value
+    try:
+        parsed = json.loads(str(value))
+        return parsed
+    except (TypeError, ValueError, json.JSONDecodeError):
+        return fallback
+
+
+def _normalize_text(text_value: str) -> str:
+    return _WHITESPACE.sub(" ", text_value.strip()).upper()
+
+
+DEFAULT_NORMALIZE_CACHE_SIZE = 200_000
+# Nilai yang sama (kota, nama parser, ogal_id, ...) muncul berulang di banyak
+# audit/baseline dan di request berikutnya; hasil normalisasinya di-cache per
+# proses (LRU, key = teks mentah).
+_normalize_cached: Callable[[str], str] = lru_cache(maxsize=DEFAULT_NORMALIZE_CACHE_SIZE)(
+    _normalize_text
+)
+
+
+def configure_normalize_cache(max_entries: int) -> None:
+    global _normalize_cached
+    if max_entries > 0:
+        _normalize_cached = lru_cache(maxsize=max_entries)(_normalize_text)
+    else:
+        _normalize_cached = _normalize_text
+
+
+def normalize_cache_stats() -> Dict[str, Any]:
+    cache_info = getattr(_normalize_cached, "cache_info", None)
+    if cache_info is None:
+        return {"enabled": False}
+    info = cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "enabled": True,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        "size": info.currsize,
+        "max_entries": info.maxsize,
+    }
+
+
+def clear_normalize_cache() -> None:
+    cache_clear = getattr(_normalize_cached, "cache_clear", None)
+    if cache_clear is not None:
+        cache_clear()
+
+
+def normalize(value: Any) -> str:
+    if value is None:
+        return ""
+    return _normalize_cached(value if type(value) is str else str(value))
+
+
+def search_text(values: Iterable[Any]) -> str:
+    # Sama dengan normalize(" ".join(...)), tapi tiap bagian lewat cache.
+    return " ".join(part for part in map(normalize, values) if part)
+
+
+def iso(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def classify_fields(fields: Iterable[str]) -> str:
+    field_set = set(fields)
+    has_parsing = "ogal_id" in field_set
+    has_revision = any(field in field_set for field in REVISION_FIELDS)
+    if has_parsing and has_revision:
+        return "PARSING & REVISI DATA"
+    if has_parsing:
+        return "PARSING"
+    if has_revision:
+        return "REVISI DATA"
+    return "LAINNYA"
+
+
+def parse_audit_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+    item = dict(row)
+    item["changed_fields_list"] = safe_json(item.get("changed_fields"), [])
+    item["old_values_dict"] = safe_json(item.get("old_values"), {})
+    item["new_values_dict"] = safe_json(item.get("new_values"), {})
+    # Shadow ternormalisasi: pembandingan berikutnya cukup kesamaan string.
+    item["new_values_norm"] = {
+        field: normalize(value) for field, value in item["new_values_dict"].items()
+    }
+    item["change_type"] = item.get("change_type") or classify_fields(
+        item["changed_fields_list"]
+    )
+    return item
+
+
+def make_baseline(
+    values: Dict[str, Any],
+    source: Optional[str],
+    created_at: Any = None,
+    updated_at: Any = None,
+) -> Dict[str, Any]:
+    return {
+        "values": values,
+        "values_norm": {field: normalize(values.get(field)) for field in TRACKED_FIELDS},
+        "source": source,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+
+
+def parse_baseline_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+    return make_baseline(
+        safe_json(row["original_values"], {}),
+        row["baseline_source"],
+        row["baseline_created_at"],
+        row["baseline_updated_at"],
+    )
+
+
+def baseline_norm_values(
+    baselines: Dict[int, Dict[str, Any]],
+    odist_id: Any,
+) -> Dict[str, str]:
+    baseline = baselines.get(int(odist_id))
+    return baseline["values_norm"] if baseline is not None else {}
+
+
+def group_audits_by_odist(
+    audits: List[Dict[str, Any]],
+) -> Dict[int, List[Dict[str, Any]]]:
+    grouped: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for audit in audits:
+        grouped[int(audit["odist_id"])].append(audit)
+    return grouped
+
+
+def missing_baseline_ids(
+    baselines: Dict[int, Dict[str, Any]],
+    audits: List[Dict[str, Any]],
+) -> List[int]:
+    audit_ids = sorted({int(audit["odist_id"]) for audit in audits})
+    return [odist_id for odist_id in audit_ids if odist_id not in baselines]
+
+
+def reconstruct_original_values(
+    current_row: Dict[str, Any],
+    old_values_history: Iterable[Dict[str, Any]],
+) -> Dict[str, Any]:
+    # Nilai asli = old_values pertama per field (audit urut kronologis), sisanya
+    # diambil dari row current.
+    original_values = {field: current_row.get(field) for field in TRACKED_FIELDS}
+    seen_fields: set[str] = set()
+    for old_values in old_values_history:
+        for field in TRACKED_FIELDS:
+            if field in old_values and field not in seen_fields:
+                original_values[field] = old_values[field]
+                seen_fields.add(field)
+    return original_values
+
+
+def find_field_owner(
+    field: str,
+    current_value: Any,
+    audits: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    normalized_current = normalize(current_value)
+    for audit in reversed(audits):
+        if audit["new_values_norm"].get(field) == normalized_current:
+            return audit
+    return None
+
+
+def event_revert_state(
+    audit: Dict[str, Any],
+    baseline_norm: Dict[str, str],
+) -> str:
+    # baseline_norm = baseline["values_norm"] (lihat baseline_norm_values).
+    new_values_norm = audit["new_values_norm"]
+    relevant_fields = [
+        field
+        for field in audit["changed_fields_list"]
+        if field in TRACKED_FIELDS and field in new_values_norm
+    ]
+    if not relevant_fields:
+        return "CHANGE"
+
+    returned_to_original = [
+        new_values_norm[field] == baseline_norm.get(field, "")
+        for field in relevant_fields
+    ]
+    if all(returned_to_original):
+        return "REVERT"
+    if any(returned_to_original):
+        return "PARTIAL REVERT"
+    return "CHANGE"
+
+
+def compute_effective_details(
+    audits: List[Dict[str, Any]],
+    baselines: Dict[int, Dict[str, Any]],
+    current_rows: Dict[int, Dict[str, Any]],
+    grouped_audits: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+) -> List[Dict[str, Any]]:
+    if grouped_audits is None:
+        grouped_audits = group_audits_by_odist(audits)
+    tracked_ids = sorted(set(baselines) | set(grouped_audits))
+
+    details: List[Dict[str, Any]] = []
+    for odist_id in tracked_ids:
+        current_row = current_rows.get(odist_id)
+        baseline = baselines.get(odist_id)
+        if current_row is None or baseline is None:
+            continue
+
+        baseline_values = baseline["values"]
+        baseline_norm = baseline["values_norm"]
+        active_fields = [
+            field
+            for field in TRACKED_FIELDS
+            if normalize(current_row.get(field)) != baseline_norm[field]
+        ]
+        if not active_fields:
+            continue
+
+        odist_audits = grouped_audits.get(odist_id, [])
+        owners: Dict[str, Dict[str, Any]] = {}
+        for field in active_fields:
+            owner = find_field_owner(field, current_row.get(field), odist_audits)
+            owner_key = (
+                f"USER:{owner['user_id']}"
+                if owner is not None
+                else "UNTRACKED"
+            )
+            owner_bucket = owners.setdefault(
+                owner_key,
+                {
+                    "owner": owner,
+                    "fields": [],
+                },
+            )
+            owner_bucket["fields"].append(field)
+
+        global_status = classify_fields(active_fields)
+        global_revision_fields = [
+            field for field in active_fields if field in REVISION_FIELDS
+        ]
+
+        for owner_bucket in owners.values():
+            owner = owner_bucket["owner"]
+            owned_fields = owner_bucket["fields"]
+            owned_revision_fields = [
+                field for field in owned_fields if field in REVISION_FIELDS
+            ]
+            member_audits = (
+                [
+                    audit
+                    for audit in odist_audits
+                    if int(audit["user_id"]) == int(owner["user_id"])
+                ]
+                if owner is not None
+                else []
+            )
+            member_status = classify_fields(owned_fields)
+
+            details.append(
+                {
+                    "odist_id": odist_id,
+                    "member_user_id": int(owner["user_id"]) if owner else None,
+                    "member_name": owner["actor_full_name"] if owner else "UNTRACKED",
+                    "username": owner["username"] if owner else "-",
+                    "status": member_status,
+                    "global_status": global_status,
+                    "original_ogal_id": baseline_values.get("ogal_id"),
+                    "current_ogal_id": current_row.get("ogal_id"),
+                    "active_revision_fields": global_revision_fields,
+                    "owned_revision_fields": owned_revision_fields,
+                    "owned_fields": owned_fields,
+                    "cust_name": current_row.get("cust_name"),
+                    "address": current_row.get("address"),
+                    "city": current_row.get("city"),
+                    "province": current_row.get("province"),
+                    "first_edited_at": iso(
+                        member_audits[0]["changed_at"] if member_audits else None
+                    ),
+                    "last_edited_at": iso(
+                        member_audits[-1]["changed_at"] if member_audits else None
+                    ),
+                    "total_actions": len(member_audits),
+                    "baseline_source": baseline["source"],
+                    "is_untracked": owner is None,
+                }
+            )
+
+    details.sort(
+        key=lambda item: (
+            item.get("last_edited_at") or "",
+            item["odist_id"],
+        ),
+        reverse=True,
+    )
+    return details
+
+
+def _empty_member_bucket(user_id: Optional[int], member_name: str, username: str) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "member_name": member_name,
+        "username": username,
+        "active_parsing_rows": 0,
+        "active_revision_rows": 0,
+        "active_parsing_revision_rows": 0,
+        "active_revised_fields": 0,
+        "total_edit_activities": 0,
+        "reverted_activities": 0,
+        "partial_revert_activities": 0,
+    }
+
+
+def summarize_members(
+    details: List[Dict[str, Any]],
+    all_audits: List[Dict[str, Any]],
+    baselines: Dict[int, Dict[str, Any]],
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    summary_by_member: Dict[str, Dict[str, Any]] = {}
+    member_options: Dict[str, Dict[str, Any]] = {}
+
+    for audit in all_audits:
+        key = str(audit["user_id"])
+        member_options[key] = {
+            "user_id": int(audit["user_id"]),
+            "member_name": audit["actor_full_name"],
+            "username": audit["username"],
+        }
+
+    for detail in details:
+        member_key = (
+            str(detail["member_user_id"])
+            if detail["member_user_id"] is not None
+            else "UNTRACKED"
+        )
+        member_options.setdefault(
+            member_key,
+            {
+                "user_id": detail["member_user_id"],
+                "member_name": detail["member_name"],
+                "username": detail["username"],
+            },
+        )
+        bucket = summary_by_member.setdefault(
+            member_key,
+            _empty_member_bucket(
+                detail["member_user_id"],
+                detail["member_name"],
+                detail["username"],
+            ),
+        )
+        if detail["status"] in {"PARSING", "PARSING & REVISI DATA"}:
+            bucket["active_parsing_rows"] += 1
+        if detail["status"] in {"REVISI DATA", "PARSING & REVISI DATA"}:
+            bucket["active_revision_rows"] += 1
+        if detail["status"] == "PARSING & REVISI DATA":
+            bucket["active_parsing_revision_rows"] += 1
+        bucket["active_revised_fields"] += len(detail["owned_revision_fields"])
+
+    activity_audits = [
+        audit
+        for audit in all_audits
+        if (date_from is None or audit["changed_at"] >= date_from)
+        and (
+            date_to is None
+            or audit["changed_at"].date() <= date_to.date()
+        )
+    ]
+    for audit in activity_audits:
+        member_key = str(audit["user_id"])
+        bucket = summary_by_member.setdefault(
+            member_key,
+            _empty_member_bucket(
+                int(audit["user_id"]),
+                audit["actor_full_name"],
+                audit["username"],
+            ),
+        )
+        bucket["total_edit_activities"] += 1
+        revert_state = event_revert_state(
+            audit,
+            baseline_norm_values(baselines, audit["odist_id"]),
+        )
+        if revert_state == "REVERT":
+            bucket["reverted_activities"] += 1
+        elif revert_state == "PARTIAL REVERT":
+            bucket["partial_revert_activities"] += 1
+
+    members = list(summary_by_member.values())
+    if user_id is not None:
+        members = [member for member in members if member["user_id"] == user_id]
+    members.sort(
+        key=lambda member: (
+            member["active_parsing_rows"] + member["active_revision_rows"],
+            member["total_edit_activities"],
+            member["member_name"],
+        ),
+        reverse=True,
+    )
+
+    totals = {
+        key: sum(int(member[key]) for member in members)
+        for key in [
+            "active_parsing_rows",
+            "active_revision_rows",
+            "active_parsing_revision_rows",
+            "active_revised_fields",
+            "total_edit_activities",
+            "reverted_activities",
+            "partial_revert_activities",
+        ]
+    }
+
+    return {
+        "members": members,
+        "member_options": sorted(
+            member_options.values(),
+            key=lambda item: item["member_name"],
+        ),
+        "totals": totals,
+    }
+
+
+def matches_period(
+    changed_at: datetime,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+) -> bool:
+    if date_from is not None and changed_at < date_from:
+        return False
+    if date_to is not None and changed_at.date() > date_to.date():
+        return False
+    return True
+
+
+def effective_revert_state(
+    detail: Dict[str, Any],
+    grouped_audits: Dict[int, List[Dict[str, Any]]],
+    baselines: Dict[int, Dict[str, Any]],
+) -> str:
+    member_user_id = detail.get("member_user_id")
+    if member_user_id is None:
+        return "UNTRACKED"
+
+    owned_fields = set(detail.get("owned_fields") or [])
+    relevant_audits = [
+        audit
+        for audit in grouped_audits.get(int(detail["odist_id"]), [])
+        if int(audit["user_id"]) == int(member_user_id)
+        and owned_fields.intersection(audit.get("changed_fields_list") or [])
+    ]
+    if not relevant_audits:
+        return "UNTRACKED"
+
+    latest_audit = relevant_audits[-1]
+    return event_revert_state(
+        latest_audit,
+        baseline_norm_values(baselines, detail["odist_id"]),
+    )
+
+
+def normalize_sort_value(value: Any) -> tuple[int, Any]:
+    if isinstance(value, bool):
+        return (0, int(value))
+    if isinstance(value, (int, float)):
+        return (0, float(value))
+    if isinstance(value, datetime):
+        return (0, value.timestamp())
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return (1, normalize(value))
+
+
+def sort_items(
+    items: List[Dict[str, Any]],
+    sort_by: Optional[str],
+    sort_dir: str,
+    accessors: Dict[str, SortAccessor],
+    default_sort: str,
+) -> List[Dict[str, Any]]:
+    safe_sort = sort_by if sort_by in accessors else default_sort
+    accessor = accessors[safe_sort]
+    reverse = str(sort_dir).lower() == "desc"
+
+    populated: List[Dict[str, Any]] = []
+    empty: List[Dict[str, Any]] = []
+    for item in items:
+        value = accessor(item)
+        if value is None or value == "":
+            empty.append(item)
+        else:
+            populated.append(item)
+
+    populated.sort(
+        key=lambda item: normalize_sort_value(accessor(item)),
+        reverse=reverse,
+    )
+    return populated + empty
+
+
+EFFECTIVE_SORT_ACCESSORS: Dict[str, SortAccessor] = {
+    "odist_id": lambda item: item.get("odist_id"),
+    "member_name": lambda item: item.get("member_name"),
+    "status": lambda item: item.get("status"),
+    "revert_state": lambda item: item.get("revert_state"),
+    "original_ogal_id": lambda item: item.get("original_ogal_id"),
+    "current_ogal_id": lambda item: item.get("current_ogal_id"),
+    "owned_revision_fields": lambda item: item.get("owned_revision_fields"),
+    "cust_name": lambda item: item.get("cust_name"),
+    "city": lambda item: item.get("city"),
+    "province": lambda item: item.get("province"),
+    "last_edited_at": lambda item: item.get("last_edited_at"),
+    "total_actions": lambda item: item.get("total_actions"),
+    "tracking": lambda item: "UNTRACKED" if item.get("is_untracked") else "TRACKED",
+}
+
+HISTORY_SORT_ACCESSORS: Dict[str, SortAccessor] = {
+    "changed_at": lambda item: item.get("changed_at"),
+    "odist_id": lambda item: item.get("odist_id"),
+    "member_name": lambda item: item.get("member_name"),
+    "change_type": lambda item: item.get("change_type"),
+    "revert_state": lambda item: item.get("revert_state"),
+    "changed_fields": lambda item: item.get("changed_fields"),
+    "before_after": lambda item: {
+        "old_values": item.get("old_values"),
+        "new_values": item.get("new_values"),
+    },
+}
+
+
+def filter_effective_details(
+    details: List[Dict[str, Any]],
+    audits: List[Dict[str, Any]],
+    baselines: Dict[int, Dict[str, Any]],
+    odist_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    revert_state: Optional[str] = None,
+    search: Optional[str] = None,
+    grouped_audits: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+) -> List[Dict[str, Any]]:
+    if grouped_audits is None:
+        grouped_audits = group_audits_by_odist(audits)
+    normalized_search = normalize(search) if search else ""
+
+    filtered: List[Dict[str, Any]] = []
+    for source_detail in details:
+        detail = dict(source_detail)
+        detail["revert_state"] = effective_revert_state(
+            detail=detail,
+            grouped_audits=grouped_audits,
+            baselines=baselines,
+        )
+
+        if odist_id is not None and int(detail["odist_id"]) != int(odist_id):
+            continue
+        if user_id is not None and detail["member_user_id"] != user_id:
+            continue
+        if status_filter and detail["status"] != status_filter:
+            continue
+        if revert_state and detail["revert_state"] != revert_state:
+            continue
+        if normalized_search:
+            haystack = search_text(
+                detail.get(field)
+                for field in [
+                    "odist_id",
+                    "member_name",
+                    "username",
+                    "status",
+                    "revert_state",
+                    "cust_name",
+                    "address",
+                    "city",
+                    "province",
+                ]
+            )
+            if normalized_search not in haystack:
+                continue
+        filtered.append(detail)
+    return filtered
+
+
+def history_item(
+    audit: Dict[str, Any],
+    baseline_norm: Dict[str, str],
+    change_type: Optional[str] = None,
+    revert_state: Optional[str] = None,
+    normalized_search: str = "",
+) -> Optional[Dict[str, Any]]:
+    # Satu baris activity history, atau None bila tidak lolos filter
+    # change_type/revert_state/search. Filter periode, odist dan user dicek
+    # pemanggil (di memori atau di SQL).
+    audit_revert_state = event_revert_state(audit, baseline_norm)
+    audit_change_type = audit["change_type"]
+
+    if change_type and audit_change_type != change_type:
+        return None
+    if revert_state and audit_revert_state != revert_state:
+        return None
+    if normalized_search:
+        haystack = search_text(
+            [
+                audit["odist_id"],
+                str(audit["actor_full_name"]),
+                str(audit["username"]),
+                str(audit_change_type),
+                audit_revert_state,
+                *audit["changed_fields_list"],
+            ]
+        )
+        if normalized_search not in haystack:
+            return None
+
+    return {
+        "audit_id": int(audit["audit_id"]),
+        "odist_id": int(audit["odist_id"]),
+        "user_id": int(audit["user_id"]),
+        "member_name": audit["actor_full_name"],
+        "username": audit["username"],
+        "change_type": audit_change_type,
+        "revert_state": audit_revert_state,
+        "changed_fields": [
+            field
+            for field in audit["changed_fields_list"]
+            if field in TRACKED_FIELDS
+        ],
+        "old_values": audit["old_values_dict"],
+        "new_values": audit["new_values_dict"],
+        "changed_at": iso(audit["changed_at"]),
+    }
+
+
+def build_history_items(
+    all_audits: List[Dict[str, Any]],
+    baselines: Dict[int, Dict[str, Any]],
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    odist_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    change_type: Optional[str] = None,
+    revert_state: Optional[str] = None,
+    search: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    normalized_search = normalize(search) if search else ""
+
+    items: List[Dict[str, Any]] = []
+    for audit in all_audits:
+        if not matches_period(audit["changed_at"], date_from, date_to):
+            continue
+        if odist_id is not None and int(audit["odist_id"]) != int(odist_id):
+            continue
+        if user_id is not None and int(audit["user_id"]) != int(user_id):
+            continue
+
+        item = history_item(
+            audit,
+            baseline_norm_values(baselines, audit["odist_id"]),
+            change_type=change_type,
+            revert_state=revert_state,
+            normalized_search=normalized_search,
+        )
+        if item is not None:
+            items.append(item)
+    return items
+
+
+def paginate(items: List[Dict[str, Any]], page: int, page_size: int) -> Dict[str, Any]:
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), 200)
+    total = len(items)
+    offset = (page - 1) * page_size
+    return {
+        "items": items[offset : offset + page_size],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": max(1, math.ceil(total / page_size)),
+    }
@@ -0,0 +1,194 @@
+# Export activity history tanpa memuat seluruh audit ke memori: baseline yang
+# belum ada dibuat dulu per chunk id, audit dibaca bertahap (stream_results)
+# dari session sendiri, revert state dihitung per baris dari baseline yang
+# di-join, lalu langsung ditulis sebagai CSV/NDJSON.
+import csv
+import io
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.database import mysql_pipeline_session_scope, session_scope
+from app.services import parsing_baseline_service
+from app.services import parsing_report_core as core
+from app.services import parsing_report_service as base
+
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+CSV_COLUMNS = [
+    "audit_id",
+    "odist_id",
+    "user_id",
+    "member_name",
+    "username",
+    "change_type",
+    "revert_state",
+    "changed_fields",
+    "old_values",
+    "new_values",
+    "changed_at",
+]
+# Baseline ternormalisasi di-cache per teks JSON (ukuran tetap) karena satu
+# ODIST biasanya punya banyak audit dalam satu export.
+BASELINE_CACHE_SIZE = 4096
+# Baris CSV ditampung sebentar supaya tiap chunk respons tidak terlalu kecil.
+CSV_ROWS_PER_CHUNK = 500
+# Jumlah odist_id tanpa baseline yang dibuatkan baseline per putaran.
+MISSING_BASELINE_CHUNK = 500
+
+
+@lru_cache(maxsize=BASELINE_CACHE_SIZE)
+def _baseline_norm(original_values: Optional[str]) -> Dict[str, str]:
+    # Hasil dibagi antar baris; jangan diubah.
+    values = core.safe_json(original_values, None)
+    if not isinstance(values, dict):
+        return {}
+    return core.make_baseline(values, "")["values_norm"]
+
+
+def _ensure_missing_baselines(
+    audit_db: Session,
+    where_sql: str,
+    params: Dict[str, Any],
+) -> None:
+    # Sama dengan /history: ODIST yang diaudit tapi belum punya baseline
+    # dibuatkan baseline sebelum streaming. id diambil per chunk (keyset
+    # odist_id) supaya memori tetap berapa pun jumlahnya.
+    after_odist_id = 0
+    with mysql_pipeline_session_scope() as mysql_db:
+        while True:
+            odist_ids = audit_db.execute(
+                text(
+                    f"""
+                    SELECT DISTINCT TOP (:chunk_size) a.odist_id
+                    FROM [tools].[odists_parsing_audit_log] AS a
+                    WHERE {where_sql}
+                      AND a.odist_id > :after_odist_id
+                      AND NOT EXISTS (
+                          SELECT 1
+                          FROM [tools].[odists_parsing_baseline] AS b
+                          WHERE b.odist_id = a.odist_id
+                      )
+                    ORDER BY a.odist_id ASC
+                    """
+                ),
+                {
+                    **params,
+                    "chunk_size": MISSING_BASELINE_CHUNK,
+                    "after_odist_id": after_odist_id,
+                },
+            ).scalars().all()
+            if not odist_ids:
+                return
+            odist_ids = [int(value) for value in odist_ids]
+            parsing_baseline_service._insert_baselines(
+                audit_db,
+                odist_ids,
+                base._get_current_rows(mysql_db, odist_ids),
+                path="export",
+            )
+            after_odist_id = odist_ids[-1]
+
+
+def iter_history_items(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    odist_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    change_type: Optional[str] = None,
+    revert_state: Optional[str] = None,
+    search: Optional[str] = None,
+    sort_dir: str = "desc",
+) -> Iterator[Dict[str, Any]]:
+    # Urutan hanya berdasarkan changed_at (lalu audit_id) karena diurutkan di
+    # SQL; ODIST yang sudah tidak ada di MySQL tetap tanpa baseline (kosong).
+    where_sql, params = base._audit_where(date_from, date_to, user_id, odist_id)
+    direction = "ASC" if sort_dir == "asc" else "DESC"
+    normalized_search = core.normalize(search) if search else ""
+
+    with session_scope() as audit_db:
+        base._ensure_schema(audit_db)
+        _ensure_missing_baselines(audit_db, where_sql, params)
+        result = audit_db.execute(
+            text(
+                f"""
+                SELECT {base.AUDIT_SELECT_COLUMNS},
+                    b.original_values AS baseline_values
+                FROM [tools].[odists_parsing_audit_log] AS a
+                LEFT JOIN [tools].[app_users] AS u
+                    ON u.user_id = a.user_id
+                LEFT JOIN [tools].[odists_parsing_baseline] AS b
+                    ON b.odist_id = a.odist_id
+                WHERE {where_sql}
+                ORDER BY a.changed_at {direction}, a.audit_id {direction}
+                """
+            ),
+            params,
+            execution_options={
+                "stream_results": True,
+                "yield_per": settings.REPORT_EXPORT_FETCH_SIZE,
+            },
+        )
+        for partition in result.mappings().partitions():
+            for row in partition:
+                item = core.history_item(
+                    core.parse_audit_row(row),
+                    _baseline_norm(row["baseline_values"]),
+                    change_type=change_type,
+                    revert_state=revert_state,
+                    normalized_search=normalized_search,
+                )
+                if item is not None:
+                    yield item
+
+
+def _csv_row(item: Dict[str, Any]) -> list:
+    return [
+        item["audit_id"],
+        item["odist_id"],
+        item["user_id"],
+        item["member_name"],
+        item["username"],
+        item["change_type"],
+        item["revert_state"],
+        ",".join(item["changed_fields"]),
+        json.dumps(item["old_values"], ensure_ascii=False, default=str),
+        json.dumps(item["new_values"], ensure_ascii=False, default=str),
+        item["changed_at"],
+    ]
+
+
+def stream_csv(items: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    pending = 0
+    for item in items:
+        writer.writerow(_csv_row(item))
+        pending += 1
+        if pending >= CSV_ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    yield buffer.getvalue()
+
+
+def stream_ndjson(items: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+
+
+def export_history(export_format: str, **filters: Any) -> Iterator[str]:
+    items = iter_history_items(**filters)
+    if export_format == "ndjson":
+        return stream_ndjson(items)
+    return stream_csv(items)
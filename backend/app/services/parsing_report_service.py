@@ -1,69 +1,55 @@
 import json
-import math
-import re
-from collections import defaultdict
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
 from sqlmodel import Session
 
+from app.core.config import settings
+from app.core.metrics import parsing_baselines_inserted_total, report_audits_loaded_total
+from app.core.phase_timing import track_phase
+from app.db.database import mysql_pipeline_session_scope, session_scope
+from app.services import audit_field_change_service
+from app.services import parsing_report_core as core
+from app.services.odists_row_mirror import OdistsRowMirror
+from app.services.report_cache import ReportCache
+
 
 ODISTS_TABLE = "gold_odists_parsing_manual"
-REVISION_FIELDS = [
-    "dist_code",
-    "cust_code",
-    "cust_name",
-    "address",
-    "type_outlet",
-    "city",
-    "province",
-    "kecamatan",
-    "kota",
-    "provinsi",
+CURRENT_ROW_FIELDS = [
+    "id",
+    *core.TRACKED_FIELDS,
+    *(field for field in core.DISPLAY_FIELDS if field not in core.TRACKED_FIELDS),
 ]
-TRACKED_FIELDS = ["ogal_id", *REVISION_FIELDS]
-
-
-def _safe_json(value: Any, fallback: Any) -> Any:
-    if value is None:
-        return fallback
-    if isinstance(value, (dict, list)):
-        return value
-    try:
-        parsed = json.loads(str(value))
-        return parsed
-    except (TypeError, ValueError, json.JSONDecodeError):
-        return fallback
-
-
-def _normalize(value: Any) -> str:
-    if value is None:
-        return ""
-    text_value = str(value)
-    text_value = re.sub(r"\s+", " ", text_value.strip())
-    return text_value.upper()
-
-
-def _iso(value: Any) -> Optional[str]:
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return str(value)
-
-
-def _classify_fields(fields: Iterable[str]) -> str:
-    field_set = set(fields)
-    has_parsing = "ogal_id" in field_set
-    has_revision = any(field in field_set for field in REVISION_FIELDS)
-    if has_parsing and has_revision:
-        return "PARSING & REVISI DATA"
-    if has_parsing:
-        return "PARSING"
-    if has_revision:
-        return "REVISI DATA"
-    return "LAINNYA"
+
+
+_loader_executor: Optional[ThreadPoolExecutor] = None
+_loader_executor_lock = threading.Lock()
+
+
+def _get_loader_executor() -> ThreadPoolExecutor:
+    global _loader_executor
+
+    if _loader_executor is None:
+        with _loader_executor_lock:
+            if _loader_executor is None:
+                _loader_executor = ThreadPoolExecutor(
+                    max_workers=settings.REPORT_LOADER_WORKERS,
+                    thread_name_prefix="report-loader",
+                )
+    return _loader_executor
+
+
+def _submit(fn: Callable[..., Any], *args: Any) -> Future:
+    # Task di pool hanya boleh berupa loader "daun" (tidak submit lagi ke pool)
+    # supaya pool yang dibatasi tidak deadlock.
+    context = copy_context()
+    return _get_loader_executor().submit(context.run, fn, *args)
 
 
 def _ensure_schema(audit_db: Session) -> None:
@@ -120,6 +106,7 @@ def _ensure_schema(audit_db: Session) -> None:
             """
         )
     )
+    audit_db.execute(audit_field_change_service.ENSURE_TABLE_SQL)
     audit_db.commit()
 
 
@@ -129,6 +116,43 @@ def _load_audits(
     date_to: Optional[datetime] = None,
     user_id: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
+    with track_phase("report_audits"):
+        audits = _query_audits(audit_db, date_from, date_to, user_id)
+    report_audits_loaded_total.inc(len(audits))
+    return audits
+
+
+def _load_audits_isolated(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    with session_scope() as audit_db:
+        return _load_audits(audit_db, date_from, date_to, user_id)
+
+
+AUDIT_SELECT_COLUMNS = """
+    a.audit_id,
+    a.odist_id,
+    a.user_id,
+    a.username,
+    COALESCE(NULLIF(a.actor_full_name, N''), NULLIF(u.full_name, N''), a.username)
+        AS actor_full_name,
+    a.changed_fields,
+    a.old_values,
+    a.new_values,
+    a.changed_at,
+    a.change_type,
+    COALESCE(a.apply_status, N'COMMITTED') AS apply_status
+"""
+
+
+def _audit_where(
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    user_id: Optional[int],
+    odist_id: Optional[int] = None,
+) -> tuple[str, Dict[str, Any]]:
     where_parts = ["COALESCE(a.apply_status, N'COMMITTED') = N'COMMITTED'"]
     params: Dict[str, Any] = {}
     if date_from is not None:
@@ -140,65 +164,48 @@ def _load_audits(
     if user_id is not None:
         where_parts.append("a.user_id = :user_id")
         params["user_id"] = user_id
+    if odist_id is not None:
+        where_parts.append("a.odist_id = :odist_id")
+        params["odist_id"] = odist_id
+    return " AND ".join(where_parts), params
 
+
+def _query_audits(
+    audit_db: Session,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    user_id: Optional[int],
+) -> List[Dict[str, Any]]:
+    where_sql, params = _audit_where(date_from, date_to, user_id)
     rows = audit_db.execute(
         text(
             f"""
-            SELECT
-                a.audit_id,
-                a.odist_id,
-                a.user_id,
-                a.username,
-                COALESCE(NULLIF(a.actor_full_name, N''), NULLIF(u.full_name, N''), a.username)
-                    AS actor_full_name,
-                a.changed_fields,
-                a.old_values,
-                a.new_values,
-                a.changed_at,
-                a.change_type,
-                COALESCE(a.apply_status, N'COMMITTED') AS apply_status
+            SELECT {AUDIT_SELECT_COLUMNS}
             FROM [tools].[odists_parsing_audit_log] AS a
             LEFT JOIN [tools].[app_users] AS u
                 ON u.user_id = a.user_id
-            WHERE {' AND '.join(where_parts)}
+            WHERE {where_sql}
             ORDER BY a.changed_at ASC, a.audit_id ASC
             """
         ),
         params,
     ).mappings().all()
 
-    result: List[Dict[str, Any]] = []
-    for row in rows:
-        item = dict(row)
-        item["changed_fields_list"] = _safe_json(item.get("changed_fields"), [])
-        item["old_values_dict"] = _safe_json(item.get("old_values"), {})
-        item["new_values_dict"] = _safe_json(item.get("new_values"), {})
-        item["change_type"] = item.get("change_type") or _classify_fields(
-            item["changed_fields_list"]
-        )
-        result.append(item)
-    return result
+    return [core.parse_audit_row(row) for row in rows]
 
 
 def _load_baselines(audit_db: Session) -> Dict[int, Dict[str, Any]]:
-    rows = audit_db.execute(
-        text(
-            """
-            SELECT odist_id, original_values, baseline_source,
-                   baseline_created_at, baseline_updated_at
-            FROM [tools].[odists_parsing_baseline]
-            """
-        )
-    ).mappings().all()
-    return {
-        int(row["odist_id"]): {
-            "values": _safe_json(row["original_values"], {}),
-            "source": row["baseline_source"],
-            "created_at": row["baseline_created_at"],
-            "updated_at": row["baseline_updated_at"],
-        }
-        for row in rows
-    }
+    with track_phase("report_baselines"):
+        rows = audit_db.execute(
+            text(
+                """
+                SELECT odist_id, original_values, baseline_source,
+                       baseline_created_at, baseline_updated_at
+                FROM [tools].[odists_parsing_baseline]
+                """
+            )
+        ).mappings().all()
+    return {int(row["odist_id"]): core.parse_baseline_row(row) for row in rows}
 
 
 def _chunks(values: List[int], size: int = 500) -> Iterable[List[int]]:
@@ -206,6 +213,36 @@ def _chunks(values: List[int], size: int = 500) -> Iterable[List[int]]:
         yield values[index : index + size]
 
 
+def _current_rows_query(batch: List[int]) -> tuple[TextClause, Dict[str, Any]]:
+    placeholders = []
+    params: Dict[str, Any] = {}
+    for index, odist_id in enumerate(batch):
+        key = f"id_{index}"
+        placeholders.append(f":{key}")
+        params[key] = odist_id
+    statement = text(
+        f"""
+        SELECT {', '.join(f'`{field}`' for field in CURRENT_ROW_FIELDS)}
+        FROM `{ODISTS_TABLE}`
+        WHERE `id` IN ({', '.join(placeholders)})
+        """
+    )
+    return statement, params
+
+
+def _load_current_rows_batch(
+    mysql_db: Session,
+    batch: List[int],
+) -> Dict[int, Dict[str, Any]]:
+    rows = mysql_db.execute(*_current_rows_query(batch)).mappings().all()
+    return {int(row["id"]): dict(row) for row in rows}
+
+
+def _load_current_rows_batch_isolated(batch: List[int]) -> Dict[int, Dict[str, Any]]:
+    with mysql_pipeline_session_scope() as mysql_db:
+        return _load_current_rows_batch(mysql_db, batch)
+
+
 def _load_current_rows(
     mysql_db: Session,
     odist_ids: Iterable[int],
@@ -214,76 +251,98 @@ def _load_current_rows(
     if not ids:
         return {}
 
-    selected_fields = ["id", *TRACKED_FIELDS]
-    additional_fields = ["cust_name", "address", "city", "province"]
-    selected_fields.extend(
-        field for field in additional_fields if field not in selected_fields
-    )
+    batches = list(_chunks(ids))
+    result: Dict[int, Dict[str, Any]] = {}
+    with track_phase("report_current_rows"):
+        futures = [
+            _submit(_load_current_rows_batch_isolated, batch)
+            for batch in batches[1:]
+        ]
+        result.update(_load_current_rows_batch(mysql_db, batches[0]))
+        for future in futures:
+            result.update(future.result())
+    return result
 
+
+async def _load_current_rows_async(
+    mysql_db: AsyncSession,
+    odist_ids: Iterable[int],
+) -> Dict[int, Dict[str, Any]]:
+    # Jalur tulis: dibaca lewat session async yang sama dengan UPDATE-nya.
+    ids = sorted({int(value) for value in odist_ids})
     result: Dict[int, Dict[str, Any]] = {}
     for batch in _chunks(ids):
-        placeholders = []
-        params: Dict[str, Any] = {}
-        for index, odist_id in enumerate(batch):
-            key = f"id_{index}"
-            placeholders.append(f":{key}")
-            params[key] = odist_id
-        rows = mysql_db.execute(
-            text(
-                f"""
-                SELECT {', '.join(f'`{field}`' for field in selected_fields)}
-                FROM `{ODISTS_TABLE}`
-                WHERE `id` IN ({', '.join(placeholders)})
-                """
-            ),
-            params,
-        ).mappings().all()
-        for row in rows:
-            result[int(row["id"])] = dict(row)
+        rows = await mysql_db.execute(*_current_rows_query(batch))
+        result.update({int(row["id"]): dict(row) for row in rows.mappings().all()})
     return result
 
 
-def _group_audits_by_odist(
-    audits: List[Dict[str, Any]],
-) -> Dict[int, List[Dict[str, Any]]]:
-    grouped: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
-    for audit in audits:
-        grouped[int(audit["odist_id"])].append(audit)
-    return grouped
+core.configure_normalize_cache(settings.REPORT_NORMALIZE_CACHE_SIZE)
+
+report_cache = ReportCache(
+    ttl_seconds=settings.REPORT_CACHE_TTL_SECONDS,
+    max_entries=settings.REPORT_CACHE_MAX_ENTRIES,
+)
 
+current_row_mirror = OdistsRowMirror(
+    table_name=ODISTS_TABLE,
+    fields=CURRENT_ROW_FIELDS,
+    loader=_load_current_rows,
+    poll_seconds=settings.ODISTS_MIRROR_POLL_SECONDS,
+    delta_limit=settings.ODISTS_MIRROR_DELTA_LIMIT,
+    safety_lag_seconds=settings.ODISTS_MIRROR_SAFETY_LAG_SECONDS,
+)
 
-def _ensure_baselines(
+
+def _get_current_rows(
     mysql_db: Session,
+    odist_ids: Iterable[int],
+) -> Dict[int, Dict[str, Any]]:
+    if settings.ODISTS_MIRROR_ENABLED:
+        return current_row_mirror.get_rows(mysql_db, odist_ids)
+    return _load_current_rows(mysql_db, odist_ids)
+
+
+def _insert_missing_baselines(
     audit_db: Session,
+    baselines: Dict[int, Dict[str, Any]],
     audits: List[Dict[str, Any]],
+    current_rows: Dict[int, Dict[str, Any]],
 ) -> Dict[int, Dict[str, Any]]:
-    baselines = _load_baselines(audit_db)
-    audit_ids = sorted({int(audit["odist_id"]) for audit in audits})
-    missing_ids = [odist_id for odist_id in audit_ids if odist_id not in baselines]
+    missing_ids = core.missing_baseline_ids(baselines, audits)
     if not missing_ids:
         return baselines
 
-    current_rows = _load_current_rows(mysql_db, missing_ids)
-    grouped_audits = _group_audits_by_odist(audits)
+    with track_phase("report_ensure_baselines"):
+        return _write_missing_baselines(
+            audit_db,
+            baselines,
+            audits,
+            current_rows,
+            missing_ids,
+        )
+
+
+def _write_missing_baselines(
+    audit_db: Session,
+    baselines: Dict[int, Dict[str, Any]],
+    audits: List[Dict[str, Any]],
+    current_rows: Dict[int, Dict[str, Any]],
+    missing_ids: List[int],
+) -> Dict[int, Dict[str, Any]]:
+    grouped_audits = core.group_audits_by_odist(audits)
+    inserted = 0
 
     for odist_id in missing_ids:
         current_row = current_rows.get(odist_id)
         if current_row is None:
             continue
 
-        original_values = {
-            field: current_row.get(field)
-            for field in TRACKED_FIELDS
-        }
-        first_old_value_seen: set[str] = set()
         odist_audits = grouped_audits.get(odist_id, [])
-
-        for audit in odist_audits:
-            old_values = audit["old_values_dict"]
-            for field in TRACKED_FIELDS:
-                if field in old_values and field not in first_old_value_seen:
-                    original_values[field] = old_values[field]
-                    first_old_value_seen.add(field)
+        original_values = core.reconstruct_original_values(
+            current_row,
+            (audit["old_values_dict"] for audit in odist_audits),
+        )
 
         source = (
             "RECONSTRUCTED_FROM_FIRST_AUDIT"
@@ -291,7 +350,7 @@ def _ensure_baselines(
             else "CURRENT_AT_FIRST_REPORT"
         )
         serialized = json.dumps(original_values, ensure_ascii=False, default=str)
-        audit_db.execute(
+        result = audit_db.execute(
             text(
                 """
                 INSERT INTO [tools].[odists_parsing_baseline]
@@ -310,160 +369,145 @@ def _ensure_baselines(
                 "baseline_source": source,
             },
         )
-        baselines[odist_id] = {
-            "values": original_values,
-            "source": source,
-            "created_at": None,
-            "updated_at": None,
-        }
+        inserted += max(result.rowcount, 0)
+        baselines[odist_id] = core.make_baseline(original_values, source)
 
     audit_db.commit()
+    parsing_baselines_inserted_total.inc(inserted, path="report")
     return baselines
 
 
-def _find_field_owner(
-    field: str,
-    current_value: Any,
-    audits: List[Dict[str, Any]],
-) -> Optional[Dict[str, Any]]:
-    normalized_current = _normalize(current_value)
-    for audit in reversed(audits):
-        new_values = audit["new_values_dict"]
-        if field not in new_values:
-            continue
-        if _normalize(new_values[field]) == normalized_current:
-            return audit
-    return None
-
-
-def _event_revert_state(
-    audit: Dict[str, Any],
-    baseline_values: Dict[str, Any],
-) -> str:
-    new_values = audit["new_values_dict"]
-    relevant_fields = [
-        field
-        for field in audit["changed_fields_list"]
-        if field in TRACKED_FIELDS and field in new_values
-    ]
-    if not relevant_fields:
-        return "CHANGE"
-
-    returned_to_original = [
-        _normalize(new_values[field]) == _normalize(baseline_values.get(field))
-        for field in relevant_fields
-    ]
-    if all(returned_to_original):
-        return "REVERT"
-    if any(returned_to_original):
-        return "PARTIAL REVERT"
-    return "CHANGE"
-
-
-def _build_effective_details(
+def _load_audits_and_baselines(
     mysql_db: Session,
     audit_db: Session,
-) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
-    _ensure_schema(audit_db)
-    audits = _load_audits(audit_db)
-    baselines = _ensure_baselines(mysql_db, audit_db, audits)
-    tracked_ids = sorted(set(baselines) | {int(audit["odist_id"]) for audit in audits})
-    current_rows = _load_current_rows(mysql_db, tracked_ids)
-    grouped_audits = _group_audits_by_odist(audits)
-
-    details: List[Dict[str, Any]] = []
-    for odist_id in tracked_ids:
-        current_row = current_rows.get(odist_id)
-        baseline = baselines.get(odist_id)
-        if current_row is None or baseline is None:
-            continue
-
-        baseline_values = baseline["values"]
-        active_fields = [
-            field
-            for field in TRACKED_FIELDS
-            if _normalize(current_row.get(field))
-            != _normalize(baseline_values.get(field))
-        ]
-        if not active_fields:
-            continue
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    with_current_rows: bool = True,
+) -> tuple[
+    List[Dict[str, Any]],
+    Dict[int, Dict[str, Any]],
+    Dict[int, Dict[str, Any]],
+]:
+    # Audit (MSSQL, session terpisah) dimuat paralel dengan baseline dan row
+    # current milik baseline; hanya id tanpa baseline yang menunggu audit.
+    with track_phase("report_schema"):
+        _ensure_schema(audit_db)
+    audits_future = _submit(_load_audits_isolated, date_from, date_to, user_id)
+    baselines = _load_baselines(audit_db)
+    current_rows = _get_current_rows(mysql_db, baselines) if with_current_rows else {}
+    audits = audits_future.result()
 
-        odist_audits = grouped_audits.get(odist_id, [])
-        owners: Dict[str, Dict[str, Any]] = {}
-        for field in active_fields:
-            owner = _find_field_owner(field, current_row.get(field), odist_audits)
-            owner_key = (
-                f"USER:{owner['user_id']}"
-                if owner is not None
-                else "UNTRACKED"
+    current_rows.update(
+        _get_current_rows(mysql_db, core.missing_baseline_ids(baselines, audits))
+    )
+    baselines = _insert_missing_baselines(audit_db, baselines, audits, current_rows)
+    return audits, baselines, current_rows
+
+
+def _data_version(mysql_db: Session, audit_db: Session) -> tuple:
+    # Versi murah untuk key cache report: audit baru menaikkan MAX(audit_id),
+    # baseline baru menambah jumlah baseline, dan edit/refresh ODIST menaikkan
+    # watermark updated_at/dwh_refreshed_at di MySQL.
+    with track_phase("report_schema"):
+        _ensure_schema(audit_db)
+    with track_phase("report_version"):
+        audit_row = audit_db.execute(
+            text(
+                """
+                SELECT
+                    (SELECT MAX(audit_id) FROM [tools].[odists_parsing_audit_log])
+                        AS max_audit_id,
+                    (SELECT COUNT_BIG(*) FROM [tools].[odists_parsing_baseline])
+                        AS baseline_count
+                """
             )
-            owner_bucket = owners.setdefault(
-                owner_key,
-                {
-                    "owner": owner,
-                    "fields": [],
-                },
+        ).mappings().one()
+        # Subquery per kolom supaya tiap MAX dibaca dari ujung index-nya
+        # (sql/20260809_odists_watermark_indexes.sql).
+        mysql_row = mysql_db.execute(
+            text(
+                f"""
+                SELECT (SELECT MAX(`updated_at`) FROM `{ODISTS_TABLE}`) AS updated_at,
+                       (SELECT MAX(`dwh_refreshed_at`) FROM `{ODISTS_TABLE}`)
+                           AS dwh_refreshed_at
+                """
             )
-            owner_bucket["fields"].append(field)
+        ).mappings().one()
+    return (
+        audit_row["max_audit_id"],
+        audit_row["baseline_count"],
+        mysql_row["updated_at"],
+        mysql_row["dwh_refreshed_at"],
+    )
 
-        global_status = _classify_fields(active_fields)
-        global_revision_fields = [
-            field for field in active_fields if field in REVISION_FIELDS
-        ]
 
-        for owner_bucket in owners.values():
-            owner = owner_bucket["owner"]
-            owned_fields = owner_bucket["fields"]
-            owned_revision_fields = [
-                field for field in owned_fields if field in REVISION_FIELDS
-            ]
-            member_audits = (
-                [
-                    audit
-                    for audit in odist_audits
-                    if int(audit["user_id"]) == int(owner["user_id"])
-                ]
-                if owner is not None
-                else []
-            )
-            member_status = _classify_fields(owned_fields)
-
-            details.append(
-                {
-                    "odist_id": odist_id,
-                    "member_user_id": int(owner["user_id"]) if owner else None,
-                    "member_name": owner["actor_full_name"] if owner else "UNTRACKED",
-                    "username": owner["username"] if owner else "-",
-                    "status": member_status,
-                    "global_status": global_status,
-                    "original_ogal_id": baseline_values.get("ogal_id"),
-                    "current_ogal_id": current_row.get("ogal_id"),
-                    "active_revision_fields": global_revision_fields,
-                    "owned_revision_fields": owned_revision_fields,
-                    "owned_fields": owned_fields,
-                    "cust_name": current_row.get("cust_name"),
-                    "address": current_row.get("address"),
-                    "city": current_row.get("city"),
-                    "province": current_row.get("province"),
-                    "first_edited_at": _iso(
-                        member_audits[0]["changed_at"] if member_audits else None
-                    ),
-                    "last_edited_at": _iso(
-                        member_audits[-1]["changed_at"] if member_audits else None
-                    ),
-                    "total_actions": len(member_audits),
-                    "baseline_source": baseline["source"],
-                    "is_untracked": owner is None,
-                }
-            )
+def _load_report_inputs(
+    mysql_db: Session,
+    audit_db: Session,
+    version: Optional[tuple] = None,
+    with_current_rows: bool = True,
+) -> tuple[
+    List[Dict[str, Any]],
+    Dict[int, Dict[str, Any]],
+    Dict[int, Dict[str, Any]],
+]:
+    # Audit lengkap (tanpa filter), baseline dan row current; dipakai bersama
+    # oleh summary, effective dan history. Entry cache selalu memuat row
+    # current, with_current_rows hanya berlaku saat cache nonaktif.
+    if not report_cache.enabled:
+        return _load_audits_and_baselines(
+            mysql_db,
+            audit_db,
+            with_current_rows=with_current_rows,
+        )
+    if version is None:
+        version = _data_version(mysql_db, audit_db)
+    return report_cache.get_or_build(
+        ("inputs", version),
+        lambda: _build_report_inputs(mysql_db, audit_db),
+        kind="inputs",
+    )
 
-    details.sort(
-        key=lambda item: (
-            item.get("last_edited_at") or "",
-            item["odist_id"],
-        ),
-        reverse=True,
+
+def _build_report_inputs(
+    mysql_db: Session,
+    audit_db: Session,
+) -> tuple[
+    List[Dict[str, Any]],
+    Dict[int, Dict[str, Any]],
+    Dict[int, Dict[str, Any]],
+]:
+    # Entry disimpan di bawah versi yang baru dibaca; mirror dipaksa poll
+    # dulu supaya row current tidak lebih tua dari watermark versi tersebut
+    # (poll berkala bisa tertinggal sampai ODISTS_MIRROR_POLL_SECONDS).
+    if settings.ODISTS_MIRROR_ENABLED:
+        current_row_mirror.refresh(mysql_db, force=True)
+    return _load_audits_and_baselines(mysql_db, audit_db)
+
+
+def _build_effective_details(
+    mysql_db: Session,
+    audit_db: Session,
+) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+    if not report_cache.enabled:
+        return _compute_effective_details(mysql_db, audit_db)
+    version = _data_version(mysql_db, audit_db)
+    return report_cache.get_or_build(
+        ("details", version),
+        lambda: _compute_effective_details(mysql_db, audit_db, version),
+        kind="details",
     )
+
+
+def _compute_effective_details(
+    mysql_db: Session,
+    audit_db: Session,
+    version: Optional[tuple] = None,
+) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+    audits, baselines, current_rows = _load_report_inputs(mysql_db, audit_db, version)
+    with track_phase("report_compute"):
+        details = core.compute_effective_details(audits, baselines, current_rows)
     return details, audits, baselines
 
 
@@ -475,123 +519,15 @@ def get_summary(
     user_id: Optional[int] = None,
 ) -> Dict[str, Any]:
     details, all_audits, baselines = _build_effective_details(mysql_db, audit_db)
-
-    summary_by_member: Dict[str, Dict[str, Any]] = {}
-    member_options: Dict[str, Dict[str, Any]] = {}
-
-    for audit in all_audits:
-        key = str(audit["user_id"])
-        member_options[key] = {
-            "user_id": int(audit["user_id"]),
-            "member_name": audit["actor_full_name"],
-            "username": audit["username"],
-        }
-
-    for detail in details:
-        member_key = (
-            str(detail["member_user_id"])
-            if detail["member_user_id"] is not None
-            else "UNTRACKED"
-        )
-        member_options.setdefault(
-            member_key,
-            {
-                "user_id": detail["member_user_id"],
-                "member_name": detail["member_name"],
-                "username": detail["username"],
-            },
-        )
-        bucket = summary_by_member.setdefault(
-            member_key,
-            {
-                "user_id": detail["member_user_id"],
-                "member_name": detail["member_name"],
-                "username": detail["username"],
-                "active_parsing_rows": 0,
-                "active_revision_rows": 0,
-                "active_parsing_revision_rows": 0,
-                "active_revised_fields": 0,
-                "total_edit_activities": 0,
-                "reverted_activities": 0,
-                "partial_revert_activities": 0,
-            },
-        )
-        if detail["status"] in {"PARSING", "PARSING & REVISI DATA"}:
-            bucket["active_parsing_rows"] += 1
-        if detail["status"] in {"REVISI DATA", "PARSING & REVISI DATA"}:
-            bucket["active_revision_rows"] += 1
-        if detail["status"] == "PARSING & REVISI DATA":
-            bucket["active_parsing_revision_rows"] += 1
-        bucket["active_revised_fields"] += len(detail["owned_revision_fields"])
-
-    activity_audits = [
-        audit
-        for audit in all_audits
-        if (date_from is None or audit["changed_at"] >= date_from)
-        and (
-            date_to is None
-            or audit["changed_at"].date() <= date_to.date()
-        )
-    ]
-    for audit in activity_audits:
-        member_key = str(audit["user_id"])
-        bucket = summary_by_member.setdefault(
-            member_key,
-            {
-                "user_id": int(audit["user_id"]),
-                "member_name": audit["actor_full_name"],
-                "username": audit["username"],
-                "active_parsing_rows": 0,
-                "active_revision_rows": 0,
-                "active_parsing_revision_rows": 0,
-                "active_revised_fields": 0,
-                "total_edit_activities": 0,
-                "reverted_activities": 0,
-                "partial_revert_activities": 0,
-            },
-        )
-        bucket["total_edit_activities"] += 1
-        baseline_values = baselines.get(int(audit["odist_id"]), {}).get("values", {})
-        revert_state = _event_revert_state(audit, baseline_values)
-        if revert_state == "REVERT":
-            bucket["reverted_activities"] += 1
-        elif revert_state == "PARTIAL REVERT":
-            bucket["partial_revert_activities"] += 1
-
-    members = list(summary_by_member.values())
-    if user_id is not None:
-        members = [member for member in members if member["user_id"] == user_id]
-    members.sort(
-        key=lambda member: (
-            member["active_parsing_rows"] + member["active_revision_rows"],
-            member["total_edit_activities"],
-            member["member_name"],
-        ),
-        reverse=True,
+    return core.summarize_members(
+        details,
+        all_audits,
+        baselines,
+        date_from=date_from,
+        date_to=date_to,
+        user_id=user_id,
     )
 
-    totals = {
-        key: sum(int(member[key]) for member in members)
-        for key in [
-            "active_parsing_rows",
-            "active_revision_rows",
-            "active_parsing_revision_rows",
-            "active_revised_fields",
-            "total_edit_activities",
-            "reverted_activities",
-            "partial_revert_activities",
-        ]
-    }
-
-    return {
-        "members": members,
-        "member_options": sorted(
-            member_options.values(),
-            key=lambda item: item["member_name"],
-        ),
-        "totals": totals,
-    }
-
 
 def get_effective_results(
     mysql_db: Session,
@@ -603,7 +539,7 @@ def get_effective_results(
     search: Optional[str] = None,
 ) -> Dict[str, Any]:
     details, _, _ = _build_effective_details(mysql_db, audit_db)
-    normalized_search = _normalize(search) if search else ""
+    normalized_search = core.normalize(search) if search else ""
 
     filtered: List[Dict[str, Any]] = []
     for detail in details:
@@ -612,8 +548,8 @@ def get_effective_results(
         if status_filter and detail["status"] != status_filter:
             continue
         if normalized_search:
-            haystack = " ".join(
-                str(detail.get(field) or "")
+            haystack = core.search_text(
+                detail.get(field)
                 for field in [
                     "odist_id",
                     "member_name",
@@ -624,21 +560,11 @@ def get_effective_results(
                     "province",
                 ]
             )
-            if normalized_search not in _normalize(haystack):
+            if normalized_search not in haystack:
                 continue
         filtered.append(detail)
 
-    page = max(page, 1)
-    page_size = min(max(page_size, 1), 200)
-    total = len(filtered)
-    offset = (page - 1) * page_size
-    return {
-        "items": filtered[offset : offset + page_size],
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": max(1, math.ceil(total / page_size)),
-    }
+    return core.paginate(filtered, page, page_size)
 
 
 def get_activity_history(
@@ -653,35 +579,37 @@ def get_activity_history(
     revert_state: Optional[str] = None,
     search: Optional[str] = None,
 ) -> Dict[str, Any]:
-    _ensure_schema(audit_db)
-    audits = _load_audits(
+    audits, baselines, _ = _load_audits_and_baselines(
+        mysql_db,
         audit_db,
         date_from=date_from,
         date_to=date_to,
         user_id=user_id,
+        with_current_rows=False,
     )
-    baselines = _ensure_baselines(mysql_db, audit_db, audits)
-    normalized_search = _normalize(search) if search else ""
+    normalized_search = core.normalize(search) if search else ""
 
     items: List[Dict[str, Any]] = []
     for audit in reversed(audits):
-        baseline_values = baselines.get(int(audit["odist_id"]), {}).get("values", {})
-        audit_revert_state = _event_revert_state(audit, baseline_values)
+        audit_revert_state = core.event_revert_state(
+            audit,
+            core.baseline_norm_values(baselines, audit["odist_id"]),
+        )
         audit_change_type = audit["change_type"]
         if change_type and audit_change_type != change_type:
             continue
         if revert_state and audit_revert_state != revert_state:
             continue
         if normalized_search:
-            haystack = " ".join(
+            haystack = core.search_text(
                 [
-                    str(audit["odist_id"]),
+                    audit["odist_id"],
                     str(audit["actor_full_name"]),
                     str(audit["username"]),
-                    " ".join(audit["changed_fields_list"]),
+                    *audit["changed_fields_list"],
                 ]
             )
-            if normalized_search not in _normalize(haystack):
+            if normalized_search not in haystack:
                 continue
 
         items.append(
@@ -696,22 +624,12 @@ def get_activity_history(
                 "changed_fields": [
                     field
                     for field in audit["changed_fields_list"]
-                    if field in TRACKED_FIELDS
+                    if field in core.TRACKED_FIELDS
                 ],
                 "old_values": audit["old_values_dict"],
                 "new_values": audit["new_values_dict"],
-                "changed_at": _iso(audit["changed_at"]),
+                "changed_at": core.iso(audit["changed_at"]),
             }
         )
 
-    page = max(page, 1)
-    page_size = min(max(page_size, 1), 200)
-    total = len(items)
-    offset = (page - 1) * page_size
-    return {
-        "items": items[offset : offset + page_size],
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": max(1, math.ceil(total / page_size)),
-    }
+    return core.paginate(items, page, page_size)
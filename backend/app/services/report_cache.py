@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from app.core.metrics import report_cache_requests_total
+
+
+# Cache hasil komputasi report per versi data (lihat
+# parsing_report_service._data_version). Entry tidak pernah diubah setelah
+# disimpan; pemanggil wajib menyalin item sebelum memodifikasinya. Build untuk
+# key yang sama hanya berjalan sekali walau ada beberapa request bersamaan.
+class ReportCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._building: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def _get_fresh(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any], kind: str) -> Any:
+        if not self.enabled:
+            return builder()
+
+        with self._lock:
+            found, value = self._get_fresh(key)
+            if found:
+                self._hits += 1
+                report_cache_requests_total.inc(kind=kind, result="hit")
+                return value
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                found, value = self._get_fresh(key)
+                if found:
+                    # Dibangun oleh request lain selagi menunggu build_lock.
+                    self._hits += 1
+                    report_cache_requests_total.inc(kind=kind, result="hit")
+                    return value
+                self._misses += 1
+            report_cache_requests_total.inc(kind=kind, result="miss")
+            try:
+                value = builder()
+                with self._lock:
+                    self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "keys": [repr(key) for key in self._entries],
+            }
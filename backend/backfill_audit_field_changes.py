@@ -0,0 +1,51 @@
+import argparse
+import sys
+
+from app.db.database import session_scope
+from app.services import audit_field_change_service, parsing_report_service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Isi tabel odists_parsing_audit_field_change dari audit log lama "
+            "atau yang baris field change-nya gagal ditulis."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=audit_field_change_service.DEFAULT_BACKFILL_CHUNK,
+        help="jumlah audit per transaksi",
+    )
+    parser.add_argument(
+        "--after-audit-id",
+        type=int,
+        default=0,
+        help="mulai setelah audit_id ini (audit yang sudah terisi selalu dilewati)",
+    )
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error("--chunk-size minimal 1")
+
+    total_audits = 0
+    total_rows = 0
+    with session_scope() as db:
+        parsing_report_service._ensure_schema(db)
+        for last_audit_id, audit_count, row_count in audit_field_change_service.backfill(
+            db,
+            chunk_size=args.chunk_size,
+            after_audit_id=args.after_audit_id,
+        ):
+            total_audits += audit_count
+            total_rows += row_count
+            print(
+                f"audit_id <= {last_audit_id}: {audit_count} audit, {row_count} baris field",
+                flush=True,
+            )
+    print(f"Backfill selesai: {total_audits} audit, {total_rows} baris field ditulis.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
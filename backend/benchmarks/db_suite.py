@@ -0,0 +1,318 @@
+"""Benchmark suite service ODIST dan report terhadap database sungguhan.
+
+Jalankan dari folder backend/ dengan .env yang mengarah ke database stand-in
+(isi dulu dengan `python -m benchmarks.datagen`):
+
+    python -m benchmarks.db_suite --iterations 50 --concurrency 4
+    python -m benchmarks.db_suite --only get_page.filtered,get_summary --json hasil.json
+    python -m benchmarks.db_suite --allow-writes --only update_rows
+    python -m benchmarks.db_suite --only get_summary --no-report-cache
+    python -m benchmarks.db_suite --allow-writes --only claim_next --concurrency 8
+
+Skenario update_rows menulis ke MySQL dan audit log, claim_next menulis tabel
+klaim odists_claim, jadi keduanya hanya jalan dengan --allow-writes. Jangan arahkan ke database produksi.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+
+from benchmarks.common import bootstrap, print_table, summarize_latencies
+
+bootstrap()
+
+from sqlalchemy import text  # noqa: E402
+
+from app.db.database import (  # noqa: E402
+    mysql_pipeline_async_session_scope,
+    mysql_pipeline_session_scope,
+    session_scope,
+)
+from app.models.app_user import AppUser  # noqa: E402
+from app.services import (  # noqa: E402
+    odists_claim_service,
+    odists_lease_service,
+    odists_parsing_service,
+    parsing_baseline_service,
+    parsing_report_filter_service,
+    parsing_report_service,
+)
+
+
+BENCH_USER = AppUser(
+    user_id=1001,
+    username="bench.parser001",
+    password_hash="!benchmark-no-login",
+    full_name="Parser Benchmark 001",
+    role="PARSER-TEAM",
+    is_active=True,
+)
+HOT_CITIES = ["JAKARTA SELATAN", "JAKARTA BARAT", "SURABAYA"]
+SEARCH_WORDS = ["MAJU", "JAYA", "SENTOSA", "BERKAH"]
+KECAMATAN_VALUES = ["TEBET", "GUBENG", "COBLONG", "KLOJEN", "WENANG"]
+
+T = TypeVar("T")
+
+
+class SuiteContext:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self._local = threading.local()
+        with mysql_pipeline_session_scope() as db:
+            row = db.execute(
+                text(f"SELECT MIN(`id`), MAX(`id`) FROM `{odists_parsing_service.TABLE_NAME}`")
+            ).one()
+        if row[0] is None:
+            raise SystemExit("Tabel ODIST kosong; isi dulu dengan benchmarks.datagen")
+        self.min_id, self.max_id = int(row[0]), int(row[1])
+        self.date_to = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.date_from = self.date_to - timedelta(days=args.report_days)
+        # Pool async terikat ke satu event loop, jadi skenario async dari
+        # semua worker dijalankan di loop bersama ini.
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+
+    def run_async(self, coroutine: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    @property
+    def rng(self) -> random.Random:
+        # Satu RNG per thread agar urutan acak tetap deterministik per worker.
+        rng = getattr(self._local, "rng", None)
+        if rng is None:
+            rng = random.Random(f"{self.args.seed}-{threading.get_ident()}")
+            self._local.rng = rng
+        return rng
+
+    def random_page(self) -> int:
+        return 1 + int(self.args.max_page * self.rng.random() ** 2)
+
+
+async def _get_page(*args: Any) -> None:
+    async with mysql_pipeline_async_session_scope() as db:
+        await odists_parsing_service.get_page_async(db, *args)
+
+
+def _get_page_default(ctx: SuiteContext) -> None:
+    ctx.run_async(_get_page(ctx.random_page(), 50, None, None, "id", "asc"))
+
+
+def _get_page_filtered(ctx: SuiteContext) -> None:
+    filters = {
+        "city": f"__EQ__:{ctx.rng.choice(HOT_CITIES)}",
+        "ogal_id": "__NULL__",
+    }
+    ctx.run_async(
+        _get_page(ctx.random_page(), 50, None, json.dumps(filters), "updated_at", "desc")
+    )
+
+
+def _get_page_like(ctx: SuiteContext) -> None:
+    filters = {"cust_name": ctx.rng.choice(SEARCH_WORDS)}
+    ctx.run_async(
+        _get_page(ctx.random_page(), 50, None, json.dumps(filters), "cust_name", "asc")
+    )
+
+
+def _get_distinct_city(ctx: SuiteContext) -> None:
+    with mysql_pipeline_session_scope() as db:
+        odists_parsing_service.get_distinct_values(db, "city", None, None, 100)
+
+
+def _get_distinct_search(ctx: SuiteContext) -> None:
+    filters = {"city": f"__EQ__:{ctx.rng.choice(HOT_CITIES)}"}
+    with mysql_pipeline_session_scope() as db:
+        odists_parsing_service.get_distinct_values(
+            db, "cust_name", ctx.rng.choice(SEARCH_WORDS), json.dumps(filters), 100
+        )
+
+
+def _update_rows(ctx: SuiteContext) -> None:
+    ids = {
+        ctx.rng.randint(ctx.min_id, ctx.max_id)
+        for _ in range(ctx.args.update_batch)
+    }
+    items = [
+        {"id": odist_id, "values": {"kecamatan": ctx.rng.choice(KECAMATAN_VALUES)}}
+        for odist_id in sorted(ids)
+    ]
+    ctx.run_async(_update_rows_async(items))
+
+
+async def _update_rows_async(items: List[Dict[str, Any]]) -> None:
+    # Urutan sama dengan router PUT /batch.
+    with session_scope() as audit_db:
+        async with mysql_pipeline_async_session_scope() as mysql_db:
+            metadata = await odists_parsing_service.precheck_update_async(
+                mysql_db, items, BENCH_USER
+            )
+            await parsing_baseline_service.ensure_baselines_before_update_async(
+                mysql_db=mysql_db,
+                audit_db=audit_db,
+                odist_ids=[item["id"] for item in items],
+            )
+            await odists_parsing_service.update_rows_async(
+                mysql_db, audit_db, items, BENCH_USER, metadata=metadata
+            )
+
+
+def _claim_next(ctx: SuiteContext) -> None:
+    # Tiap worker pakai user sendiri supaya klaim paralel saling bersaing
+    # seperti beberapa parser; klaim dan lease dilepas lagi agar antrian tidak
+    # habis.
+    worker_user = AppUser(
+        **{**BENCH_USER.dict(), "user_id": 2000 + threading.get_ident() % 1000}
+    )
+    with mysql_pipeline_session_scope() as db:
+        result = odists_parsing_service.claim_next(db, worker_user, ctx.args.claim_batch)
+        odists_claim_service.release(db, result["leases"], worker_user)
+    odists_lease_service.lease_store.release(result["leases"], worker_user)
+
+
+def _get_summary(ctx: SuiteContext) -> None:
+    with mysql_pipeline_session_scope() as mysql_db, session_scope() as audit_db:
+        parsing_report_service.get_summary(
+            mysql_db=mysql_db,
+            audit_db=audit_db,
+            date_from=ctx.date_from,
+            date_to=ctx.date_to,
+        )
+
+
+def _get_effective_results(ctx: SuiteContext) -> None:
+    with mysql_pipeline_session_scope() as mysql_db, session_scope() as audit_db:
+        parsing_report_filter_service.get_effective_results(
+            mysql_db=mysql_db,
+            audit_db=audit_db,
+            page=ctx.rng.randint(1, 5),
+            page_size=50,
+            sort_by="last_edited_at",
+            sort_dir="desc",
+        )
+
+
+def _get_activity_history(ctx: SuiteContext) -> None:
+    with mysql_pipeline_session_scope() as mysql_db, session_scope() as audit_db:
+        parsing_report_filter_service.get_activity_history(
+            mysql_db=mysql_db,
+            audit_db=audit_db,
+            page=ctx.rng.randint(1, 5),
+            page_size=50,
+            date_from=ctx.date_from,
+            date_to=ctx.date_to,
+            sort_by="changed_at",
+            sort_dir="desc",
+        )
+
+
+SCENARIOS: Dict[str, Callable[[SuiteContext], None]] = {
+    "get_page.default": _get_page_default,
+    "get_page.filtered": _get_page_filtered,
+    "get_page.like": _get_page_like,
+    "get_distinct_values.city": _get_distinct_city,
+    "get_distinct_values.search": _get_distinct_search,
+    "update_rows": _update_rows,
+    "claim_next": _claim_next,
+    "get_summary": _get_summary,
+    "get_effective_results": _get_effective_results,
+    "get_activity_history": _get_activity_history,
+}
+WRITE_SCENARIOS = {"update_rows", "claim_next"}
+
+
+def run_scenario(
+    ctx: SuiteContext,
+    scenario: Callable[[SuiteContext], None],
+    iterations: int,
+    warmup: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    for _ in range(warmup):
+        scenario(ctx)
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def _one(_: int) -> None:
+        started = time.perf_counter()
+        try:
+            scenario(ctx)
+        except Exception as error:
+            with lock:
+                errors.append(f"{type(error).__name__}: {error}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(_one, range(iterations)))
+    wall_seconds = time.perf_counter() - started
+
+    return {
+        **summarize_latencies(latencies),
+        "ops_per_s": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0,
+        "errors": len(errors),
+        "first_error": errors[0][:120] if errors else "",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--only", help="daftar skenario dipisah koma")
+    parser.add_argument("--allow-writes", action="store_true")
+    parser.add_argument("--update-batch", type=int, default=5)
+    parser.add_argument("--claim-batch", type=int, default=10)
+    parser.add_argument("--max-page", type=int, default=200)
+    parser.add_argument("--report-days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=20260805)
+    parser.add_argument("--no-report-cache", action="store_true",
+                        help="ukur komputasi report tanpa cache versi data")
+    parser.add_argument("--json", dest="json_path", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    if args.no_report_cache:
+        parsing_report_service.report_cache.ttl_seconds = 0
+
+    selected = [name.strip() for name in args.only.split(",")] if args.only else list(SCENARIOS)
+    unknown = [name for name in selected if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"skenario tidak dikenal: {', '.join(unknown)}")
+    if not args.allow_writes:
+        selected = [name for name in selected if name not in WRITE_SCENARIOS]
+
+    ctx = SuiteContext(args)
+    results = []
+    for name in selected:
+        result = run_scenario(ctx, SCENARIOS[name], args.iterations, args.warmup, args.concurrency)
+        results.append({"scenario": name, **result})
+        print(f"{name}: p50={result['p50_ms']} ms p95={result['p95_ms']} ms", flush=True)
+
+    print()
+    print(f"iterations={args.iterations} concurrency={args.concurrency} id={ctx.min_id}..{ctx.max_id}")
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "generated_at": datetime.now().isoformat(timespec="seconds"),
+                    "args": vars(args),
+                    "results": results,
+                },
+                handle,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark login burst: bcrypt inline di thread request vs process pool.
+
+Jalankan dari folder backend/:
+
+    python -m benchmarks.login_throughput --logins 64 --concurrency 16 --workers 2
+
+Selama burst login, sebuah probe mensimulasikan request grid ringan (serialisasi
+satu halaman JSON) setiap beberapa milidetik; latensi probe menunjukkan seberapa
+besar bcrypt mengganggu request lain.
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from benchmarks.common import bootstrap, print_table, summarize_latencies
+
+bootstrap()
+
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+PASSWORD = "benchmark-password"
+PROBE_PAGE = [
+    {"id": index, "cust_name": f"TOKO {index}", "address": "JL. MERDEKA NO. 1" * 3}
+    for index in range(200)
+]
+
+
+def _probe_loop(stop: threading.Event, latencies: List[float], interval: float) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        json.loads(json.dumps(PROBE_PAGE))
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(interval)
+
+
+def _run_burst(
+    verify: Callable[[str, str], bool],
+    password_hash: str,
+    logins: int,
+    concurrency: int,
+) -> Dict[str, object]:
+    probe_latencies: List[float] = []
+    login_latencies: List[float] = []
+    stop = threading.Event()
+    probe = threading.Thread(
+        target=_probe_loop,
+        args=(stop, probe_latencies, 0.005),
+        daemon=True,
+    )
+
+    def _login() -> None:
+        started = time.perf_counter()
+        if not verify(PASSWORD, password_hash):
+            raise RuntimeError("Verifikasi password gagal")
+        login_latencies.append((time.perf_counter() - started) * 1000)
+
+    probe.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(_login) for _ in range(logins)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    probe.join()
+
+    login_summary = summarize_latencies(login_latencies)
+    probe_summary = summarize_latencies(probe_latencies)
+    return {
+        "logins_per_sec": round(logins / elapsed, 2),
+        "login_p50_ms": login_summary["p50_ms"],
+        "login_p95_ms": login_summary["p95_ms"],
+        "probe_p50_ms": probe_summary["p50_ms"],
+        "probe_p99_ms": probe_summary["p99_ms"],
+        "probe_max_ms": probe_summary["max_ms"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS or 2)
+    args = parser.parse_args()
+
+    settings.PASSWORD_HASH_WORKERS = args.workers
+    settings.PASSWORD_HASH_MAX_PENDING = max(args.logins, settings.PASSWORD_HASH_MAX_PENDING)
+    password_hash = security.password_context.hash(PASSWORD)
+
+    rows = []
+    inline = _run_burst(
+        security.password_context.verify,
+        password_hash,
+        args.logins,
+        args.concurrency,
+    )
+    rows.append({"mode": "inline", **inline})
+
+    security.warm_password_executor()
+    try:
+        pooled = _run_burst(
+            security.verify_password,
+            password_hash,
+            args.logins,
+            args.concurrency,
+        )
+    finally:
+        stats = security.password_executor_stats()
+        security.shutdown_password_executor()
+    rows.append({"mode": f"process_pool[{args.workers}]", **pooled})
+
+    print_table(rows)
+    print()
+    print("pool stats:", json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
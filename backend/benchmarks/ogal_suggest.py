@@ -0,0 +1,189 @@
+"""Benchmark index saran ogal_id (app.services.ogal_suggestion) tanpa database.
+
+Outlet sintetis (nama + alamat dari benchmarks.datagen, ditambah nama pemilik
+supaya variasinya mendekati data asli) masing-masing punya satu ogal_id dan
+muncul di beberapa row dengan penulisan berbeda (singkatan, typo, tanda baca,
+RT/RW hilang). Index dibangun dari row tersebut, lalu varian baru dari outlet
+acak dipakai sebagai query:
+
+    python -m benchmarks.ogal_suggest
+    python -m benchmarks.ogal_suggest --sizes 100000,1000000,3000000 --queries 1000
+    python -m benchmarks.ogal_suggest --sizes 1000000 --memory --json ogal.json
+
+Yang diukur: waktu build penuh (termasuk finalize norm), latensi query
+(p50/p95/p99), recall@1 dan recall@limit terhadap ogal_id outlet asal, waktu
+update incremental per row, dan (opsional, lambat) puncak memori build.
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import bootstrap, print_table, summarize_latencies
+
+bootstrap()
+
+from benchmarks import datagen  # noqa: E402
+from app.services.ogal_suggestion import (  # noqa: E402
+    DEFAULT_CANDIDATES,
+    DEFAULT_POSTING_BUDGET,
+    TrigramOgalIndex,
+    document_text,
+)
+
+
+SYLLABLES = ["BU", "DI", "SI", "TI", "WA", "RO", "NA", "JO", "KO", "HA", "YA", "MI", "SU", "AN", "TO", "RI"]
+ABBREVIATIONS = [("TOKO", "TK"), ("JL.", "JALAN"), ("NO.", "NO"), ("APOTEK", "APT"), ("WARUNG", "WR")]
+
+
+def _outlet(rng: random.Random, index: int) -> Dict[str, str]:
+    owner = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+    _, _, districts = rng.choice(datagen.REGIONS)
+    return {
+        "ogal_id": f"OG{index:08d}",
+        "cust_name": f"{datagen._customer_name(rng)} {owner}",
+        "address": f"{datagen._address(rng)} {rng.choice(districts)}",
+    }
+
+
+def _typo(rng: random.Random, value: str) -> str:
+    if len(value) < 4:
+        return value
+    position = rng.randrange(1, len(value) - 1)
+    if rng.random() < 0.5:
+        return value[:position] + value[position + 1:]
+    return value[:position] + value[position + 1] + value[position] + value[position + 2:]
+
+
+def _variant(rng: random.Random, outlet: Dict[str, str]) -> Tuple[str, str]:
+    name, address = outlet["cust_name"], outlet["address"]
+    for original, replacement in ABBREVIATIONS:
+        if rng.random() < 0.3:
+            name = name.replace(original, replacement)
+            address = address.replace(original, replacement)
+    if rng.random() < 0.3:
+        address = address.split(" RT ")[0]
+    if rng.random() < 0.2:
+        name = _typo(rng, name)
+    if rng.random() < 0.2:
+        address = _typo(rng, address)
+    return name, address
+
+
+def generate_rows(
+    rows: int,
+    rows_per_outlet: float,
+    seed: int,
+) -> Tuple[List[Dict[str, str]], List[Tuple[int, str, str, str]]]:
+    rng = random.Random(seed)
+    outlets = [_outlet(rng, index) for index in range(1, max(1, int(rows / rows_per_outlet)) + 1)]
+    data = []
+    for odist_id in range(1, rows + 1):
+        outlet = rng.choice(outlets)
+        name, address = _variant(rng, outlet)
+        data.append((odist_id, outlet["ogal_id"], name, address))
+    return outlets, data
+
+
+def run_size(size: int, args: argparse.Namespace) -> Dict[str, Any]:
+    outlets, data = generate_rows(size, args.rows_per_outlet, args.seed)
+
+    if args.memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    index = TrigramOgalIndex(posting_budget=args.posting_budget, candidates=args.candidates)
+    for odist_id, ogal_id, name, address in data:
+        index.add_row(odist_id, ogal_id, name, address, compute_norm=False)
+    index.finalize()
+    build_seconds = time.perf_counter() - started
+    peak_mb = None
+    if args.memory:
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+    del data
+
+    rng = random.Random(args.seed + 1)
+    latencies: List[float] = []
+    top1 = topk = 0
+    for _ in range(args.queries):
+        outlet = rng.choice(outlets)
+        name, address = _variant(rng, outlet)
+        document = document_text(name, address)
+        started = time.perf_counter()
+        items = index.search(document, args.limit)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found = [item["ogal_id"] for item in items]
+        top1 += bool(found) and found[0] == outlet["ogal_id"]
+        topk += outlet["ogal_id"] in found
+
+    # Update incremental: row baru selesai di-parse (dokumen baru + norm).
+    update_count = min(args.queries, 1000)
+    started = time.perf_counter()
+    for offset in range(update_count):
+        outlet = rng.choice(outlets)
+        name, address = _variant(rng, outlet)
+        index.add_row(size + offset + 1, outlet["ogal_id"], name, address)
+    update_us = (time.perf_counter() - started) / update_count * 1_000_000
+
+    stats = index.stats()
+    return {
+        "rows": size,
+        "documents": stats["documents"],
+        "trigrams": stats["trigrams"],
+        "build_s": round(build_seconds, 2),
+        "peak_mb": peak_mb,
+        **summarize_latencies(latencies),
+        "recall@1": round(top1 / args.queries, 3),
+        f"recall@{args.limit}": round(topk / args.queries, 3),
+        "update_us": round(update_us, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000",
+                        help="jumlah row ter-parse di index, dipisah koma (mis. 1000000,3000000)")
+    parser.add_argument("--rows-per-outlet", type=float, default=3.0,
+                        help="rata-rata row (varian penulisan) per outlet/ogal_id")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--posting-budget", type=int, default=DEFAULT_POSTING_BUDGET,
+                        help="jumlah posting maksimum yang dihitung per query (tahap kandidat)")
+    parser.add_argument("--candidates", type=int, default=DEFAULT_CANDIDATES,
+                        help="jumlah kandidat yang diberi skor cosine penuh")
+    parser.add_argument("--seed", type=int, default=20260805)
+    parser.add_argument("--memory", action="store_true", help="ukur puncak memori build (tracemalloc, lambat)")
+    parser.add_argument("--json", dest="json_path", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    sizes = [int(value.replace("_", "")) for value in args.sizes.split(",") if value.strip()]
+    results = []
+    for size in sizes:
+        result = run_size(size, args)
+        results.append(result)
+        print(
+            f"size={size}: build {result['build_s']} s, query p95 {result['p95_ms']} ms, "
+            f"recall@1 {result['recall@1']}",
+            flush=True,
+        )
+
+    print()
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "generated_at": datetime.now().isoformat(timespec="seconds"),
+                    "args": vars(args),
+                    "results": results,
+                },
+                handle,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
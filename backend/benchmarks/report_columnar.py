@@ -0,0 +1,339 @@
+# Engine kolumnar (pandas) untuk effective results dan revert state, hanya
+# sebagai pembanding di benchmarks.report_engines. Hasilnya harus identik
+# dengan parsing_report_core. Tidak dipakai di produksi: di pengukuran kami
+# engine ini tidak lebih cepat dari parsing_report_core (membangun dict hasil
+# mendominasi kedua engine). pandas tidak termasuk requirements.txt.
+import importlib
+import importlib.util
+from typing import Any, Dict, List, Optional
+
+from app.services import parsing_report_core as core
+
+
+_FIELD_RANK = {field: rank for rank, field in enumerate(core.TRACKED_FIELDS)}
+# Kunci gabungan (odist_id, field) sebagai satu int64 agar join/group-by
+# tidak perlu kolom string.
+_FIELD_SLOTS = 16
+# Bit 1 = ogal_id (parsing), bit 2 = field revisi; setara core.classify_fields
+# untuk field yang di-track.
+_STATUS_BY_MASK = {
+    0: "LAINNYA",
+    1: "PARSING",
+    2: "REVISI DATA",
+    3: "PARSING & REVISI DATA",
+}
+
+
+def available() -> bool:
+    return importlib.util.find_spec("pandas") is not None
+
+
+def _pandas():
+    return importlib.import_module("pandas")
+
+
+def _normalize_column(pd, values: List[Any]):
+    # Setara core.normalize, tapi tiap nilai unik cukup dinormalisasi sekali;
+    # None (kode -1 dari factorize) menjadi "".
+    np = importlib.import_module("numpy")
+    text_values = [value if value is None or type(value) is str else str(value) for value in values]
+    codes, uniques = pd.factorize(np.asarray(text_values, dtype=object))
+    normalized = np.asarray([core.normalize(value) for value in uniques] + [""], dtype=object)
+    return normalized[codes]
+
+
+class AuditFrames:
+    # Representasi kolumnar audit + baseline: satu row per (audit, field)
+    # untuk new_values dan changed_fields, plus baseline dalam bentuk long.
+    def __init__(self, audits: List[Dict[str, Any]], baselines: Dict[int, Dict[str, Any]]):
+        pd = _pandas()
+        np = importlib.import_module("numpy")
+        self.audits = audits
+        self.audit_odist = [int(audit["odist_id"]) for audit in audits]
+        self.audit_user = [int(audit["user_id"]) for audit in audits]
+        odist_array = np.asarray(self.audit_odist, dtype="int64")
+        user_array = np.asarray(self.audit_user, dtype="int64")
+        self.audit_frame = pd.DataFrame(
+            {
+                "seq": np.arange(len(audits), dtype="int64"),
+                "odist_id": odist_array,
+                "user_id": user_array,
+            }
+        )
+
+        field_rank = _FIELD_RANK
+        value_seq: List[int] = []
+        value_rank: List[int] = []
+        value_raw: List[Any] = []
+        changed_seq: List[int] = []
+        changed_rank: List[int] = []
+        for seq, audit in enumerate(audits):
+            for field, value in audit["new_values_dict"].items():
+                rank = field_rank.get(field)
+                if rank is not None:
+                    value_seq.append(seq)
+                    value_rank.append(rank)
+                    value_raw.append(value)
+            for field in audit["changed_fields_list"]:
+                rank = field_rank.get(field)
+                if rank is not None:
+                    changed_seq.append(seq)
+                    changed_rank.append(rank)
+
+        value_seq_array = np.asarray(value_seq, dtype="int64")
+        self.values = pd.DataFrame(
+            {
+                "seq": value_seq_array,
+                "key": odist_array[value_seq_array] * _FIELD_SLOTS
+                + np.asarray(value_rank, dtype="int64"),
+                "new_norm": _normalize_column(pd, value_raw),
+            }
+        )
+
+        changed_seq_array = np.asarray(changed_seq, dtype="int64")
+        self.changed = pd.DataFrame(
+            {
+                "seq": changed_seq_array,
+                "key": odist_array[changed_seq_array] * _FIELD_SLOTS
+                + np.asarray(changed_rank, dtype="int64"),
+                "user_id": user_array[changed_seq_array],
+            }
+        ).drop_duplicates(["seq", "key"])
+
+        baseline_keys: List[int] = []
+        baseline_raw: List[Any] = []
+        for odist_id, baseline in baselines.items():
+            baseline_values = baseline["values"]
+            base_key = int(odist_id) * _FIELD_SLOTS
+            for rank, field in enumerate(core.TRACKED_FIELDS):
+                baseline_keys.append(base_key + rank)
+                baseline_raw.append(baseline_values.get(field))
+        self.baselines = pd.DataFrame(
+            {
+                "key": np.asarray(baseline_keys, dtype="int64"),
+                "base_norm": _normalize_column(pd, baseline_raw),
+            }
+        )
+        self._event_states: Optional[List[str]] = None
+
+    def event_revert_states(self) -> List[str]:
+        # core.event_revert_state untuk semua audit sekaligus.
+        if self._event_states is not None:
+            return self._event_states
+        relevant = self.changed[["seq", "key"]].merge(
+            self.values[["seq", "key", "new_norm"]],
+            on=["seq", "key"],
+        )
+        relevant = relevant.merge(self.baselines, on="key", how="left")
+        relevant["returned"] = relevant["new_norm"] == relevant["base_norm"].fillna("")
+        grouped = relevant.groupby("seq")["returned"].agg(["all", "any"])
+
+        states = ["CHANGE"] * len(self.audits)
+        for seq, all_returned, any_returned in zip(
+            grouped.index.tolist(),
+            grouped["all"].tolist(),
+            grouped["any"].tolist(),
+        ):
+            if all_returned:
+                states[seq] = "REVERT"
+            elif any_returned:
+                states[seq] = "PARTIAL REVERT"
+        self._event_states = states
+        return states
+
+
+def compute_effective_details(
+    audits: List[Dict[str, Any]],
+    baselines: Dict[int, Dict[str, Any]],
+    current_rows: Dict[int, Dict[str, Any]],
+    frames: Optional[AuditFrames] = None,
+) -> List[Dict[str, Any]]:
+    pd = _pandas()
+    np = importlib.import_module("numpy")
+    if frames is None:
+        frames = AuditFrames(audits, baselines)
+
+    # ODIST yang masuk report = punya baseline dan row current (audit tanpa
+    # baseline sudah direkonstruksi sebelum tahap ini).
+    state_keys: List[int] = []
+    current_raw: List[Any] = []
+    for odist_id in sorted(baselines):
+        current_row = current_rows.get(odist_id)
+        if current_row is None:
+            continue
+        base_key = odist_id * _FIELD_SLOTS
+        for rank, field in enumerate(core.TRACKED_FIELDS):
+            state_keys.append(base_key + rank)
+            current_raw.append(current_row.get(field))
+
+    state = pd.DataFrame(
+        {
+            "key": np.asarray(state_keys, dtype="int64"),
+            "cur_norm": _normalize_column(pd, current_raw),
+        }
+    ).merge(frames.baselines, on="key", how="left")
+    active = state[state["cur_norm"] != state["base_norm"].fillna("")]
+    if active.empty:
+        return []
+
+    # Pemilik field = audit terakhir yang menulis nilai (ternormalisasi) yang
+    # sama dengan nilai current.
+    candidates = active[["key", "cur_norm"]].merge(
+        frames.values[["seq", "key", "new_norm"]],
+        on="key",
+    )
+    candidates = candidates[candidates["new_norm"] == candidates["cur_norm"]]
+    owner_seq = candidates.groupby("key")["seq"].max()
+    active_keys = active["key"].to_numpy()
+    active_owner = (
+        pd.Series(active_keys).map(owner_seq).fillna(-1).astype("int64").tolist()
+    )
+
+    member_stats = frames.audit_frame.groupby(["odist_id", "user_id"])["seq"].agg(
+        ["min", "max", "count"]
+    )
+    member_lookup = dict(
+        zip(
+            member_stats.index.tolist(),
+            zip(
+                member_stats["min"].tolist(),
+                member_stats["max"].tolist(),
+                member_stats["count"].tolist(),
+            ),
+        )
+    )
+
+    details: List[Dict[str, Any]] = []
+
+    def _flush(
+        odist_id: int,
+        active_fields: List[str],
+        active_mask: int,
+        owners: Dict[Any, Dict[str, Any]],
+    ) -> None:
+        current_row = current_rows[odist_id]
+        baseline = baselines[odist_id]
+        global_status = _STATUS_BY_MASK[active_mask]
+        global_revision_fields = [field for field in active_fields if field != "ogal_id"]
+        for owner_bucket in owners.values():
+            owner_seq_value = owner_bucket["owner_seq"]
+            owner = audits[owner_seq_value] if owner_seq_value >= 0 else None
+            owned_fields = owner_bucket["fields"]
+            first_seq, last_seq, total_actions = (
+                member_lookup.get((odist_id, int(owner["user_id"])), (None, None, 0))
+                if owner is not None
+                else (None, None, 0)
+            )
+            details.append(
+                {
+                    "odist_id": odist_id,
+                    "member_user_id": int(owner["user_id"]) if owner else None,
+                    "member_name": owner["actor_full_name"] if owner else "UNTRACKED",
+                    "username": owner["username"] if owner else "-",
+                    "status": _STATUS_BY_MASK[owner_bucket["mask"]],
+                    "global_status": global_status,
+                    "original_ogal_id": baseline["values"].get("ogal_id"),
+                    "current_ogal_id": current_row.get("ogal_id"),
+                    "active_revision_fields": global_revision_fields,
+                    "owned_revision_fields": [
+                        field for field in owned_fields if field != "ogal_id"
+                    ],
+                    "owned_fields": owned_fields,
+                    "cust_name": current_row.get("cust_name"),
+                    "address": current_row.get("address"),
+                    "city": current_row.get("city"),
+                    "province": current_row.get("province"),
+                    "first_edited_at": core.iso(
+                        audits[first_seq]["changed_at"] if first_seq is not None else None
+                    ),
+                    "last_edited_at": core.iso(
+                        audits[last_seq]["changed_at"] if last_seq is not None else None
+                    ),
+                    "total_actions": total_actions,
+                    "baseline_source": baseline["source"],
+                    "is_untracked": owner is None,
+                }
+            )
+
+    # Key terurut = urutan odist_id lalu urutan TRACKED_FIELDS, sama dengan
+    # iterasi di core.compute_effective_details.
+    previous_id: Optional[int] = None
+    active_fields: List[str] = []
+    active_mask = 0
+    owners: Dict[Any, Dict[str, Any]] = {}
+    audit_user = frames.audit_user
+    for key, owner_seq_value in zip(active_keys.tolist(), active_owner):
+        odist_id, rank = divmod(key, _FIELD_SLOTS)
+        if odist_id != previous_id:
+            if previous_id is not None:
+                _flush(previous_id, active_fields, active_mask, owners)
+            previous_id = odist_id
+            active_fields = []
+            active_mask = 0
+            owners = {}
+        field = core.TRACKED_FIELDS[rank]
+        field_mask = 1 if rank == 0 else 2
+        active_fields.append(field)
+        active_mask |= field_mask
+        owner_key = audit_user[owner_seq_value] if owner_seq_value >= 0 else None
+        owner_bucket = owners.setdefault(
+            owner_key,
+            {"owner_seq": owner_seq_value, "fields": [], "mask": 0},
+        )
+        owner_bucket["fields"].append(field)
+        owner_bucket["mask"] |= field_mask
+    if previous_id is not None:
+        _flush(previous_id, active_fields, active_mask, owners)
+
+    details.sort(
+        key=lambda item: (
+            item.get("last_edited_at") or "",
+            item["odist_id"],
+        ),
+        reverse=True,
+    )
+    return details
+
+
+def effective_revert_states(
+    details: List[Dict[str, Any]],
+    audits: List[Dict[str, Any]],
+    baselines: Dict[int, Dict[str, Any]],
+    frames: Optional[AuditFrames] = None,
+) -> List[str]:
+    # core.effective_revert_state untuk semua detail sekaligus: audit terakhir
+    # milik member pada ODIST yang menyentuh salah satu owned_fields.
+    pd = _pandas()
+    if frames is None:
+        frames = AuditFrames(audits, baselines)
+
+    positions: List[int] = []
+    owned_keys: List[int] = []
+    owned_users: List[int] = []
+    for position, detail in enumerate(details):
+        member_user_id = detail.get("member_user_id")
+        if member_user_id is None:
+            continue
+        base_key = int(detail["odist_id"]) * _FIELD_SLOTS
+        for field in detail.get("owned_fields") or []:
+            positions.append(position)
+            owned_keys.append(base_key + _FIELD_RANK[field])
+            owned_users.append(int(member_user_id))
+
+    states = ["UNTRACKED"] * len(details)
+    if not positions:
+        return states
+
+    owned = pd.DataFrame(
+        {
+            "position": pd.Series(positions, dtype="int64"),
+            "key": pd.Series(owned_keys, dtype="int64"),
+            "user_id": pd.Series(owned_users, dtype="int64"),
+        }
+    )
+    matched = owned.merge(frames.changed, on=["key", "user_id"])
+    latest = matched.groupby("position")["seq"].max()
+    event_states = frames.event_revert_states()
+    for position, seq in zip(latest.index.tolist(), latest.tolist()):
+        states[position] = event_states[seq]
+    return states
@@ -0,0 +1,296 @@
+"""Micro-benchmark inti komputasi report parsing tanpa database.
+
+Input (audit, baseline, row current) dibangkitkan di memori dengan generator
+yang sama dengan benchmarks.datagen, lalu tiap tahap di
+app.services.parsing_report_core diukur waktu dan puncak memorinya
+(tracemalloc, hanya alokasi baru selama tahap berjalan):
+
+    python -m benchmarks.report_core
+    python -m benchmarks.report_core --sizes 10000,100000,1000000 --json core.json
+    python -m benchmarks.report_core --sizes 10000000 --no-memory
+    python -m benchmarks.report_core --normalize-cache 0   # bandingkan tanpa cache
+
+Ukuran = jumlah audit. 10 juta audit butuh RAM puluhan GB; jalankan di mesin
+yang cukup besar dan pakai --no-memory karena tracemalloc memperlambat tahap
+yang banyak alokasi.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.common import bootstrap, print_table
+
+bootstrap()
+
+from benchmarks import datagen  # noqa: E402
+from app.services import parsing_report_core as core  # noqa: E402
+from app.services.parsing_report_service import CURRENT_ROW_FIELDS  # noqa: E402
+
+
+def generate_inputs(target_audits: int, args: argparse.Namespace) -> Dict[str, Any]:
+    # Semua row yang dibangkitkan berstatus "diedit" supaya jumlah audit
+    # mencapai target; row tanpa audit/baseline tidak masuk report.
+    options = argparse.Namespace(
+        rows=target_audits,
+        start_id=1,
+        users=args.users,
+        distributors=args.distributors,
+        edited_fraction=1.0,
+        baseline_fraction=args.baseline_fraction,
+        max_edits_per_row=args.max_edits_per_row,
+        skew=args.skew,
+        days=args.days,
+        seed=args.seed,
+    )
+    raw_audits: List[Dict[str, Any]] = []
+    raw_baselines: List[Dict[str, Any]] = []
+    current_rows: Dict[int, Dict[str, Any]] = {}
+    for table, record in datagen.generate(options):
+        if table == "odists_parsing_audit_log":
+            raw_audits.append(record)
+        elif table == "odists_parsing_baseline":
+            raw_baselines.append(
+                {
+                    **record,
+                    "baseline_created_at": None,
+                    "baseline_updated_at": None,
+                }
+            )
+        elif table == "gold_odists_parsing_manual":
+            current_rows[record["id"]] = {field: record.get(field) for field in CURRENT_ROW_FIELDS}
+            if len(raw_audits) >= target_audits:
+                break
+
+    # Urutan sama dengan _query_audits: changed_at lalu audit_id.
+    raw_audits.sort(key=lambda audit: audit["changed_at"])
+    for audit_id, audit in enumerate(raw_audits, start=1):
+        audit["audit_id"] = audit_id
+    return {
+        "raw_audits": raw_audits,
+        "raw_baselines": raw_baselines,
+        "current_rows": current_rows,
+        "now": datetime.now().replace(microsecond=0),
+    }
+
+
+def _parse_audits(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    state["audits"] = [core.parse_audit_row(row) for row in state["raw_audits"]]
+    return state["audits"]
+
+
+def _parse_baselines(state: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+    state["baselines"] = {
+        int(row["odist_id"]): core.parse_baseline_row(row)
+        for row in state["raw_baselines"]
+    }
+    return state["baselines"]
+
+
+def _group_audits(state: Dict[str, Any]) -> Dict[int, List[Dict[str, Any]]]:
+    state["grouped"] = core.group_audits_by_odist(state["audits"])
+    return state["grouped"]
+
+
+def _reconstruct_baselines(state: Dict[str, Any]) -> List[int]:
+    # Bagian murni dari _write_missing_baselines (tanpa INSERT).
+    missing_ids = core.missing_baseline_ids(state["baselines"], state["audits"])
+    reconstructed: Dict[int, Dict[str, Any]] = {}
+    for odist_id in missing_ids:
+        current_row = state["current_rows"].get(odist_id)
+        if current_row is None:
+            continue
+        reconstructed[odist_id] = core.make_baseline(
+            core.reconstruct_original_values(
+                current_row,
+                (audit["old_values_dict"] for audit in state["grouped"].get(odist_id, [])),
+            ),
+            "RECONSTRUCTED_FROM_FIRST_AUDIT",
+        )
+    state["baselines"] = {**state["baselines"], **reconstructed}
+    return missing_ids
+
+
+def _effective_details(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    state["details"] = core.compute_effective_details(
+        state["audits"],
+        state["baselines"],
+        state["current_rows"],
+        grouped_audits=state["grouped"],
+    )
+    return state["details"]
+
+
+def _effective_filter(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    state["filtered"] = core.filter_effective_details(
+        state["details"],
+        state["audits"],
+        state["baselines"],
+        grouped_audits=state["grouped"],
+    )
+    return state["filtered"]
+
+
+def _effective_sort(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return core.sort_items(
+        state["filtered"],
+        "last_edited_at",
+        "desc",
+        core.EFFECTIVE_SORT_ACCESSORS,
+        "last_edited_at",
+    )
+
+
+def _summary(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = core.summarize_members(
+        state["details"],
+        state["audits"],
+        state["baselines"],
+        date_from=state["now"] - timedelta(days=30),
+        date_to=state["now"],
+    )
+    return result["members"]
+
+
+def _history(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    state["history"] = core.build_history_items(
+        state["audits"],
+        state["baselines"],
+        date_from=state["now"] - timedelta(days=30),
+        date_to=state["now"],
+    )
+    return state["history"]
+
+
+def _history_sort(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return core.sort_items(
+        state["history"],
+        "changed_at",
+        "desc",
+        core.HISTORY_SORT_ACCESSORS,
+        "changed_at",
+    )
+
+
+# Urutan tahap mengikuti alur get_summary / get_effective_results /
+# get_activity_history; tahap berikutnya memakai output tahap sebelumnya.
+STAGES: List[Tuple[str, Callable[[Dict[str, Any]], Any]]] = [
+    ("parse_audits", _parse_audits),
+    ("parse_baselines", _parse_baselines),
+    ("group_audits", _group_audits),
+    ("reconstruct_baselines", _reconstruct_baselines),
+    ("effective_details", _effective_details),
+    ("effective_filter", _effective_filter),
+    ("effective_sort", _effective_sort),
+    ("summary", _summary),
+    ("history", _history),
+    ("history_sort", _history_sort),
+]
+
+
+def run_stage(
+    stage: Callable[[Dict[str, Any]], Any],
+    state: Dict[str, Any],
+    measure_memory: bool,
+) -> Dict[str, Any]:
+    snapshot = dict(state)
+    cache_before = core.normalize_cache_stats()
+    started = time.perf_counter()
+    output = stage(state)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    cache_after = core.normalize_cache_stats()
+
+    hit_rate: Any = "-"
+    if cache_after["enabled"]:
+        hits = cache_after["hits"] - cache_before["hits"]
+        lookups = hits + cache_after["misses"] - cache_before["misses"]
+        hit_rate = round(hits / lookups, 3) if lookups else "-"
+
+    peak_mb = None
+    if measure_memory:
+        # Dijalankan ulang di salinan state supaya overhead tracemalloc tidak
+        # ikut ke angka waktu.
+        tracemalloc.start()
+        try:
+            stage(dict(snapshot))
+            peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+    return {
+        "ms": round(elapsed_ms, 2),
+        "peak_mb": peak_mb if peak_mb is not None else "-",
+        "items": len(output),
+        "cache_hit_rate": hit_rate,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000",
+                        help="jumlah audit per run, dipisah koma (mis. 10000,1000000,10000000)")
+    parser.add_argument("--users", type=int, default=25)
+    parser.add_argument("--distributors", type=int, default=400)
+    parser.add_argument("--baseline-fraction", type=float, default=0.7)
+    parser.add_argument("--max-edits-per-row", type=int, default=12)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=20260805)
+    parser.add_argument("--only", help="daftar tahap dipisah koma (tahap sebelumnya tetap dijalankan)")
+    parser.add_argument("--no-memory", action="store_true", help="lewati pengukuran tracemalloc")
+    parser.add_argument("--normalize-cache", type=int,
+                        help="ukuran cache normalisasi (0 = tanpa cache); default dari settings")
+    parser.add_argument("--json", dest="json_path", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    sizes = [int(value.replace("_", "")) for value in args.sizes.split(",") if value.strip()]
+    stage_names = [name for name, _ in STAGES]
+    selected = [name.strip() for name in args.only.split(",")] if args.only else stage_names
+    unknown = [name for name in selected if name not in stage_names]
+    if unknown:
+        parser.error(f"tahap tidak dikenal: {', '.join(unknown)}")
+
+    if args.normalize_cache is not None:
+        core.configure_normalize_cache(args.normalize_cache)
+
+    results = []
+    for size in sizes:
+        # Tiap ukuran mulai dari cache kosong; di dalam satu ukuran cache tetap
+        # hangat antar tahap seperti antar request di satu proses.
+        core.clear_normalize_cache()
+        started = time.perf_counter()
+        state = generate_inputs(size, args)
+        print(
+            f"size={size}: {len(state['raw_audits'])} audit, "
+            f"{len(state['raw_baselines'])} baseline, {len(state['current_rows'])} row "
+            f"(generate {time.perf_counter() - started:.1f} s)",
+            flush=True,
+        )
+        for name, stage in STAGES:
+            if name not in selected:
+                stage(state)
+                continue
+            result = run_stage(stage, state, measure_memory=not args.no_memory)
+            results.append({"size": size, "stage": name, **result})
+            print(f"  {name}: {result['ms']} ms peak={result['peak_mb']} MB", flush=True)
+        print(f"  normalize cache: {core.normalize_cache_stats()}", flush=True)
+        del state
+
+    print()
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "generated_at": datetime.now().isoformat(timespec="seconds"),
+                    "args": vars(args),
+                    "results": results,
+                },
+                handle,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
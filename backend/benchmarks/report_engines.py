@@ -0,0 +1,160 @@
+"""Bandingkan engine report python (parsing_report_core) dan pandas (kolumnar).
+
+Input dibangkitkan di memori seperti benchmarks.report_core. Tiap ukuran
+menjalankan kedua engine, mencocokkan hasilnya (effective details dan revert
+state per detail harus identik), lalu mencetak waktu per engine:
+
+    pip install pandas
+    python -m benchmarks.report_engines
+    python -m benchmarks.report_engines --sizes 10000,100000,1000000 --repeat 3
+
+Exit code 1 bila hasil kedua engine berbeda, sehingga skrip ini juga bisa
+dipakai sebagai cek paritas. Engine pandas (benchmarks.report_columnar) tidak
+dipakai API; report selalu memakai parsing_report_core. Jalankan ulang skrip
+ini sebelum mempertimbangkan engine kolumnar lagi.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.common import bootstrap, print_table
+
+bootstrap()
+
+from benchmarks import report_columnar as columnar  # noqa: E402
+from benchmarks import report_core  # noqa: E402
+from app.services import parsing_report_core as core  # noqa: E402
+
+
+PREPARE_STAGES = {"parse_audits", "parse_baselines", "group_audits", "reconstruct_baselines"}
+
+
+def _python_engine(state: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    grouped = core.group_audits_by_odist(state["audits"])
+    details = core.compute_effective_details(
+        state["audits"],
+        state["baselines"],
+        state["current_rows"],
+        grouped_audits=grouped,
+    )
+    states = [
+        core.effective_revert_state(detail, grouped, state["baselines"])
+        for detail in details
+    ]
+    return details, states
+
+
+def _pandas_engine(state: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    frames = columnar.AuditFrames(state["audits"], state["baselines"])
+    details = columnar.compute_effective_details(
+        state["audits"],
+        state["baselines"],
+        state["current_rows"],
+        frames=frames,
+    )
+    states = columnar.effective_revert_states(
+        details,
+        state["audits"],
+        state["baselines"],
+        frames=frames,
+    )
+    return details, states
+
+
+ENGINES: Dict[str, Callable[[Dict[str, Any]], Tuple[List[Dict[str, Any]], List[str]]]] = {
+    "python": _python_engine,
+    "pandas": _pandas_engine,
+}
+
+
+def _first_difference(expected: List[Any], actual: List[Any]) -> str:
+    if len(expected) != len(actual):
+        return f"jumlah berbeda: {len(expected)} vs {len(actual)}"
+    for index, (left, right) in enumerate(zip(expected, actual)):
+        if left != right:
+            return f"index {index}: {left!r} vs {right!r}"
+    return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000",
+                        help="jumlah audit per run, dipisah koma")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--users", type=int, default=25)
+    parser.add_argument("--distributors", type=int, default=400)
+    parser.add_argument("--baseline-fraction", type=float, default=0.7)
+    parser.add_argument("--max-edits-per-row", type=int, default=12)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=20260805)
+    parser.add_argument("--json", dest="json_path", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    if not columnar.available():
+        raise SystemExit("pandas belum terpasang: pip install pandas")
+
+    sizes = [int(value.replace("_", "")) for value in args.sizes.split(",") if value.strip()]
+    results = []
+    mismatches = 0
+    for size in sizes:
+        state = report_core.generate_inputs(size, args)
+        for name, stage in report_core.STAGES:
+            if name in PREPARE_STAGES:
+                stage(state)
+
+        outputs = {}
+        timings: Dict[str, List[float]] = {}
+        for engine_name, engine in ENGINES.items():
+            for _ in range(max(1, args.repeat)):
+                started = time.perf_counter()
+                outputs[engine_name] = engine(state)
+                timings.setdefault(engine_name, []).append((time.perf_counter() - started) * 1000)
+
+        expected_details, expected_states = outputs["python"]
+        actual_details, actual_states = outputs["pandas"]
+        difference = _first_difference(expected_details, actual_details) or _first_difference(
+            expected_states, actual_states
+        )
+        if difference:
+            mismatches += 1
+            print(f"size={size}: hasil engine berbeda, {difference[:300]}", file=sys.stderr)
+
+        python_ms = statistics.median(timings["python"])
+        pandas_ms = statistics.median(timings["pandas"])
+        results.append(
+            {
+                "size": size,
+                "details": len(expected_details),
+                "python_ms": round(python_ms, 2),
+                "pandas_ms": round(pandas_ms, 2),
+                "speedup": round(python_ms / pandas_ms, 2) if pandas_ms else 0.0,
+                "parity": "FAIL" if difference else "OK",
+            }
+        )
+        print(f"size={size}: python={python_ms:.1f} ms pandas={pandas_ms:.1f} ms", flush=True)
+        del state, outputs
+
+    print()
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "generated_at": datetime.now().isoformat(timespec="seconds"),
+                    "args": vars(args),
+                    "results": results,
+                },
+                handle,
+                indent=2,
+            )
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
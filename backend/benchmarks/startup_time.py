@@ -0,0 +1,135 @@
+"""Benchmark waktu start aplikasi: import main sampai request pertama selesai.
+
+Jalankan dari folder backend/:
+
+    python -m benchmarks.startup_time --runs 10 --path /health
+
+Setiap run memakai proses Python baru (seperti worker uvicorn yang restart),
+lalu mengukur import `main`, event startup, dan request pertama yang dikirim
+langsung ke aplikasi ASGI tanpa server HTTP.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.common import BACKEND_ROOT, bootstrap, print_table, summarize_latencies
+
+
+async def _asgi_get(app, path: str) -> int:
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    status = {"code": 0}
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    await app(scope, receive, send)
+    return status["code"]
+
+
+def _child(path: str) -> None:
+    started = time.perf_counter()
+    bootstrap()
+    import main  # noqa: E402
+
+    imported = time.perf_counter()
+
+    async def _run() -> Dict[str, float]:
+        await main.app.router.startup()
+        started_up = time.perf_counter()
+        status = await _asgi_get(main.app, path)
+        answered = time.perf_counter()
+        await main.app.router.shutdown()
+        return {"started_up": started_up, "answered": answered, "status": status}
+
+    result = asyncio.run(_run())
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - started) * 1000,
+                "startup_ms": (result["started_up"] - imported) * 1000,
+                "first_request_ms": (result["answered"] - result["started_up"]) * 1000,
+                "import_to_first_request_ms": (result["answered"] - started) * 1000,
+                "status": result["status"],
+            }
+        )
+    )
+
+
+def _run_once(path: str, env: Dict[str, str]) -> Dict[str, float]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_time", "--child", "--path", path],
+        cwd=str(BACKEND_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = process_ms
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument(
+        "--keep-warmup",
+        action="store_true",
+        help="jangan matikan warmup pool/password worker (default: dimatikan)",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.path)
+        return
+
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET_KEY", "benchmark-only-secret")
+    if not args.keep_warmup:
+        env["DB_POOL_WARMUP"] = "0"
+        env["MYSQL_PIPELINE_POOL_WARMUP"] = "0"
+        env["PASSWORD_HASH_WORKERS"] = "0"
+
+    samples: Dict[str, List[float]] = {}
+    statuses = set()
+    for _ in range(args.runs):
+        result = _run_once(args.path, env)
+        statuses.add(result.pop("status"))
+        for key, value in result.items():
+            samples.setdefault(key, []).append(value)
+
+    print(f"path={args.path} runs={args.runs} status={sorted(statuses)}")
+    print_table([{"phase": key, **summarize_latencies(values)} for key, values in samples.items()])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,7 @@
 import getpass
 import sys
 
-from sqlmodel import Session
-
-from app.db.database import engine
+from app.db.database import session_scope
 from app.schemas.auth import AppUserCreate
 from app.services.auth_service import create_user, get_user_by_username
 
@@ -21,7 +19,7 @@ def main() -> int:
         print("Password minimal 8 karakter.")
         return 1
 
-    with Session(engine) as db:
+    with session_scope() as db:
         if get_user_by_username(db, username):
             print("Username sudah ada.")
             return 1
@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+
+from app.db.database import mysql_pipeline_session_scope
+from app.services import odists_duplicate_service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Cari row gold_odists_parsing_manual yang kemungkinan outlet yang sama.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="jumlah proses penilai pasangan (1 = tanpa pool)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=odists_duplicate_service.DEFAULT_THRESHOLD,
+        help="skor minimum (0..1) supaya pasangan dianggap duplikat",
+    )
+    parser.add_argument(
+        "--max-block",
+        type=int,
+        default=odists_duplicate_service.DEFAULT_MAX_BLOCK,
+        help="blok dengan row lebih banyak dari ini dilewati",
+    )
+    parser.add_argument(
+        "--blocks-per-task",
+        type=int,
+        default=odists_duplicate_service.DEFAULT_BLOCKS_PER_TASK,
+        help="jumlah blok per task worker (= jarak antar checkpoint)",
+    )
+    parser.add_argument(
+        "--resume",
+        type=int,
+        metavar="RUN_ID",
+        help="lanjutkan run yang terhenti dari checkpoint terakhirnya",
+    )
+    args = parser.parse_args()
+    if args.workers < 1 or args.blocks_per_task < 1 or args.max_block < 2:
+        parser.error("--workers/--blocks-per-task minimal 1 dan --max-block minimal 2")
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold harus di antara 0 dan 1")
+
+    def progress(job):
+        print(
+            f"run {job['run_id']}: {job['blocks_done']}/{job['blocks_total']} blok, "
+            f"{job['pairs_found']} pasangan",
+            flush=True,
+        )
+
+    with mysql_pipeline_session_scope() as db:
+        try:
+            result = odists_duplicate_service.run_job(
+                db,
+                workers=args.workers,
+                threshold=args.threshold,
+                max_block=args.max_block,
+                blocks_per_task=args.blocks_per_task,
+                resume_run_id=args.resume,
+                progress=progress,
+            )
+        except RuntimeError as error:
+            print(str(error), file=sys.stderr)
+            return 1
+    print(
+        f"Run {result['run_id']} selesai: {result['pairs_found']} pasangan, "
+        f"{result['rows']} row dalam {result['clusters']} cluster, "
+        f"{result['oversized_blocks']} blok terlalu besar dilewati."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,18 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, observe_request, registry, route_label
+from app.core.auth_dependencies import get_admin_for_authorization
+from app.core.phase_timing import current_timings, start_request_timings
+from app.core.profiling import finish_profile, profile_requested, start_profile
+from app.core.security import shutdown_password_executor, warm_password_executor
+from app.db.database import warm_async_pools, warm_pools
 from app.routers import all_routers
+from app.services.odists_parsing_service import autocomplete_index, ogal_suggestions
 
 app = FastAPI(title="Exercise Project 2 API", version="1.0.0")
 
@@ -13,8 +24,63 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Id"],
 )
 
+
+# Profiling on-demand: ADMIN mengirim header "X-Profile: 1" atau query
+# "?__profile=1"; hasilnya disimpan dan bisa diunduh lewat /api/system/profiles.
+@app.middleware("http")
+async def request_profiler(request: Request, call_next):
+    if not profile_requested(request.headers, request.query_params):
+        return await call_next(request)
+    admin = await run_in_threadpool(
+        get_admin_for_authorization,
+        request.headers.get("Authorization"),
+    )
+    profile = start_profile(request.method, request.url.path, admin.username) if admin else None
+    if profile is None:
+        return await call_next(request)
+
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        timings = current_timings()
+        finish_profile(profile, status_code, timings.as_dict() if timings else None)
+    response.headers["X-Profile-Id"] = profile.profile_id
+    return response
+
+
+# Durasi per fase (load audit, baseline, row MySQL, dst.) dikirim lewat
+# header Server-Timing agar critical path report terlihat di DevTools.
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    timings = start_request_timings()
+    response = await call_next(request)
+    header = timings.server_timing_header()
+    if header:
+        response.headers["Server-Timing"] = header
+    return response
+
+# Latensi dan status per route template untuk endpoint /metrics.
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        observe_request(
+            request.method,
+            route_label(request.scope),
+            status_code,
+            time.perf_counter() - started,
+        )
+
 # Daftarkan semua router di list
 for r in all_routers:
     # setiap router di file router sudah punya prefixnya sendiri seperti "/clients" atau "/configs"
@@ -22,13 +88,35 @@ for r in all_routers:
     app.include_router(r, prefix="/api")
 
 # Tanpa auto-create table (sesuai permintaan)
-# from app.db.database import engine
+# from app.db.database import get_engine
 # from sqlmodel import SQLModel
-# @app.on_event("startup")
-# def on_startup():
-#     pass
+@app.on_event("startup")
+async def on_startup():
+    # Buka beberapa koneksi di awal agar request pertama tidak membayar
+    # handshake TLS/login database.
+    await run_in_threadpool(warm_pools)
+    await warm_async_pools()
+    await run_in_threadpool(warm_password_executor)
+    # Index autocomplete dibangun di background; selama belum siap endpoint
+    # autocomplete memakai query distinct biasa.
+    if settings.ODISTS_AUTOCOMPLETE_ENABLED:
+        autocomplete_index.start_background_build()
+    # Index saran ogal_id opt-in (ODISTS_SUGGEST_ENABLED): build penuh makan
+    # memori dan CPU proses API.
+    if settings.ODISTS_SUGGEST_ENABLED:
+        ogal_suggestions.start_background_build()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    shutdown_password_executor()
 
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,16 @@
+import sys
+
+from app.db.database import session_scope
+from app.services.auth_service import LEGACY_ROLE_MAP, normalize_legacy_roles
+
+
+def main() -> int:
+    mapping = ", ".join(f"{old} -> {new}" for old, new in LEGACY_ROLE_MAP.items())
+    with session_scope() as db:
+        updated = normalize_legacy_roles(db)
+    print(f"Normalisasi role legacy ({mapping}): {updated} user diperbarui.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
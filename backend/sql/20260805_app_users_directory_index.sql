@@ -0,0 +1,41 @@
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+
+BEGIN TRANSACTION;
+
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE object_id = OBJECT_ID(N'[tools].[app_users]')
+      AND name = N'IX_app_users_username'
+)
+BEGIN
+    CREATE INDEX [IX_app_users_username]
+        ON [tools].[app_users] ([username] ASC)
+        INCLUDE ([full_name], [role], [is_active]);
+END;
+
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE object_id = OBJECT_ID(N'[tools].[app_users]')
+      AND name = N'IX_app_users_role_username'
+)
+BEGIN
+    CREATE INDEX [IX_app_users_role_username]
+        ON [tools].[app_users] ([role] ASC, [username] ASC)
+        INCLUDE ([full_name], [is_active]);
+END;
+
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE object_id = OBJECT_ID(N'[tools].[app_users]')
+      AND name = N'IX_app_users_full_name'
+)
+BEGIN
+    CREATE INDEX [IX_app_users_full_name]
+        ON [tools].[app_users] ([full_name] ASC);
+END;
+
+COMMIT TRANSACTION;
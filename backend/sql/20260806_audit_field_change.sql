@@ -0,0 +1,54 @@
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+
+BEGIN TRANSACTION;
+
+-- Satu baris per field per audit (pecahan changed_fields/old_values/new_values
+-- dari odists_parsing_audit_log). normalized_new_value = hasil
+-- parsing_report_core.normalize (trim, spasi dirapatkan, huruf besar) supaya
+-- lookup owner/revert bisa dijalankan sebagai seek index.
+IF OBJECT_ID(N'[tools].[odists_parsing_audit_field_change]', N'U') IS NULL
+BEGIN
+    CREATE TABLE [tools].[odists_parsing_audit_field_change] (
+        [audit_id] BIGINT NOT NULL,
+        [odist_id] BIGINT NOT NULL,
+        [field] NVARCHAR(128) NOT NULL,
+        [old_value] NVARCHAR(MAX) NULL,
+        [new_value] NVARCHAR(MAX) NULL,
+        [normalized_new_value] NVARCHAR(MAX) NOT NULL,
+        [normalized_new_hash] AS CAST(
+            HASHBYTES('SHA2_256', [normalized_new_value]) AS BINARY(32)
+        ) PERSISTED,
+        CONSTRAINT [PK_odists_parsing_audit_field_change]
+            PRIMARY KEY CLUSTERED ([audit_id] ASC, [field] ASC)
+    );
+END;
+
+-- Owner: audit terakhir yang mengisi field X di ODIST Y dengan nilai V.
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE object_id = OBJECT_ID(N'[tools].[odists_parsing_audit_field_change]')
+      AND name = N'IX_odists_parsing_audit_field_change_owner'
+)
+BEGIN
+    CREATE INDEX [IX_odists_parsing_audit_field_change_owner]
+        ON [tools].[odists_parsing_audit_field_change]
+            ([odist_id] ASC, [field] ASC, [normalized_new_hash] ASC, [audit_id] DESC);
+END;
+
+-- Riwayat per field (terbaru dulu) untuk cek revert terhadap baseline.
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE object_id = OBJECT_ID(N'[tools].[odists_parsing_audit_field_change]')
+      AND name = N'IX_odists_parsing_audit_field_change_history'
+)
+BEGIN
+    CREATE INDEX [IX_odists_parsing_audit_field_change_history]
+        ON [tools].[odists_parsing_audit_field_change]
+            ([odist_id] ASC, [field] ASC, [audit_id] DESC)
+        INCLUDE ([normalized_new_hash]);
+END;
+
+COMMIT TRANSACTION;
@@ -0,0 +1,48 @@
+-- MySQL (database pipeline, sama dengan gold_odists_parsing_manual), bukan
+-- SQL Server: hasil job deteksi outlet duplikat (detect_duplicate_outlets.py).
+-- Job juga membuat tabel ini sendiri kalau belum ada
+-- (odists_duplicate_service.ensure_tables).
+
+-- Satu baris per run; last_block_key = checkpoint (blok diproses urut key).
+CREATE TABLE IF NOT EXISTS `odists_duplicate_job` (
+    `run_id` BIGINT NOT NULL AUTO_INCREMENT,
+    `status` VARCHAR(16) NOT NULL,
+    `threshold` DECIMAL(5,4) NOT NULL,
+    `max_block` INT NOT NULL,
+    `blocks_total` INT NOT NULL DEFAULT 0,
+    `blocks_done` INT NOT NULL DEFAULT 0,
+    `oversized_blocks` INT NOT NULL DEFAULT 0,
+    `pairs_found` BIGINT NOT NULL DEFAULT 0,
+    `last_block_key` VARCHAR(512) NULL,
+    `started_at` DATETIME NOT NULL,
+    `updated_at` DATETIME NOT NULL,
+    `finished_at` DATETIME NULL,
+    PRIMARY KEY (`run_id`)
+);
+
+-- Pasangan di atas threshold; odist_id_a < odist_id_b. Run lama dihapus
+-- setelah run baru selesai.
+CREATE TABLE IF NOT EXISTS `odists_duplicate_pair` (
+    `run_id` BIGINT NOT NULL,
+    `odist_id_a` BIGINT NOT NULL,
+    `odist_id_b` BIGINT NOT NULL,
+    `score` DECIMAL(5,4) NOT NULL,
+    `name_score` DECIMAL(5,4) NOT NULL,
+    `address_score` DECIMAL(5,4) NULL,
+    `block_key` VARCHAR(512) NOT NULL,
+    PRIMARY KEY (`run_id`, `odist_id_a`, `odist_id_b`),
+    KEY `ix_odists_duplicate_pair_b` (`run_id`, `odist_id_b`)
+);
+
+-- Ringkasan per row dari run terakhir yang selesai; dipakai filter grid
+-- duplicate_cluster. cluster_id = odist_id terkecil di cluster.
+CREATE TABLE IF NOT EXISTS `odists_duplicate` (
+    `odist_id` BIGINT NOT NULL,
+    `cluster_id` BIGINT NOT NULL,
+    `cluster_size` INT NOT NULL,
+    `best_match_id` BIGINT NOT NULL,
+    `best_score` DECIMAL(5,4) NOT NULL,
+    `run_id` BIGINT NOT NULL,
+    PRIMARY KEY (`odist_id`),
+    KEY `ix_odists_duplicate_cluster` (`cluster_id`)
+);
@@ -0,0 +1,13 @@
+-- MySQL (database pipeline, sama dengan gold_odists_parsing_manual), bukan
+-- SQL Server: klaim antrian claim-next. Ditulis di transaksi yang sama dengan
+-- SELECT ... FOR UPDATE SKIP LOCKED supaya berlaku lintas proses/host.
+-- API juga membuat tabel ini sendiri kalau belum ada
+-- (odists_claim_service.ensure_table).
+CREATE TABLE IF NOT EXISTS `odists_claim` (
+    `odist_id` BIGINT NOT NULL,
+    `user_id` INT NOT NULL,
+    `claimed_at` DATETIME NOT NULL,
+    `expires_at` DATETIME NOT NULL,
+    PRIMARY KEY (`odist_id`),
+    KEY `ix_odists_claim_expires` (`expires_at`)
+);
@@ -0,0 +1,40 @@
+-- MySQL (database pipeline, sama dengan gold_odists_parsing_manual), bukan
+-- SQL Server: index watermark updated_at/dwh_refreshed_at. Dipakai poll
+-- mirror row report (odists_row_mirror: dua range scan yang di-UNION) dan
+-- versi data cache report (MAX per kolom = satu lookup di ujung index).
+-- Aman dijalankan ulang: index hanya dibuat kalau belum ada, online
+-- (ALGORITHM=INPLACE, LOCK=NONE) supaya tabel tetap bisa ditulis.
+
+SET @ddl = IF(
+    (
+        SELECT COUNT(*)
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+          AND table_name = 'gold_odists_parsing_manual'
+          AND index_name = 'ix_gold_odists_updated_at'
+    ) = 0,
+    'ALTER TABLE `gold_odists_parsing_manual`
+        ADD INDEX `ix_gold_odists_updated_at` (`updated_at`),
+        ALGORITHM=INPLACE, LOCK=NONE',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @ddl = IF(
+    (
+        SELECT COUNT(*)
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+          AND table_name = 'gold_odists_parsing_manual'
+          AND index_name = 'ix_gold_odists_dwh_refreshed_at'
+    ) = 0,
+    'ALTER TABLE `gold_odists_parsing_manual`
+        ADD INDEX `ix_gold_odists_dwh_refreshed_at` (`dwh_refreshed_at`),
+        ALGORITHM=INPLACE, LOCK=NONE',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
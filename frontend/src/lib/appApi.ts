@@ -154,7 +154,22 @@ export async function appFetch<T>(
 
   const body = await response.json().catch(() => null);
   if (!response.ok) {
-    const detail = body?.detail || body?.message || `HTTP ${response.status}`;
+    const rawDetail = body?.detail || body?.message || `HTTP ${response.status}`;
+    // Validasi batch ODIST mengirim {message, errors: [{id, field, message}]}.
+    const detail =
+      typeof rawDetail === "object" && rawDetail !== null && "message" in rawDetail
+        ? [
+            rawDetail.message,
+            ...(Array.isArray(rawDetail.errors)
+              ? rawDetail.errors
+                  .slice(0, 5)
+                  .map(
+                    (error: { id: number; field: string | null; message: string }) =>
+                      `#${error.id}${error.field ? ` ${error.field}` : ""}: ${error.message}`
+                  )
+              : []),
+          ].join("\n")
+        : rawDetail;
     if (response.status === 401) {
       localStorage.removeItem("metadata_app_token");
       localStorage.removeItem("metadata_app_user");